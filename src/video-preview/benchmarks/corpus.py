@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+from collections import namedtuple
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 合成视频规格 元组（gop 为关键帧间隔，帧数）
+VideoSpec = namedtuple(
+    "VideoSpec", ["codec", "extension", "width", "height", "duration", "fps", "gop"]
+)
+
+# 默认合成的视频：编码格式 × 分辨率 × 时长 × 关键帧间隔
+DEFAULT_CODECS = (("mp4v", ".mp4"), ("MJPG", ".avi"), ("XVID", ".avi"))
+DEFAULT_RESOLUTIONS = ((320, 180), (640, 360), (1280, 720))
+DEFAULT_DURATIONS = (10, 60)
+DEFAULT_GOPS = (12, 250)
+DEFAULT_FPS = 25
+
+# 模拟目录树：目录层级、每层目录数、每个目录的文件数
+FAKE_TREE_DEPTH = 3
+FAKE_TREE_BRANCHES = 5
+FAKE_TREE_FILES = 40
+# 模拟目录树中的文件扩展名（视频与非视频混合）
+FAKE_TREE_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".jpg", ".txt")
+
+# 语料清单文件名
+MANIFEST_NAME = "corpus.json"
+
+
+def default_specs() -> List[VideoSpec]:
+    """默认的视频规格组合（MJPG 为帧内编码，不区分关键帧间隔）"""
+    specs = []
+    for codec, extension in DEFAULT_CODECS:
+        gops = (1,) if codec == "MJPG" else DEFAULT_GOPS
+        for width, height in DEFAULT_RESOLUTIONS:
+            for duration in DEFAULT_DURATIONS:
+                for gop in gops:
+                    specs.append(
+                        VideoSpec(
+                            codec, extension, width, height, duration, DEFAULT_FPS, gop
+                        )
+                    )
+    return specs
+
+
+def spec_name(spec: VideoSpec) -> str:
+    return (
+        f"{spec.codec}_{spec.width}x{spec.height}_{spec.duration}s_"
+        f"gop{spec.gop}{spec.extension}"
+    )
+
+
+def render_frame(rng_seed: int, index: int, width: int, height: int) -> np.ndarray:
+    """
+    生成确定的测试帧：每 5 秒（125 帧）换一个随机色块画面，画面内容逐帧平移
+
+    Args:
+        rng_seed (int): 随机种子
+        index (int): 帧序号
+        width (int): 宽度
+        height (int): 高度
+
+    Returns:
+        numpy.ndarray: BGR 帧
+    """
+    shot = index // 125
+    rng = np.random.default_rng(rng_seed * 1000 + shot)
+    blocks = rng.integers(0, 256, size=(9, 16, 3), dtype=np.uint8)
+    frame = cv2.resize(blocks, (width, height), interpolation=cv2.INTER_LINEAR)
+    return np.roll(frame, (index % 125) * max(1, width // 125), axis=1)
+
+
+def write_video(path: str, spec: VideoSpec, seed: int) -> bool:
+    """
+    按规格写入一个合成视频
+
+    Returns:
+        bool: 是否写入成功（编码器不可用时返回 False）
+    """
+    fourcc = cv2.VideoWriter_fourcc(*spec.codec)
+    size = (spec.width, spec.height)
+    params = []
+    if hasattr(cv2, "VIDEOWRITER_PROP_KEY_INTERVAL"):
+        params = [cv2.VIDEOWRITER_PROP_KEY_INTERVAL, spec.gop]
+    writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, fourcc, spec.fps, size, params)
+    if not writer.isOpened():
+        logger.warning(f"Video writer unavailable: {spec.codec}")
+        return False
+
+    try:
+        for index in range(spec.duration * spec.fps):
+            writer.write(render_frame(seed, index, spec.width, spec.height))
+    finally:
+        writer.release()
+    return True
+
+
+def build_fake_tree(root: str, seed: int = 0) -> int:
+    """
+    生成模拟的大目录树（空文件），用于测试目录扫描
+
+    Args:
+        root (str): 根目录
+        seed (int): 随机种子
+
+    Returns:
+        int: 生成的文件数
+    """
+    rng = np.random.default_rng(seed)
+    count = 0
+
+    def populate(directory, depth):
+        nonlocal count
+        os.makedirs(directory, exist_ok=True)
+        for i in range(FAKE_TREE_FILES):
+            extension = FAKE_TREE_EXTENSIONS[rng.integers(len(FAKE_TREE_EXTENSIONS))]
+            open(os.path.join(directory, f"file_{i:03d}{extension}"), "wb").close()
+            count += 1
+        if depth < FAKE_TREE_DEPTH:
+            for i in range(FAKE_TREE_BRANCHES):
+                populate(os.path.join(directory, f"dir_{i}"), depth + 1)
+
+    populate(root, 1)
+    return count
+
+
+def corpus_digest(specs: List[VideoSpec], seed: int) -> str:
+    data = json.dumps([list(spec) for spec in specs] + [seed, FAKE_TREE_FILES])
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def build_corpus(
+    root: str, specs: List[VideoSpec] = None, seed: int = 0
+) -> Dict[str, object]:
+    """
+    生成确定的测试语料：合成视频与模拟目录树
+
+    语料规格与清单中记录的一致时直接复用已生成的文件。
+
+    Args:
+        root (str): 语料目录
+        specs (List[VideoSpec], optional): 视频规格，默认 default_specs()
+        seed (int): 随机种子
+
+    Returns:
+        dict: 语料清单（digest、videos 视频路径与规格、tree 模拟目录树路径与文件数）
+    """
+    specs = specs or default_specs()
+    digest = corpus_digest(specs, seed)
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("digest") == digest:
+            logger.info(f"Reuse corpus: {root}")
+            return manifest
+
+    videos_dir = os.path.join(root, "videos")
+    os.makedirs(videos_dir, exist_ok=True)
+    videos = []
+    for index, spec in enumerate(specs):
+        path = os.path.join(videos_dir, spec_name(spec))
+        logger.info(f"Write corpus video: {path}")
+        if write_video(path, spec, seed + index):
+            videos.append({"path": path, "spec": spec._asdict()})
+
+    tree_root = os.path.join(root, "tree")
+    tree_files = build_fake_tree(tree_root, seed)
+
+    manifest = {
+        "digest": digest,
+        "seed": seed,
+        "videos": videos,
+        "tree": {"path": tree_root, "files": tree_files},
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def parse_resolutions(values: List[str]) -> List[Tuple[int, int]]:
+    # "640x360" -> (640, 360)
+    return [tuple(int(v) for v in value.lower().split("x")) for value in values]
+
+
+# 使用示例和测试：生成语料
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+
+    corpus_root = sys.argv[1] if len(sys.argv) > 1 else "benchmark-corpus"
+    corpus = build_corpus(corpus_root)
+    print(
+        f"视频: {len(corpus['videos'])} 个, 模拟目录树: {corpus['tree']['files']} 个文件"
+    )
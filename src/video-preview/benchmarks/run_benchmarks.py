@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+
+from benchmarks.corpus import build_corpus
+from utils.decoder_util import DecoderPool
+from utils.file_util import get_video_tree
+from utils.video_meta_util import VideoInfoExtractor
+
+logger = logging.getLogger(__name__)
+
+# 默认语料目录与结果文件
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), "video-preview-corpus")
+DEFAULT_OUTPUT = "benchmark-results.json"
+
+# 每个视频生成的缩略图数
+THUMBNAIL_COUNT = 16
+# 每项测量前的预热次数与正式测量的重复次数
+WARMUP = 1
+REPEAT = 5
+# 比较时检查的指标与默认的退化阈值（相对基线变慢的比例）
+COMPARE_METRICS = ("p50_ms",)
+DEFAULT_THRESHOLD = 0.10
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    """
+    延迟统计
+
+    Args:
+        samples (List[float]): 每次调用的耗时（秒）
+
+    Returns:
+        dict: 次数、均值、最值与 p50/p90/p99（毫秒）
+    """
+    values = np.asarray(samples) * 1000
+    return {
+        "count": len(samples),
+        "mean_ms": round(float(values.mean()), 3),
+        "min_ms": round(float(values.min()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p90_ms": round(float(np.percentile(values, 90)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def measure(fn: Callable, repeat: int = REPEAT, warmup: int = WARMUP) -> List[float]:
+    # 预热 warmup 次后重复调用 fn() repeat 次，返回每次调用的耗时
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def item_name(video: Dict[str, object]) -> str:
+    # 语料视频的名称（不含扩展名），每个视频对应一种规格
+    return os.path.splitext(os.path.basename(video["path"]))[0]
+
+
+def bench_video_tree(tree_root: str, files: int, repeat: int) -> Dict[str, object]:
+    samples = measure(lambda: get_video_tree(tree_root), repeat)
+    result = latency_stats(samples)
+    result["files_per_s"] = round(files / float(np.median(samples)), 1)
+    return result
+
+
+def bench_video_info(videos: List[dict], repeat: int) -> Dict[str, object]:
+    # 每次调用前清空解码器池，测量冷打开的耗时（文件已在系统缓存中）
+    pool = DecoderPool()
+    extractor = VideoInfoExtractor(pool=pool)
+
+    def get_info(path):
+        pool.clear()
+        extractor.get_video_info(path)
+
+    return {
+        "items": {
+            item_name(video): latency_stats(
+                measure(lambda: get_info(video["path"]), repeat)
+            )
+            for video in videos
+        }
+    }
+
+
+def bench_video_info_batch(videos: List[dict], repeat: int) -> Dict[str, object]:
+    pool = DecoderPool()
+    extractor = VideoInfoExtractor(pool=pool)
+    paths = [video["path"] for video in videos]
+    errors = []
+
+    def get_batch():
+        pool.clear()
+        results = extractor.get_video_info_batch(paths)
+        errors.append(sum(isinstance(info, str) for info in results.values()))
+
+    samples = measure(get_batch, repeat)
+    result = latency_stats(samples)
+    result["errors"] = max(errors)
+    result["videos_per_s"] = round(len(paths) / float(np.median(samples)), 2)
+    return result
+
+
+def bench_thumbnails(videos: List[dict], repeat: int) -> Dict[str, object]:
+    extractor = VideoInfoExtractor(pool=DecoderPool())
+    items = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for video in videos:
+            path = video["path"]
+            duration = extractor.get_video_info(path).duration
+            times = [duration * i / THUMBNAIL_COUNT for i in range(THUMBNAIL_COUNT)]
+            samples = measure(
+                lambda: extractor.generate_thumbnails_at_times(path, times, output_dir),
+                repeat,
+            )
+            result = latency_stats(samples)
+            result["frames_per_s"] = round(
+                THUMBNAIL_COUNT / float(np.median(samples)), 1
+            )
+            items[item_name(video)] = result
+    return {"items": items}
+
+
+def run_benchmarks(corpus_dir: str, repeat: int = REPEAT) -> Dict[str, object]:
+    """
+    在语料上运行全部基准测试
+
+    每项测量先预热再重复 repeat 次；视频相关的测量按语料中的每个视频
+    （即每种编码格式、分辨率、时长与关键帧间隔的组合）分别统计。
+
+    Args:
+        corpus_dir (str): 语料目录（不存在或规格变化时重新生成）
+        repeat (int): 每项测量的重复次数
+
+    Returns:
+        dict: 运行环境与各项基准测试结果
+    """
+    corpus = build_corpus(corpus_dir)
+    videos = corpus["videos"]
+    tree = corpus["tree"]
+
+    benchmarks = {}
+    for name, fn, args in (
+        ("get_video_tree", bench_video_tree, (tree["path"], tree["files"])),
+        ("get_video_info", bench_video_info, (videos,)),
+        ("get_video_info_batch", bench_video_info_batch, (videos,)),
+        ("generate_thumbnails_at_times", bench_thumbnails, (videos,)),
+    ):
+        logger.info(f"Run benchmark: {name}")
+        benchmarks[name] = fn(*args, repeat)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpus": {"digest": corpus["digest"], "videos": len(videos)},
+        "repeat": repeat,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "benchmarks": benchmarks,
+    }
+
+
+def iter_results(benchmarks: Dict[str, object]):
+    # 展开为 (名称, 统计)：按视频统计的测量展开为 "测量/视频"
+    for name, result in benchmarks.items():
+        if "items" in result:
+            for item, stats in result["items"].items():
+                yield f"{name}/{item}", stats
+        else:
+            yield name, result
+
+
+def compare_results(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    与基线结果比较，找出变慢超过阈值的指标
+
+    按测量与语料视频逐项比较重复测量的中位数，不同规格的视频不混在一起统计。
+
+    Args:
+        baseline (dict): 基线结果
+        current (dict): 当前结果
+        threshold (float): 允许的变慢比例，如 0.1 表示 10%
+
+    Returns:
+        List[str]: 退化说明，为空表示没有退化
+    """
+    if baseline.get("corpus", {}).get("digest") != current.get("corpus", {}).get(
+        "digest"
+    ):
+        logger.warning("Corpus differs from baseline, results may not be comparable")
+
+    baseline_results = dict(iter_results(baseline["benchmarks"]))
+    regressions = []
+    for name, result in iter_results(current["benchmarks"]):
+        base = baseline_results.get(name)
+        if base is None:
+            continue
+        for metric in COMPARE_METRICS:
+            if metric not in result or not base.get(metric):
+                continue
+            change = result[metric] / base[metric] - 1
+            line = (
+                f"{name}.{metric}: {base[metric]:.3f} -> {result[metric]:.3f} "
+                f"({change:+.1%})"
+            )
+            if change > threshold:
+                regressions.append(line)
+                logger.warning(f"Regression {line}")
+            else:
+                logger.info(f"  {line}")
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, object]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="视频预览基准测试")
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub_parsers.add_parser("run", help="生成语料并运行基准测试")
+    run_parser.add_argument(
+        "--corpus-dir", default=DEFAULT_CORPUS_DIR, help="语料目录，已生成时复用"
+    )
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="结果 JSON 文件")
+    run_parser.add_argument("--baseline", help="基线结果 JSON 文件，运行后与之比较")
+    run_parser.add_argument(
+        "--repeat", type=int, default=REPEAT, help="每项测量的重复次数，默认 5"
+    )
+
+    compare_parser = sub_parsers.add_parser("compare", help="比较两次运行结果")
+    compare_parser.add_argument("baseline", help="基线结果 JSON 文件")
+    compare_parser.add_argument("current", help="当前结果 JSON 文件")
+
+    for sub_parser in (run_parser, compare_parser):
+        sub_parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help="判定为退化的变慢比例，默认 0.1",
+        )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "run":
+        results = run_benchmarks(args.corpus_dir, args.repeat)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(json.dumps(results["benchmarks"], ensure_ascii=False, indent=2))
+        print(f"结果已保存: {args.output}")
+    else:
+        results = load_results(args.current)
+
+    if args.baseline:
+        regressions = compare_results(
+            load_results(args.baseline), results, args.threshold
+        )
+        if regressions:
+            print(f"发现 {len(regressions)} 项性能退化:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("未发现性能退化")
@@ -0,0 +1,25 @@
+class AppContext:
+
+    def __init__(self):
+        self.app_name = "视频预览工具"
+        self.settings = None
+        self.env = None
+
+
+APP_CTX = AppContext()
+
+
+def get_setting(key, default=None):
+    """
+    读取应用配置项
+
+    Args:
+        key (str): 配置项名称，支持点号分隔的多级名称，如 "thumbnail.storage"
+        default: 配置未加载或配置项不存在时的默认值
+
+    Returns:
+        配置项的值
+    """
+    if APP_CTX.settings is None:
+        return default
+    return APP_CTX.settings.get(key, default)
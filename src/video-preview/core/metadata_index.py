@@ -0,0 +1,145 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+# 视频元数据索引
+class MetadataIndex:
+    """
+    视频元数据索引
+
+    以 SQLite 保存每个视频的各类元数据（视频信息、感知哈希、关键帧索引等），
+    每条记录由 (视频键, 名称) 唯一确定，值以 JSON 格式存储。
+    """
+
+    FILE_NAME = "metadata.db"
+
+    def __init__(self, root_dir: str):
+        """
+        初始化元数据索引
+
+        Args:
+            root_dir (str): 索引所在目录，不存在时自动创建
+        """
+        root_dir = Path(root_dir).expanduser().resolve()
+        root_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = root_dir / self.FILE_NAME
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS video_meta ("
+                " key TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " value TEXT,"
+                " PRIMARY KEY (key, name))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS video_meta_name ON video_meta (name)"
+            )
+
+    def put(self, key: str, name: str, value: Any):
+        """
+        写入一项元数据，已存在时覆盖
+
+        Args:
+            key (str): 视频键
+            name (str): 元数据名称
+            value (Any): 可序列化为 JSON 的值
+        """
+        self.put_many(key, {name: value})
+
+    def put_many(self, key: str, values: Dict[str, Any]):
+        """写入同一视频的多项元数据"""
+        rows = [
+            (key, name, json.dumps(value, ensure_ascii=False))
+            for name, value in values.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO video_meta (key, name, value) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def get(self, key: str, name: str, default: Any = None) -> Any:
+        """
+        读取一项元数据
+
+        Args:
+            key (str): 视频键
+            name (str): 元数据名称
+            default (Any): 不存在时的默认值
+
+        Returns:
+            Any: 元数据的值
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM video_meta WHERE key = ? AND name = ?",
+                (key, name),
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_all(self, name: str) -> Dict[str, Any]:
+        """
+        读取所有视频的某项元数据
+
+        Args:
+            name (str): 元数据名称
+
+        Returns:
+            Dict[str, Any]: 视频键到值的映射
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM video_meta WHERE name = ?", (name,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT key FROM video_meta").fetchall()
+        return [row[0] for row in rows]
+
+    def remove(self, key: str, name: str = None):
+        """删除视频的一项或全部元数据"""
+        with self._lock, self._conn:
+            if name is None:
+                self._conn.execute("DELETE FROM video_meta WHERE key = ?", (key,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM video_meta WHERE key = ? AND name = ?", (key, name)
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# 全局元数据索引（按目录缓存）
+_indexes: Dict[str, MetadataIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_metadata_index(root_dir: str) -> MetadataIndex:
+    """
+    便捷函数：获取指定目录的元数据索引（同一目录共享一个实例）
+
+    Args:
+        root_dir (str): 索引所在目录
+
+    Returns:
+        MetadataIndex: 元数据索引
+    """
+    root_dir = str(Path(root_dir).expanduser().resolve())
+    with _indexes_lock:
+        if root_dir not in _indexes:
+            _indexes[root_dir] = MetadataIndex(root_dir)
+        return _indexes[root_dir]
@@ -18,7 +18,10 @@ FileInfo = namedtuple(
         "pretty_size",
         "modified_time",
         "pretty_modified_time",
+        # 文件内容指纹，未计算时为 None
+        "fingerprint",
     ],
+    defaults=(None,),
 )
 
 
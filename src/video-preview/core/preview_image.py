@@ -1,14 +1,34 @@
 import logging
+import os
+import threading
+from pathlib import Path
 
+from core.context import get_setting
+from core.metadata_index import MetadataIndex, get_metadata_index
+from core.thumbnail_store import ThumbnailPackStore, get_pack_store
+from utils.decoder_util import get_decoder_selector
 from utils.file_util import get_image_files
+from utils.fingerprint_util import get_file_fingerprint
+from utils.frame_quality_util import FrameQualityGate
+from utils.image_hash_util import VideoHasher
+from utils.job_util import Job, JobExecutor, submit_job
+from utils.keyframe_util import KeyframeIndex, read_container_index, scan_keyframes
+from utils.priority_util import lower_current_thread_priority
+from utils.scene_detect_util import SceneDetector
 from utils.sequence_generator import SequenceGenerator
+from utils.trace_util import traced
 from utils.video_meta_util import VideoInfo, VideoInfoExtractor
 
 logger = logging.getLogger(__name__)
 
+# 关键帧扫描专用执行器：单线程，线程以后台优先级运行
+keyframe_executor = JobExecutor(max_workers=1, thread_name_prefix="keyframes")
+
 
 # 预览图
 class PreviewImage:
+    # 按镜头切换选取时间点时，扫描阶段占整体进度的比例
+    SCENE_SCAN_PROGRESS = 0.5
 
     @staticmethod
     def get_video_time_seq(video_duration):
@@ -28,38 +48,321 @@ class PreviewImage:
         return seq
 
     @staticmethod
-    def generate_thumbnails(extractor: VideoInfoExtractor, video_info: VideoInfo):
-        logger.info(f"Generate video thumbnails from: {video_info}")
+    @traced()
+    def get_scene_time_seq(
+        extractor: VideoInfoExtractor,
+        video_info: VideoInfo,
+        count: int,
+        job: Job = None,
+    ):
+        # 按镜头切换选取预览图时间点，失败时返回 None；
+        # 扫描占整体进度的前一段，之后生成缩略图的进度接着计算
+        if job is not None:
+            job.set_progress_range(0.0, PreviewImage.SCENE_SCAN_PROGRESS)
+        try:
+            return SceneDetector().detect_times(
+                extractor, video_info.path, count, video_info.duration, job
+            )
+        except ValueError as e:
+            logger.warning(f"Detect scenes of [{video_info.path}] failed: {e}")
+            return None
+        finally:
+            if job is not None:
+                job.set_progress_range(PreviewImage.SCENE_SCAN_PROGRESS)
 
+    @staticmethod
+    def _get_thumbnails_options(
+        extractor: VideoInfoExtractor, video_info: VideoInfo, job: Job = None
+    ):
+        # 生成预览图的参数
         seq = PreviewImage.get_video_time_seq(int(video_info.duration))
+        if PreviewImage.get_thumbnails_mode() == "scenes":
+            seq = (
+                PreviewImage.get_scene_time_seq(extractor, video_info, len(seq), job)
+                or seq
+            )
         output_dir = PreviewImage.get_thumbnails_folder(video_info.path)
         logger.info(
             f"Generate thumbnails for video time sequence : {seq} , output_dir: {output_dir}"
         )
-
-        thumbnails = extractor.generate_thumbnails_at_times(
-            video_info.path,
-            seq,
-            output_dir,
+        return dict(
+            times=seq,
+            output_dir=output_dir,
             prefix=video_info.filename + "-" + "thumbnail",
             format="jpg",
             quality=95,
+            quality_gate=PreviewImage.get_quality_gate(),
+            keyframes=PreviewImage.get_keyframe_index(video_info.path, job),
         )
-        logger.info(f"Generate video thumbnails: {thumbnails}")
-        thumbnails_array = []
-        for time_point, file_path in thumbnails.items():
-            thumbnails_array.append(file_path)
+
+    @staticmethod
+    @traced()
+    def generate_thumbnails(
+        extractor: VideoInfoExtractor, video_info: VideoInfo, job: Job = None
+    ):
+        logger.info(f"Generate video thumbnails from: {video_info}")
+        options = PreviewImage._get_thumbnails_options(extractor, video_info, job)
+
+        # 复用已解码的帧计算感知哈希（仅均匀采样时）；帧经过质量检查后可能偏移，
+        # 相似视频查找的 SimilarVideoFinder.hash_video 使用相同的时间点与质量检查
+        hasher = VideoHasher()
+
+        def on_frame(time_point, frame):
+            if PreviewImage.get_thumbnails_mode() != "scenes":
+                hasher.add_frame(frame)
+
+        # 同一个视频会话内完成验证时间点与生成，不重复打开视频
+        with extractor.open_session(video_info.path) as session:
+            if PreviewImage.get_thumbnails_storage() == "pack":
+                # 打包存储：只编码不写文件，全部生成后一次性追加写入
+                thumbnails = session.encode_thumbnails(
+                    options["times"],
+                    format=options["format"],
+                    quality=options["quality"],
+                    job=job,
+                    on_frame=on_frame,
+                    quality_gate=options["quality_gate"],
+                    keyframes=options["keyframes"],
+                )
+            else:
+                thumbnails = session.generate_thumbnails(
+                    **options, job=job, on_frame=on_frame
+                )
+
+        if PreviewImage.get_thumbnails_storage() == "pack":
+            images = [(t, data) for t, data in thumbnails.items() if data is not None]
+            if images:
+                PreviewImage.get_pack_store().put(
+                    PreviewImage.get_video_key(video_info.path), images
+                )
+            logger.info(f"Generate video thumbnails: {len(images)} packed images")
+            thumbnails_array = [data for _, data in sorted(images, key=lambda x: x[0])]
+        else:
+            logger.info(f"Generate video thumbnails: {thumbnails}")
+            thumbnails_array = []
+            for time_point, file_path in thumbnails.items():
+                thumbnails_array.append(file_path)
+
+        # 记录缩略图目录，视频重命名后仍可按指纹找到
+        metadata = dict(hasher.hashes())
+        if PreviewImage.get_thumbnails_storage() != "pack":
+            metadata["thumbnails_folder"] = str(options["output_dir"])
+        PreviewImage.save_video_metadata(video_info, metadata)
         return thumbnails_array
 
+    @staticmethod
+    def save_video_metadata(video_info: VideoInfo, metadata: dict):
+        # 保存视频元数据（感知哈希等）到元数据索引，同时更新视频当前路径
+        PreviewImage.get_metadata_index().put_many(
+            PreviewImage.get_video_key(video_info.path),
+            dict(metadata, path=video_info.path),
+        )
+
+    @staticmethod
+    @traced()
+    def get_video_info(extractor: VideoInfoExtractor, video_path) -> VideoInfo:
+        """
+        获取视频信息，优先使用元数据索引中按内容指纹缓存的结果
+
+        视频重命名或移动后指纹不变，无需重新打开视频解析。
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器
+            video_path (str): 视频文件路径
+
+        Returns:
+            VideoInfo: 视频信息
+        """
+        video_path = Path(video_path).resolve()
+        key = PreviewImage.get_video_key(video_path)
+        index = PreviewImage.get_metadata_index()
+
+        cached = index.get(key, "video_info")
+        if cached is not None:
+            return VideoInfo(
+                **dict(cached, path=str(video_path), filename=video_path.name)
+            )
+
+        video_info = extractor.get_video_info(video_path)
+        index.put_many(
+            key, {"video_info": video_info._asdict(), "path": video_info.path}
+        )
+        return video_info
+
+    @staticmethod
+    @traced()
+    def get_keyframe_index(video_path, job: Job = None) -> KeyframeIndex:
+        """
+        获取视频的关键帧索引，每个视频只构建一次，保存在元数据索引中
+
+        只在此处读取容器自带的索引（MP4 采样表、MKV Cues）；没有可用索引时
+        （AVI、TS、分片 MP4 等）返回 None，由生成过程按帧间隔估计，同时在后台
+        以低优先级扫描关键帧并保存，下次生成时使用。
+
+        Args:
+            video_path (str): 视频文件路径
+            job (Job, optional): 任务句柄，用于取消
+
+        Returns:
+            KeyframeIndex: 关键帧索引，没有可用索引时返回 None
+        """
+        key = PreviewImage.get_video_key(video_path)
+        index = PreviewImage.get_metadata_index()
+
+        cached = index.get(key, "keyframes")
+        if cached is not None:
+            return KeyframeIndex.from_dict(cached)
+
+        try:
+            keyframes = read_container_index(str(video_path))
+        except OSError as e:
+            logger.warning(f"Read keyframe index of [{video_path}] failed: {e}")
+            return None
+        if keyframes is None:
+            PreviewImage.submit_scan_keyframes(video_path, key)
+            return None
+        index.put(key, "keyframes", keyframes.to_dict())
+        return keyframes
+
+    # 后台扫描中的视频键
+    _keyframe_scans = set()
+    _keyframe_scans_lock = threading.Lock()
+
+    @staticmethod
+    def submit_scan_keyframes(video_path, key) -> Job:
+        """
+        后台以低优先级扫描视频的关键帧，保存到元数据索引
+
+        Args:
+            video_path (str): 视频文件路径
+            key (str): 视频在元数据索引中的键
+
+        Returns:
+            Job: 任务句柄，同一视频已在扫描中时返回 None
+        """
+        with PreviewImage._keyframe_scans_lock:
+            if key in PreviewImage._keyframe_scans:
+                return None
+            PreviewImage._keyframe_scans.add(key)
+
+        def scan(job):
+            lower_current_thread_priority()
+            try:
+                keyframes = scan_keyframes(str(video_path), job)
+                PreviewImage.get_metadata_index().put(
+                    key, "keyframes", keyframes.to_dict()
+                )
+                logger.info(f"Scanned {len(keyframes)} keyframes of [{video_path}]")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Scan keyframes of [{video_path}] failed: {e}")
+            finally:
+                with PreviewImage._keyframe_scans_lock:
+                    PreviewImage._keyframe_scans.discard(key)
+
+        job = Job(name=f"keyframes:{video_path}")
+        return keyframe_executor.submit(job, scan)
+
+    @staticmethod
+    def submit_generate_thumbnails(
+        extractor: VideoInfoExtractor,
+        video_info: VideoInfo,
+        on_item=None,
+        on_progress=None,
+        on_complete=None,
+    ) -> Job:
+        # 后台生成预览图，返回任务句柄
+        logger.info(f"Submit generate video thumbnails: {video_info}")
+
+        job = Job(name=f"thumbnails:{video_info.path}")
+        job.bind(on_item=on_item, on_progress=on_progress, on_complete=on_complete)
+        return submit_job(
+            job,
+            lambda job: PreviewImage.generate_thumbnails(extractor, video_info, job),
+        )
+
+    @staticmethod
+    def get_thumbnails_storage():
+        # 缩略图存储方式：folder 或 pack
+        return get_setting("thumbnail.storage", "folder")
+
+    @staticmethod
+    def get_quality_gate():
+        # 缩略图帧质量检查，黑场、纯色或模糊的帧在附近重试
+        if get_setting("thumbnail.quality_gate", True):
+            return FrameQualityGate()
+        return None
+
+    @staticmethod
+    def get_thumbnails_mode():
+        # 预览图时间点选取方式：uniform（均匀采样）或 scenes（镜头切换）
+        return get_setting("thumbnail.mode", "uniform")
+
+    @staticmethod
+    def get_cache_folder():
+        # 缓存目录
+        return os.path.expanduser(
+            get_setting("thumbnail.cache_dir", "~/.video-preview/cache")
+        )
+
+    @staticmethod
+    def create_extractor() -> VideoInfoExtractor:
+        # 按配置的解码后端创建视频信息提取器，自动选择的基准测试结果保存在缓存目录
+        return VideoInfoExtractor(
+            backend=get_setting("decoder.backend", "opencv"),
+            selector=get_decoder_selector(
+                os.path.join(PreviewImage.get_cache_folder(), "decoder-benchmark.json")
+            ),
+        )
+
+    @staticmethod
+    def get_pack_store() -> ThumbnailPackStore:
+        return get_pack_store(PreviewImage.get_cache_folder())
+
+    @staticmethod
+    def get_metadata_index() -> MetadataIndex:
+        return get_metadata_index(PreviewImage.get_cache_folder())
+
+    @staticmethod
+    def get_video_key(path):
+        # 视频在缓存中的键：文件内容指纹，重命名或移动后不变
+        try:
+            return get_file_fingerprint(str(path))
+        except OSError as e:
+            logger.warning(f"Fingerprint video [{path}] failed: {e}")
+            return str(Path(path).resolve())
+
     @staticmethod
     def get_thumbnails_folder(path):
         # 预览图存储目录
         return path + "-" + "thumbnails"
 
     @staticmethod
+    def find_thumbnails_folder(path):
+        # 查找已有的预览图目录：视频被重命名时，按指纹找到原来的目录
+        folder = PreviewImage.get_thumbnails_folder(path)
+        if not os.path.isdir(folder):
+            remembered = PreviewImage.get_metadata_index().get(
+                PreviewImage.get_video_key(path), "thumbnails_folder"
+            )
+            if remembered and os.path.isdir(remembered):
+                logger.info(f"Found thumbnails folder by fingerprint: {remembered}")
+                return remembered
+        return folder
+
+    @staticmethod
+    @traced()
     def load_video_thumbnails(video_path):
+        # 打包存储：一次读取视频的全部缩略图数据
+        if PreviewImage.get_thumbnails_storage() == "pack":
+            store = PreviewImage.get_pack_store()
+            key = PreviewImage.get_video_key(video_path)
+            images = store.get(key)
+            if images:
+                logger.info(f"Load exists packed thumbnails: {len(images)}")
+                return images
+
         # 获取目录下的所有图片文件
-        folder = PreviewImage.get_thumbnails_folder(video_path)
+        folder = PreviewImage.find_thumbnails_folder(video_path)
         image_files = get_image_files(folder)
         logger.info(f"Load exists thumbnails: {image_files}")
 
@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+from core.preview_image import PreviewImage
+from utils.job_util import Job, submit_job
+from utils.trace_util import traced
+from utils.video_meta_util import VideoInfo, VideoInfoExtractor
+
+logger = logging.getLogger(__name__)
+
+
+# 拖动预览条
+class ScrubStrip:
+    """
+    视频拖动预览条
+
+    每个视频保存一组均匀分布的小尺寸帧，以固定大小的 NumPy 数组文件
+    (.npy，形状为 [帧数, 高, 宽, 3]，BGR) 存放在缩略图目录中。
+    查看时以内存映射方式打开，按位置取帧只是一次指针偏移，无需解码图片。
+    """
+
+    # 预览帧数量
+    FRAME_COUNT = 150
+    # 预览帧宽度（像素）
+    FRAME_WIDTH = 160
+    # 预览条文件名
+    FILE_NAME = "scrub-strip.npy"
+
+    def __init__(self, path: str, frames: np.ndarray):
+        self.path = path
+        self.frames = frames
+
+    @property
+    def frame_count(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def frame_size(self):
+        # (宽, 高)
+        return self.frames.shape[2], self.frames.shape[1]
+
+    def frame_at(self, fraction: float) -> np.ndarray:
+        """
+        获取最接近指定位置的预览帧
+
+        Args:
+            fraction (float): 播放位置（0~1）
+
+        Returns:
+            numpy.ndarray: 内存映射中的帧视图（BGR）
+        """
+        fraction = min(max(fraction, 0.0), 1.0)
+        return self.frames[int(round(fraction * (self.frame_count - 1)))]
+
+    @staticmethod
+    def get_strip_path(video_path) -> str:
+        # 打包存储时存放在缓存目录，避免为每个视频创建目录
+        if PreviewImage.get_thumbnails_storage() == "pack":
+            key = PreviewImage.get_video_key(video_path)
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+            return os.path.join(
+                PreviewImage.get_cache_folder(), "scrub", digest + ".npy"
+            )
+
+        # 预览条与缩略图存放在同一目录
+        return os.path.join(
+            PreviewImage.find_thumbnails_folder(video_path), ScrubStrip.FILE_NAME
+        )
+
+    @staticmethod
+    def load(video_path):
+        """
+        以内存映射方式加载视频的预览条
+
+        Args:
+            video_path (str): 视频文件路径
+
+        Returns:
+            ScrubStrip: 预览条，如果不存在或无法读取返回None
+        """
+        path = ScrubStrip.get_strip_path(video_path)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            frames = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Load scrub strip [{path}] failed: {e}")
+            return None
+
+        if frames.ndim != 4 or frames.shape[0] == 0:
+            logger.warning(f"Invalid scrub strip [{path}]: shape={frames.shape}")
+            return None
+
+        return ScrubStrip(path, frames)
+
+    @staticmethod
+    @traced()
+    def generate(
+        extractor: VideoInfoExtractor, video_info: VideoInfo, job: Job = None
+    ) -> str:
+        """
+        生成视频的预览条文件
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器
+            video_info (VideoInfo): 视频信息
+            job (Job, optional): 任务句柄，用于进度与取消
+
+        Returns:
+            str: 预览条文件路径
+        """
+        if video_info.duration <= 0 or video_info.width <= 0:
+            raise ValueError(f"无法为视频生成预览条: {video_info.path}")
+
+        count = max(1, min(ScrubStrip.FRAME_COUNT, video_info.frame_count))
+        width = ScrubStrip.FRAME_WIDTH
+        height = max(
+            2, int(round(width * video_info.height / video_info.width / 2)) * 2
+        )
+        last_time = max(video_info.duration - 1.0 / max(video_info.fps, 1), 0)
+        times = [last_time * i / max(count - 1, 1) for i in range(count)]
+
+        path = ScrubStrip.get_strip_path(video_info.path)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path + ".tmp"
+
+        logger.info(f"Generate scrub strip [{path}]: {count} x {width}x{height}")
+        if job is not None:
+            job.set_total(count)
+
+        frames = np.lib.format.open_memmap(
+            temp_path, mode="w+", dtype=np.uint8, shape=(count, height, width, 3)
+        )
+        try:
+            index = 0
+            # 预览条不要求精确，后端支持时只解码关键帧
+            for time_point, frame in extractor.read_keyframes_at_times(
+                video_info.path, times, job
+            ):
+                if frame is not None:
+                    frames[index] = cv2.resize(
+                        frame, (width, height), interpolation=cv2.INTER_AREA
+                    )
+                elif index > 0:
+                    # 读取失败时沿用上一帧
+                    frames[index] = frames[index - 1]
+                index += 1
+                if job is not None:
+                    job.advance(time_point)
+            frames.flush()
+        except BaseException:
+            del frames
+            os.remove(temp_path)
+            raise
+
+        del frames
+        os.replace(temp_path, path)
+        return path
+
+    @staticmethod
+    def submit_generate(
+        extractor: VideoInfoExtractor, video_info: VideoInfo, on_complete=None
+    ) -> Job:
+        # 后台生成预览条，返回任务句柄
+        job = Job(name=f"scrub-strip:{video_info.path}")
+        job.bind(on_complete=on_complete)
+        return submit_job(
+            job, lambda job: ScrubStrip.generate(extractor, video_info, job)
+        )
@@ -0,0 +1,174 @@
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+from core.metadata_index import MetadataIndex
+from core.preview_image import PreviewImage
+from utils.image_hash_util import HammingIndex, VideoHasher, group_pairs
+from utils.job_util import Job
+from utils.video_meta_util import VideoInfoExtractor
+
+logger = logging.getLogger(__name__)
+
+
+# 近似重复视频查找
+class SimilarVideoFinder:
+    """
+    基于感知哈希查找近似重复的视频（重新编码、重新上传等）
+
+    视频哈希在生成缩略图时顺带计算并存入元数据索引，也可以通过
+    hash_videos 为尚未生成缩略图的视频补算。
+    """
+
+    # 默认最大汉明距离（64位哈希）
+    DEFAULT_MAX_DISTANCE = 6
+
+    def __init__(
+        self,
+        extractor: VideoInfoExtractor,
+        metadata_index: MetadataIndex = None,
+        hash_name: str = "phash",
+    ):
+        """
+        初始化查找器
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器
+            metadata_index (MetadataIndex, optional): 元数据索引，默认使用缓存目录中的索引
+            hash_name (str): 使用的哈希，"phash" 或 "dhash"
+        """
+        self.extractor = extractor
+        self.metadata_index = metadata_index or PreviewImage.get_metadata_index()
+        self.hash_name = hash_name
+
+    def hash_video(self, video_path: str, job: Job = None) -> Dict[str, object]:
+        """
+        计算并保存单个视频的感知哈希
+
+        采样时间点与帧质量检查都与生成缩略图（均匀采样）一致，两种方式
+        得到的哈希相同。
+
+        Args:
+            video_path (str): 视频文件路径
+            job (Job, optional): 任务句柄，用于取消
+
+        Returns:
+            dict: 视频哈希
+        """
+        hasher = VideoHasher()
+        # 在同一个视频会话内获取视频信息并读取帧
+        with self.extractor.open_session(video_path) as session:
+            video_info = session.info
+            times = session.validate_times(
+                PreviewImage.get_video_time_seq(int(video_info.duration))
+            )
+            quality_gate = PreviewImage.get_quality_gate()
+            for time_point, frame, _ in session.read_frames(times, job, quality_gate):
+                if frame is not None:
+                    hasher.add_frame(frame)
+
+        PreviewImage.save_video_metadata(video_info, hasher.hashes())
+        return hasher.hashes()
+
+    def hash_videos(self, video_paths: Iterable[str], job: Job = None) -> int:
+        """
+        为尚未计算哈希的视频补算感知哈希
+
+        Args:
+            video_paths (Iterable[str]): 视频文件路径
+            job (Job, optional): 任务句柄，每处理一个视频推进一次
+
+        Returns:
+            int: 新计算哈希的视频数量
+        """
+        hashed = self.metadata_index.get_all(self.hash_name)
+        pending = [
+            path
+            for path in video_paths
+            if PreviewImage.get_video_key(path) not in hashed
+        ]
+        if job is not None:
+            job.set_total(len(pending))
+
+        count = 0
+        for path in pending:
+            if job is not None:
+                job.raise_if_cancelled()
+            try:
+                if self.hash_video(path, job):
+                    count += 1
+            except (OSError, ValueError) as e:
+                logger.warning(f"Hash video [{path}] failed: {e}")
+            if job is not None:
+                job.advance(path)
+        return count
+
+    def build_index(self) -> HammingIndex:
+        """从元数据索引构建汉明距离索引，键为视频路径"""
+        hashes = self.metadata_index.get_all(self.hash_name)
+        paths = self.metadata_index.get_all("path")
+        keys = [key for key in hashes if key in paths]
+        return HammingIndex([paths[key] for key in keys], [hashes[key] for key in keys])
+
+    def find_similar(
+        self, video_path: str, max_distance: int = DEFAULT_MAX_DISTANCE
+    ) -> List[Tuple[str, int]]:
+        """
+        查找与指定视频近似的视频
+
+        Args:
+            video_path (str): 视频文件路径（需已计算哈希）
+            max_distance (int): 最大汉明距离
+
+        Returns:
+            List[Tuple[str, int]]: (视频路径, 距离) 列表，按距离排序，不含自身
+        """
+        key = PreviewImage.get_video_key(video_path)
+        hash_value = self.metadata_index.get(key, self.hash_name)
+        if hash_value is None:
+            return []
+
+        return [
+            (path, distance)
+            for path, distance in self.build_index().query(hash_value, max_distance)
+            if PreviewImage.get_video_key(path) != key
+        ]
+
+    def find_duplicate_groups(
+        self, max_distance: int = DEFAULT_MAX_DISTANCE
+    ) -> List[List[str]]:
+        """
+        查找所有近似重复的视频组
+
+        Args:
+            max_distance (int): 最大汉明距离
+
+        Returns:
+            List[List[str]]: 近似重复的视频路径组
+        """
+        index = self.build_index()
+        pairs = index.find_pairs(max_distance)
+        logger.info(f"Found {len(pairs)} similar pairs in {len(index)} videos")
+        return group_pairs(pairs)
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    import sys
+
+    from utils.file_util import get_video_tree, iter_tree_files
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        target_dir = sys.argv[1]
+    else:
+        target_dir = input("请输入要查找的目录路径: ")
+
+    finder = SimilarVideoFinder(VideoInfoExtractor())
+    video_files = [info.path for info in iter_tree_files(get_video_tree(target_dir))]
+    print(f"补算哈希: {finder.hash_videos(video_files)} 个视频")
+
+    for group in finder.find_duplicate_groups():
+        print("\n近似重复:")
+        for path in group:
+            print(f"  {path}")
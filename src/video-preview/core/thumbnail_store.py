@@ -0,0 +1,351 @@
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from utils.file_util import get_image_files
+
+logger = logging.getLogger(__name__)
+
+
+# 缩略图打包存储
+class ThumbnailPackStore:
+    """
+    缩略图打包存储
+
+    所有视频的缩略图追加写入同一个数据文件，避免每个视频产生一个目录和
+    大量小文件。每个视频的缩略图连续存放，偏移索引记录在追加写入的
+    JSON Lines 索引文件中（同一键以最后一条记录为准）。
+
+    读取时对数据文件做内存映射，一个视频的全部缩略图只需一次连续读取。
+    删除和覆盖只追加新的索引记录，旧数据由 compact 统一回收。
+    """
+
+    DATA_FILE_NAME = "thumbnails.pack"
+    INDEX_FILE_NAME = "thumbnails.idx"
+
+    def __init__(self, root_dir: str):
+        """
+        初始化打包存储
+
+        Args:
+            root_dir (str): 存储目录，不存在时自动创建
+        """
+        self.root_dir = Path(root_dir).expanduser().resolve()
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.root_dir / self.DATA_FILE_NAME
+        self.index_path = self.root_dir / self.INDEX_FILE_NAME
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, dict] = {}
+        self._mmap = None
+        self._mmap_size = 0
+        self._load_index()
+
+    def _load_index(self):
+        self._index.clear()
+        if not self.index_path.exists():
+            return
+
+        data_size = self.data_path.stat().st_size if self.data_path.exists() else 0
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 写入中断产生的不完整记录
+                    logger.warning(f"Skip broken index record: {line!r}")
+                    continue
+
+                if record.get("deleted") or not record.get("sizes"):
+                    # 删除记录；没有图片的记录（旧版本写入）视为不存在
+                    self._index.pop(record["key"], None)
+                elif record["offset"] + sum(record["sizes"]) <= data_size:
+                    self._index[record["key"]] = record
+
+    def _append_index(self, record: dict):
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index.keys())
+
+    def get_times(self, key: str) -> List[float]:
+        """获取视频缩略图对应的时间点"""
+        with self._lock:
+            record = self._index.get(key)
+            return list(record["times"]) if record else []
+
+    def put(self, key: str, images: List[Tuple[float, bytes]]):
+        """
+        写入一个视频的全部缩略图，已存在时覆盖；没有图片时不写入
+
+        Args:
+            key (str): 视频键
+            images (List[Tuple[float, bytes]]): (时间点, 编码后的图片数据) 列表
+        """
+        if not images:
+            logger.warning(f"Skip packing thumbnails [{key}]: no images")
+            return
+
+        images = sorted(images, key=lambda x: x[0])
+        payload = b"".join(data for _, data in images)
+
+        with self._lock:
+            with open(self.data_path, "ab") as f:
+                offset = f.tell()
+                f.write(payload)
+
+            record = {
+                "key": key,
+                "offset": offset,
+                "sizes": [len(data) for _, data in images],
+                "times": [time_point for time_point, _ in images],
+            }
+            self._append_index(record)
+            self._index[key] = record
+
+        logger.debug(f"Pack thumbnails [{key}]: {len(images)} images at {offset}")
+
+    def get(self, key: str) -> List[bytes]:
+        """
+        读取一个视频的全部缩略图
+
+        Args:
+            key (str): 视频键
+
+        Returns:
+            List[bytes]: 按时间排序的图片数据，不存在或数据缺失时返回空列表
+        """
+        with self._lock:
+            record = self._index.get(key)
+            if record is None:
+                return []
+
+            offset = record["offset"]
+            end = offset + sum(record["sizes"])
+            if end <= offset:
+                return []
+            # 一次连续读取
+            data = self._get_mmap(end)
+            if data is None:
+                logger.warning(f"Thumbnail pack data missing for [{key}]")
+                return []
+            payload = data[offset:end]
+
+        images = []
+        position = 0
+        for size in record["sizes"]:
+            images.append(payload[position : position + size])
+            position += size
+        return images
+
+    def remove(self, key: str):
+        with self._lock:
+            if self._index.pop(key, None) is not None:
+                self._append_index({"key": key, "deleted": True})
+
+    def _get_mmap(self, required_size: int):
+        # 数据文件只追加，映射区域不足时重新映射；数据文件不存在、为空
+        # 或小于所需大小时返回 None
+        if self._mmap is None or self._mmap_size < required_size:
+            self._close_mmap()
+            try:
+                if self.data_path.stat().st_size < required_size:
+                    return None
+                with open(self.data_path, "rb") as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError as e:
+                logger.warning(f"Map thumbnail pack [{self.data_path}] failed: {e}")
+                return None
+            self._mmap_size = len(self._mmap)
+        return self._mmap
+
+    def _close_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mmap_size = 0
+
+    def garbage_size(self) -> int:
+        """数据文件中已无索引引用的字节数"""
+        with self._lock:
+            if not self.data_path.exists():
+                return 0
+            live_size = sum(sum(record["sizes"]) for record in self._index.values())
+            return self.data_path.stat().st_size - live_size
+
+    def compact(self):
+        """
+        压缩存储：只保留有效数据重写数据文件与索引文件，并原子替换
+        """
+        with self._lock:
+            temp_data_path = self.data_path.with_suffix(".pack.tmp")
+            temp_index_path = self.index_path.with_suffix(".idx.tmp")
+
+            new_index = {}
+            with (
+                open(temp_data_path, "wb") as data_file,
+                open(temp_index_path, "w", encoding="utf-8") as index_file,
+            ):
+                for key in list(self._index.keys()):
+                    images = self.get(key)
+                    record = dict(self._index[key], offset=data_file.tell())
+                    data_file.write(b"".join(images))
+                    index_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    new_index[key] = record
+
+            self._close_mmap()
+            os.replace(temp_data_path, self.data_path)
+            os.replace(temp_index_path, self.index_path)
+            self._index = new_index
+
+        logger.info(
+            f"Compact thumbnail pack [{self.data_path}]: {len(new_index)} videos"
+        )
+
+    def close(self):
+        with self._lock:
+            self._close_mmap()
+
+    # 缩略图文件名中的时间点，如 xxx-thumbnail_12_0s.jpg
+    _TIME_PATTERN = re.compile(r"_(\d+)_(\d+)s\.\w+$")
+
+    def migrate_folder(self, key: str, folder: str, remove: bool = False) -> int:
+        """
+        将缩略图目录中的图片迁移到打包存储
+
+        Args:
+            key (str): 视频键
+            folder (str): 缩略图目录
+            remove (bool): 迁移后是否删除原图片文件与目录
+
+        Returns:
+            int: 迁移的图片数量
+        """
+        image_files = get_image_files(folder)
+        images = []
+        for index, image_info in enumerate(image_files):
+            match = self._TIME_PATTERN.search(image_info.name)
+            time_point = float(f"{match[1]}.{match[2]}") if match else float(index)
+            with open(image_info.path, "rb") as f:
+                images.append((time_point, f.read()))
+
+        if not images:
+            return 0
+
+        self.put(key, images)
+
+        if remove:
+            for image_info in image_files:
+                os.remove(image_info.path)
+            try:
+                os.rmdir(folder)
+            except OSError as e:
+                logger.warning(f"Keep thumbnails folder [{folder}]: {e}")
+
+        return len(images)
+
+
+# 全局打包存储（按存储目录缓存）
+_stores: Dict[str, ThumbnailPackStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_pack_store(root_dir: str) -> ThumbnailPackStore:
+    """
+    便捷函数：获取指定目录的打包存储（同一目录共享一个实例）
+
+    Args:
+        root_dir (str): 存储目录
+
+    Returns:
+        ThumbnailPackStore: 打包存储
+    """
+    root_dir = str(Path(root_dir).expanduser().resolve())
+    with _stores_lock:
+        if root_dir not in _stores:
+            _stores[root_dir] = ThumbnailPackStore(root_dir)
+        return _stores[root_dir]
+
+
+def migrate_thumbnail_folders(
+    root_dir: str, store: ThumbnailPackStore, remove: bool = False
+) -> Dict[str, int]:
+    """
+    迁移工具：将目录下所有 <视频>-thumbnails 缩略图目录迁移到打包存储
+
+    Args:
+        root_dir (str): 要扫描的根目录
+        store (ThumbnailPackStore): 目标打包存储
+        remove (bool): 迁移后是否删除原缩略图目录
+
+    Returns:
+        Dict[str, int]: 视频路径到迁移图片数量的映射
+    """
+    from core.preview_image import PreviewImage
+
+    results = {}
+    suffix = PreviewImage.get_thumbnails_folder("")
+    for directory, dir_names, file_names in os.walk(root_dir):
+        for dir_name in dir_names:
+            if not dir_name.endswith(suffix):
+                continue
+
+            video_path = os.path.join(directory, dir_name[: -len(suffix)])
+            if not os.path.isfile(video_path):
+                continue
+
+            folder = os.path.join(directory, dir_name)
+            key = PreviewImage.get_video_key(video_path)
+            results[video_path] = store.migrate_folder(key, folder, remove)
+            logger.info(f"Migrate [{folder}]: {results[video_path]} images")
+
+    return results
+
+
+# 迁移与压缩工具
+if __name__ == "__main__":
+    import argparse
+
+    from core.preview_image import PreviewImage
+
+    parser = argparse.ArgumentParser(description="缩略图打包存储工具")
+    parser.add_argument(
+        "--store", default=None, help="打包存储目录，默认使用配置中的缓存目录"
+    )
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = sub_parsers.add_parser(
+        "migrate", help="迁移 <视频>-thumbnails 缩略图目录"
+    )
+    migrate_parser.add_argument("root_dir", help="要扫描的视频根目录")
+    migrate_parser.add_argument(
+        "--remove", action="store_true", help="迁移后删除原缩略图目录"
+    )
+    sub_parsers.add_parser("compact", help="压缩打包存储")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    pack_store = get_pack_store(args.store or PreviewImage.get_cache_folder())
+
+    if args.command == "migrate":
+        migrated = migrate_thumbnail_folders(args.root_dir, pack_store, args.remove)
+        print(f"迁移完成: {len(migrated)} 个视频, {sum(migrated.values())} 张缩略图")
+    elif args.command == "compact":
+        garbage = pack_store.garbage_size()
+        pack_store.compact()
+        print(f"压缩完成: 回收 {garbage} 字节")
@@ -0,0 +1,73 @@
+import hashlib
+import logging
+import os
+
+from core.preview_image import PreviewImage
+from utils.job_util import Job, JobExecutor
+from utils.video_meta_util import VideoInfoExtractor
+
+logger = logging.getLogger(__name__)
+
+# 封面生成专用执行器，画廊滚动时大量请求不会阻塞缩略图生成任务
+poster_executor = JobExecutor(max_workers=2, thread_name_prefix="poster")
+
+
+# 视频封面
+class VideoPoster:
+    """
+    视频封面
+
+    每个视频一张小尺寸的封面帧（JPEG），按内容指纹存放在缓存目录中，
+    供文件夹画廊按需生成和显示。
+    """
+
+    # 封面最大尺寸 (宽, 高)
+    POSTER_SIZE = (256, 256)
+
+    @staticmethod
+    def get_poster_path(video_path) -> str:
+        key = PreviewImage.get_video_key(video_path)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(PreviewImage.get_cache_folder(), "posters", digest + ".jpg")
+
+    @staticmethod
+    def generate(extractor: VideoInfoExtractor, video_path, job: Job = None) -> str:
+        """
+        生成视频封面，已生成时直接返回
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器
+            video_path (str): 视频文件路径
+            job (Job, optional): 任务句柄，用于取消
+
+        Returns:
+            str: 封面文件路径
+
+        Raises:
+            ValueError: 如果无法读取封面帧
+        """
+        path = VideoPoster.get_poster_path(video_path)
+        if os.path.isfile(path):
+            return path
+
+        if job is not None:
+            job.raise_if_cancelled()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame = extractor.get_video_thumbnail(
+            video_path, path, frame_time=None, size=VideoPoster.POSTER_SIZE
+        )
+        if frame is None:
+            raise ValueError(f"无法读取视频封面帧: {video_path}")
+        logger.debug(f"Generate poster of [{video_path}]: {path}")
+        return path
+
+    @staticmethod
+    def submit_generate(
+        extractor: VideoInfoExtractor, video_path, on_complete=None
+    ) -> Job:
+        # 后台生成封面，返回任务句柄；任务开始前被取消则直接跳过
+        job = Job(name=f"poster:{video_path}")
+        job.bind(on_complete=on_complete)
+        return poster_executor.submit(
+            job, lambda job: VideoPoster.generate(extractor, video_path, job)
+        )
@@ -0,0 +1,149 @@
+import logging
+
+from core.preview_image import PreviewImage
+from kivy.clock import Clock
+from kivy.core.window import Window
+from utils.job_util import Job, JobCancelled, JobExecutor
+from utils.priority_util import lower_current_thread_priority
+
+logger = logging.getLogger(__name__)
+
+# 空闲生成专用执行器：单线程，线程以后台优先级运行
+idle_executor = JobExecutor(max_workers=1, thread_name_prefix="idle")
+
+
+# 空闲时后台预生成
+class IdleScheduler:
+    """
+    界面空闲时，在后台为尚未生成缩略图的视频生成缩略图
+
+    - 通过 Kivy 的输入事件（鼠标、触摸、键盘）判断界面是否空闲
+    - 空闲 delay 秒后开始，在低优先级（nice / ioprio）的后台线程中依次处理
+    - 有用户操作时立即暂停（在下一帧处阻塞），再次空闲后从暂停处继续
+    """
+
+    # 检查是否空闲的间隔（秒）
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self, extractor, delay: float = 60.0):
+        """
+        初始化调度器
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器
+            delay (float): 无操作多少秒后视为空闲
+        """
+        self.extractor = extractor
+        self.delay = delay
+        self._paths = []
+        self._position = 0
+        # 整体处理任务与当前视频的生成任务
+        self._job = None
+        self._video_job = None
+        self._last_input = Clock.get_time()
+
+        Window.bind(
+            mouse_pos=self._on_input,
+            on_motion=self._on_input,
+            on_key_down=self._on_input,
+        )
+        self._check_event = Clock.schedule_interval(
+            self._check_idle, self.CHECK_INTERVAL
+        )
+
+    def set_videos(self, paths):
+        """
+        设置待处理的视频（如当前打开目录中的全部视频），取消进行中的处理
+
+        Args:
+            paths (list): 视频文件路径
+        """
+        self._cancel_job()
+        self._paths = list(paths)
+        self._position = 0
+
+    def stop(self):
+        self._cancel_job()
+        self._check_event.cancel()
+        Window.unbind(
+            mouse_pos=self._on_input,
+            on_motion=self._on_input,
+            on_key_down=self._on_input,
+        )
+
+    @property
+    def idle(self) -> bool:
+        return Clock.get_time() - self._last_input >= self.delay
+
+    def _active_jobs(self):
+        return [job for job in (self._job, self._video_job) if job is not None]
+
+    def _on_input(self, *args):
+        self._last_input = Clock.get_time()
+        for job in self._active_jobs():
+            if not job.paused:
+                logger.debug(f"User input, pause job [{job.name}]")
+                job.pause()
+
+    def _check_idle(self, dt):
+        if not self.idle:
+            return
+        if self._job is not None:
+            for job in self._active_jobs():
+                job.resume()
+        elif self._position < len(self._paths):
+            self._start_job()
+
+    def _start_job(self):
+        logger.info(
+            f"UI idle, generate thumbnails from video {self._position + 1}"
+            f"/{len(self._paths)}"
+        )
+        job = Job(name="idle-thumbnails", total=len(self._paths))
+        job.bind(on_complete=self._on_complete)
+        self._job = job
+        idle_executor.submit(job, self._run, self._paths, self._position)
+
+    def _run(self, job, paths, position):
+        lower_current_thread_priority()
+        for index in range(position, len(paths)):
+            job.raise_if_cancelled()
+            path = paths[index]
+
+            # 每个视频一个生成任务（生成过程会更新任务的进度），随整体任务暂停与取消
+            video_job = Job(name=f"idle:{path}")
+            self._video_job = video_job
+            if job.paused:
+                video_job.pause()
+            try:
+                self._generate(video_job, path)
+            except JobCancelled:
+                job.raise_if_cancelled()
+                raise
+            except (OSError, ValueError) as e:
+                logger.warning(f"Idle generate thumbnails of [{path}] failed: {e}")
+            finally:
+                self._video_job = None
+
+            # 记录进度，取消后重新开始时从下一个视频继续
+            if job is self._job:
+                self._position = index + 1
+            job.advance(path)
+
+    def _generate(self, job, path):
+        # 已有缩略图的视频跳过
+        if PreviewImage.load_video_thumbnails(path):
+            return
+        video_info = PreviewImage.get_video_info(self.extractor, path)
+        job.raise_if_cancelled()
+        PreviewImage.generate_thumbnails(self.extractor, video_info, job)
+        logger.info(f"Idle generated thumbnails: {path}")
+
+    def _on_complete(self, job):
+        if job is self._job:
+            self._job = None
+
+    def _cancel_job(self):
+        for job in self._active_jobs():
+            job.cancel()
+        self._job = None
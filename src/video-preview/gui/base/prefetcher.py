@@ -0,0 +1,84 @@
+import logging
+import time
+
+from utils.job_util import Job, JobCancelled, JobExecutor
+
+logger = logging.getLogger(__name__)
+
+# 预取专用执行器：单线程，限制预取占用的 CPU 与 I/O
+prefetch_executor = JobExecutor(max_workers=1, thread_name_prefix="prefetch")
+
+
+# 低优先级预取
+class Prefetcher:
+    """
+    在后台低优先级地预取可能马上会用到的项
+
+    - 每次 prefetch 取消上一次尚未完成的预取
+    - 预取函数 loader(job, value) 在单个后台线程中依次执行
+    - 前台繁忙（is_busy() 为真）时暂停，前台空闲后继续，让出 CPU 与 I/O
+    - 单次预取中 loader 的累计耗时超过 time_budget 秒后停止
+    """
+
+    # 等待前台空闲的轮询间隔（秒）
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, loader, is_busy=None, time_budget=2.0):
+        """
+        初始化预取器
+
+        Args:
+            loader (Callable): 预取函数 loader(job, value)
+            is_busy (Callable, optional): 前台是否繁忙 is_busy()，在后台线程调用
+            time_budget (float): 单次预取的耗时预算（秒）
+        """
+        self.loader = loader
+        self.is_busy = is_busy
+        self.time_budget = time_budget
+        self._job = None
+
+    def prefetch(self, values) -> Job:
+        """
+        取消上一次预取，开始预取新的项
+
+        Args:
+            values (list): 按优先级排列的待预取项
+
+        Returns:
+            Job: 预取任务
+        """
+        self.cancel()
+        values = list(values)
+        self._job = Job(name="prefetch", total=len(values))
+        return prefetch_executor.submit(self._job, self._run, values)
+
+    def cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def _run(self, job, values):
+        spent = 0.0
+        for value in values:
+            self._wait_idle(job)
+            if spent >= self.time_budget:
+                logger.debug(f"Prefetch budget exhausted, skip {value}")
+                break
+
+            start = time.perf_counter()
+            try:
+                self.loader(job, value)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                logger.debug(f"Prefetch [{value}] failed: {e}")
+            spent += time.perf_counter() - start
+            job.advance(value)
+        return job.completed
+
+    def _wait_idle(self, job):
+        while True:
+            job.raise_if_cancelled()
+            if self.is_busy is None or not self.is_busy():
+                return
+            time.sleep(self.POLL_INTERVAL)
@@ -1,55 +1,75 @@
 import logging
 
-from kivy.clock import Clock
+from kivy.clock import mainthread
+from kivy.core.window import Window
 from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
-from kivy.uix.modalview import ModalView
 from kivy.uix.progressbar import ProgressBar
 
 logger = logging.getLogger(__name__)
 
 
-# 进度展示
+# 进度展示（非模态，浮动在窗口右下角，不拦截界面操作；多个进度自下而上堆叠）
 class ProgressViewer(BoxLayout):
     title_text = StringProperty("Progress")
-    on_update_value = ObjectProperty()
-    on_complete = ObjectProperty()
+    on_complete = ObjectProperty(allownone=True)
 
-    def __init__(self, title_text, on_update_value, on_complete, **kwargs):
+    # 当前显示中的进度视图
+    _active_viewers = []
+
+    def __init__(self, title_text, on_complete=None, **kwargs):
+        kwargs.setdefault("orientation", "vertical")
+        kwargs.setdefault("size_hint", (None, None))
+        kwargs.setdefault("size", (400, 50))
+        kwargs.setdefault("padding", 5)
         super(ProgressViewer, self).__init__(**kwargs)
 
-        self.modal_view = ModalView(
-            auto_dismiss=False, size_hint=(None, None), size=(400, 50)
-        )
+        self.title_text = title_text
+        self.on_complete = on_complete
         self.progress_bar = ProgressBar(max=1, value=0)
 
-        self.grid = GridLayout(cols=1, padding=10)
-        self.grid.add_widget(
+        self.add_widget(
             Label(
                 text=title_text,
                 font_size=12,
             )
         )
-        self.grid.add_widget(self.progress_bar)
-        self.modal_view.add_widget(self.grid)
-        self.modal_view.open()
-        self.on_update_value = on_update_value
-        self.on_complete = on_complete
-        self.update_event = Clock.schedule_interval(self._update_value, 1.0)
+        self.add_widget(self.progress_bar)
 
-    def update_progress_value(self, value):
-        self.progress_bar.value = value
+        if not ProgressViewer._active_viewers:
+            Window.bind(size=ProgressViewer._reposition_all)
+        ProgressViewer._active_viewers.append(self)
+        ProgressViewer._reposition_all()
+        Window.add_widget(self)
 
-    def on_dismiss(self):
-        if self.update_event is not None:
-            self.update_event.cancel()
-        self.modal_view.dismiss()
+    @staticmethod
+    def _reposition_all(*args):
+        for index, viewer in enumerate(ProgressViewer._active_viewers):
+            viewer.pos = (
+                Window.width - viewer.width - 10,
+                10 + index * (viewer.height + 5),
+            )
 
-    def _update_value(self, dt):
-        self.on_update_value()
+    @mainthread
+    def update_progress_value(self, value):
+        # 可在任意线程调用，实际更新调度到 Kivy 主循环
+        self.progress_bar.value = value
         logger.debug(f"Progress viewer value : {self.progress_bar.value}")
-        if self.progress_bar.value >= 1:
+
+    @mainthread
+    def complete(self):
+        self.progress_bar.value = self.progress_bar.max
+        if self.on_complete:
             self.on_complete()
-            self.on_dismiss()
+        self.on_dismiss()
+
+    def on_dismiss(self):
+        if self not in ProgressViewer._active_viewers:
+            return
+        ProgressViewer._active_viewers.remove(self)
+        if not ProgressViewer._active_viewers:
+            Window.unbind(size=ProgressViewer._reposition_all)
+        ProgressViewer._reposition_all()
+        if self.parent is not None:
+            self.parent.remove_widget(self)
@@ -0,0 +1,99 @@
+import logging
+
+from kivy.clock import Clock, mainthread
+from utils.job_util import Job, JobCancelled, JobExecutor
+
+logger = logging.getLogger(__name__)
+
+# 选择加载专用执行器，避免被耗时的缩略图生成任务阻塞
+selection_executor = JobExecutor(max_workers=2, thread_name_prefix="selection")
+
+
+# 选择处理管道
+class SelectionPipeline:
+    """
+    对快速变化的选择进行防抖，并在后台线程中加载所选项
+
+    - 选择变化后等待 delay 秒无新选择才开始加载
+    - 加载函数 loader(job, value) 在后台线程执行，结果回调到主线程
+    - 选择变化时取消仍在进行中的加载任务及通过 attach 关联的任务，
+      过期任务的结果会被丢弃
+    """
+
+    def __init__(self, loader, on_loaded, on_failed=None, delay=0.15):
+        """
+        初始化选择处理管道
+
+        Args:
+            loader (Callable): 加载函数 loader(job, value)，返回加载结果
+            on_loaded (Callable): 加载完成回调 on_loaded(value, result)，在主线程执行
+            on_failed (Callable, optional): 加载失败回调 on_failed(value, exception)
+            delay (float): 防抖延迟（秒）
+        """
+        self.loader = loader
+        self.on_loaded = on_loaded
+        self.on_failed = on_failed
+        self._trigger = Clock.create_trigger(self._start_loading, delay)
+        self._pending = None
+        self._generation = 0
+        self._jobs = []
+
+    def select(self, value):
+        """
+        选择新的项，取消当前选择的所有任务并重新开始防抖计时
+
+        Args:
+            value: 所选项
+        """
+        self._generation += 1
+        self._pending = value
+        self.cancel()
+
+        self._trigger.cancel()
+        self._trigger()
+
+    def attach(self, job: Job):
+        """关联一个属于当前选择的任务，选择变化时一并取消"""
+        self._jobs = [j for j in self._jobs if not j.done()]
+        self._jobs.append(job)
+        return job
+
+    @property
+    def busy(self) -> bool:
+        """是否有前台工作在进行：防抖等待中或当前选择的任务尚未结束"""
+        return self._trigger.is_triggered or any(
+            not job.done() for job in list(self._jobs)
+        )
+
+    def cancel(self):
+        """取消当前选择的所有任务"""
+        for job in self._jobs:
+            job.cancel()
+        self._jobs.clear()
+
+    def _start_loading(self, dt):
+        value = self._pending
+        generation = self._generation
+        logger.debug(f"Start loading selection: {value}")
+
+        job = Job(name=f"selection:{value}")
+        job.bind(on_complete=lambda job: self._on_job_complete(generation, value, job))
+        self.attach(job)
+        selection_executor.submit(job, self.loader, value)
+
+    @mainthread
+    def _on_job_complete(self, generation, value, job):
+        # 选择已变化，丢弃过期结果
+        if generation != self._generation:
+            logger.debug(f"Discard stale selection: {value}")
+            return
+
+        exception = job.exception()
+        if exception is None:
+            self.on_loaded(value, job.result())
+        elif isinstance(exception, JobCancelled):
+            logger.debug(f"Selection loading cancelled: {value}")
+        else:
+            logger.warning(f"Load selection [{value}] failed: {exception}")
+            if self.on_failed:
+                self.on_failed(value, exception)
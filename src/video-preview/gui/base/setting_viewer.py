@@ -0,0 +1,60 @@
+import logging
+
+from kivy.lang import Builder
+from kivy.properties import ObjectProperty, StringProperty
+from kivy.uix.boxlayout import BoxLayout
+
+logger = logging.getLogger(__name__)
+
+Builder.load_string(
+    """
+
+<SettingViewer>:
+    orientation: "vertical"
+    padding: 10
+    spacing: 10
+    Label:
+        text: "界面帧耗时"
+        size_hint_y: None
+        height: 30
+        bold: True
+    Label:
+        text: root.frame_stats_text
+        font_size: 13
+        text_size: self.size
+        halign: "left"
+        valign: "top"
+    BoxLayout:
+        size_hint_y: None
+        height: 40
+        spacing: 10
+        Button:
+            text: "刷新"
+            on_release: root.refresh()
+        Button:
+            text: "关闭"
+            on_release: root.dispatch("on_canceled")
+
+"""
+)
+
+
+# 设置界面：显示界面主线程的帧耗时统计
+class SettingViewer(BoxLayout):
+    __events__ = ("on_canceled",)
+    stall_detector = ObjectProperty(None, allownone=True)
+    frame_stats_text = StringProperty("")
+
+    def __init__(self, stall_detector=None, **kwargs):
+        super(SettingViewer, self).__init__(**kwargs)
+        self.stall_detector = stall_detector
+        self.refresh()
+
+    def on_canceled(self):
+        pass
+
+    def refresh(self):
+        if self.stall_detector is None:
+            self.frame_stats_text = "卡顿检测未开启（配置项 stall.enabled）"
+        else:
+            self.frame_stats_text = self.stall_detector.format_summary()
@@ -0,0 +1,201 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+
+import numpy as np
+from kivy.clock import Clock
+from utils.trace_util import StageStats
+
+logger = logging.getLogger(__name__)
+
+# 应用源码目录，用于从调用栈中找出应用自身的调用位置
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# 界面主线程卡顿检测
+class StallDetector:
+    """
+    检测界面主线程的卡顿（慢帧）
+
+    - 每帧由 Kivy Clock 回调记录帧间隔，统计帧耗时直方图与百分位
+    - 后台线程每隔 sample_interval 秒检查主线程是否超过 threshold 秒没有进入下一帧，
+      卡住时用 sys._current_frames() 采样主线程的调用栈
+    - 慢帧结束后输出日志，附带采样次数最多的应用调用位置（即卡住主线程的代码）
+    """
+
+    # 保留用于计算百分位的最近帧数与最近的慢帧数
+    RECENT_FRAMES = 3000
+    RECENT_STALLS = 20
+
+    def __init__(self, threshold: float = 0.1, sample_interval: float = 0.01):
+        """
+        初始化并开始检测（须在主线程调用）
+
+        Args:
+            threshold (float): 帧间隔超过多少秒视为卡顿
+            sample_interval (float): 后台线程检查与采样的间隔（秒）
+        """
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+        self._main_thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._stats = StageStats()
+        self._recent = deque(maxlen=self.RECENT_FRAMES)
+        # 最近的慢帧：(发生时间, 帧耗时秒, 调用位置)
+        self.stalls = deque(maxlen=self.RECENT_STALLS)
+        self.stall_count = 0
+
+        # 当前帧的开始时间与帧序号；采样线程记录当前帧中采到的调用栈
+        self._frame_start = time.perf_counter()
+        self._frame_number = 0
+        self._samples = Counter()
+        self._sampled_frame = -1
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="stall-detector", daemon=True
+        )
+        self._thread.start()
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+        logger.info(f"Stall detector enabled, threshold: {threshold * 1000:.0f} ms")
+
+    def stop(self):
+        self._frame_event.cancel()
+        self._stop_event.set()
+        self._thread.join()
+
+    def _on_frame(self, dt):
+        now = time.perf_counter()
+        with self._lock:
+            interval = now - self._frame_start
+            frame_number = self._frame_number
+            samples = self._samples if self._sampled_frame == frame_number else None
+            self._frame_start = now
+            self._frame_number += 1
+            self._samples = Counter()
+
+            self._stats.add(int(interval * 1e9))
+            self._recent.append(interval)
+
+        if interval >= self.threshold:
+            self._report_stall(interval, samples)
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.sample_interval):
+            with self._lock:
+                if time.perf_counter() - self._frame_start < self.threshold:
+                    continue
+                frame_number = self._frame_number
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = tuple(traceback.extract_stack(frame))
+            del frame
+
+            with self._lock:
+                # 采样期间主线程已进入下一帧时丢弃
+                if frame_number != self._frame_number:
+                    continue
+                if self._sampled_frame != frame_number:
+                    self._sampled_frame = frame_number
+                    self._samples = Counter()
+                self._samples[self.call_site(stack)] += 1
+
+    @staticmethod
+    def call_site(stack) -> str:
+        """
+        调用栈中最内层的应用代码位置
+
+        Args:
+            stack (StackSummary): traceback.extract_stack() 的结果
+
+        Returns:
+            str: "文件:行号 函数名"，没有应用代码时为最内层的位置
+        """
+        app_frames = [
+            frame
+            for frame in stack
+            if frame.filename.startswith(APP_ROOT) and frame.filename != __file__
+        ]
+        frame = app_frames[-1] if app_frames else stack[-1]
+        filename = (
+            os.path.relpath(frame.filename, APP_ROOT) if app_frames else frame.filename
+        )
+        return f"{filename}:{frame.lineno} {frame.name}"
+
+    def _report_stall(self, interval, samples):
+        self.stall_count += 1
+        if samples:
+            call_site, count = samples.most_common(1)[0]
+            detail = f"{call_site} ({count}/{sum(samples.values())} samples)"
+        else:
+            call_site = None
+            detail = "no samples"
+        self.stalls.append((time.time(), interval, call_site))
+        logger.warning(f"Slow frame: {interval * 1000:.0f} ms, at {detail}")
+        if samples and len(samples) > 1:
+            for site, count in samples.most_common()[1:5]:
+                logger.debug(f"    {site} ({count} samples)")
+
+    def summary(self) -> dict:
+        """
+        帧耗时统计
+
+        Returns:
+            dict: 帧数、卡顿次数、均值、最大值与最近帧的 p50/p95/p99（毫秒），
+                耗时直方图，最近的慢帧
+        """
+        with self._lock:
+            if not self._stats.count:
+                return {"frames": 0, "stalls": 0}
+            stats = self._stats.to_dict()
+            recent = np.asarray(self._recent) * 1000
+        p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+        return {
+            "frames": stats["count"],
+            "stalls": self.stall_count,
+            "mean_ms": stats["mean_ms"],
+            "max_ms": stats["max_ms"],
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "histogram": stats["histogram"],
+            "recent_stalls": [
+                {
+                    "time": time.strftime("%H:%M:%S", time.localtime(timestamp)),
+                    "duration_ms": round(interval * 1000, 1),
+                    "call_site": call_site,
+                }
+                for timestamp, interval, call_site in self.stalls
+            ],
+        }
+
+    def format_summary(self) -> str:
+        """帧耗时统计的文字说明，用于设置界面显示"""
+        summary = self.summary()
+        if not summary["frames"]:
+            return "尚无帧数据"
+        lines = [
+            f"帧数: {summary['frames']}    卡顿: {summary['stalls']} "
+            f"(>{self.threshold * 1000:.0f} ms)",
+            f"平均: {summary['mean_ms']:.1f} ms    最大: {summary['max_ms']:.1f} ms",
+            f"p50: {summary['p50_ms']:.1f} ms    p95: {summary['p95_ms']:.1f} ms    "
+            f"p99: {summary['p99_ms']:.1f} ms",
+            "分布: "
+            + ", ".join(
+                f"{label}: {count}" for label, count in summary["histogram"].items()
+            ),
+        ]
+        if summary["recent_stalls"]:
+            lines.append("最近的卡顿:")
+            for stall in reversed(summary["recent_stalls"]):
+                lines.append(
+                    f"  {stall['time']}  {stall['duration_ms']:.0f} ms  "
+                    f"{stall['call_site'] or '-'}"
+                )
+        return "\n".join(lines)
@@ -27,6 +27,8 @@ class FileTreeViewer(Widget):
         self.tree_data = tree_data
         self.on_selected = on_selected
         self.file_info_dict = {}
+        # 文件所在目录下的文件列表（按显示顺序），用于查找相邻文件
+        self.siblings_dict = {}
         # 渲染文件树
         self._render_tree(self.tree_data)
 
@@ -59,8 +61,10 @@ class FileTreeViewer(Widget):
             tree_node = self.treeview.add_node(node_label, parent)
 
         if node_data.type == "directory":
+            files = [child for child in node_data.children if child.type != "directory"]
             for child_node in node_data.children:
                 self._populate_tree(tree_node, child_node)
+                self.siblings_dict[child_node.path] = files
 
         self.file_info_dict[node_data.path] = node_data
 
@@ -73,5 +77,28 @@ class FileTreeViewer(Widget):
         if self.on_selected:
             self.on_selected(select_file_info)
 
+    def get_neighbors(self, path, count):
+        """
+        获取同一目录下与指定文件相邻的文件，由近及远、先后再前排列
+
+        Args:
+            path (str): 文件路径
+            count (int): 前后各取的文件数
+
+        Returns:
+            list: 相邻文件的文件信息
+        """
+        files = self.siblings_dict.get(path, [])
+        index = next((i for i, f in enumerate(files) if f.path == path), None)
+        if index is None:
+            return []
+
+        neighbors = []
+        for distance in range(1, count + 1):
+            for i in (index + distance, index - distance):
+                if 0 <= i < len(files):
+                    neighbors.append(files[i])
+        return neighbors
+
     def get_treeview(self):
         return self.treeview
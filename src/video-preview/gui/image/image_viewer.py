@@ -1,11 +1,11 @@
 import logging
 
+from gui.image.texture_loader import TextureCache
+from gui.image.thumbnail_strip import ThumbnailStrip  # noqa: F401
 from kivy.core.window import Window
 from kivy.lang import Builder
 from kivy.properties import ListProperty, NumericProperty
-from kivy.uix.behaviors import ButtonBehavior
 from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.image import Image
 
 logger = logging.getLogger(__name__)
 
@@ -13,41 +13,47 @@ Builder.load_string(
     """
 
 <ImagesViewer>:
-    BoxLayout:
+    ThumbnailStrip:
+        id: images_strip
         size: root.size
         pos: root.pos
-        orientation: "vertical"
-        Carousel:
-            id: images_carousel
-            direction:'right'
+        item_width: self.width
+        spacing: 0
+        bar_width: 0
+        do_scroll_x: False
 
 """
 )
 
 
-# 缩略图片
-class Thumbnail(ButtonBehavior, Image):
-    def __init__(self, index, **kwargs):
-        super(Thumbnail, self).__init__(**kwargs)
-        self.index = index
+def describe_image(image):
+    # 日志中只输出图片数据的大小
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return f"<{len(image)} bytes>"
+    return image
 
 
 # 图片列表预览
+# 复用缩略图条（RecycleView）逐页显示，只为可见的页创建控件；当前图片前台加载，
+# 前后 window 张在后台预取，纹理存入预览专用的缓存，关闭预览时释放
 class ImagesViewer(FloatLayout):
     __events__ = ("on_canceled", "on_confirmed")
     images = ListProperty([])
     index = NumericProperty(0)
+    window = NumericProperty(2)
+    # 判定为翻页的最小滑动距离
+    SWIPE_DISTANCE = 50
 
     def __init__(self, images, index=0, **kwargs):
         super(ImagesViewer, self).__init__(**kwargs)
         self.images = images
-        self.index = index
+        self.texture_cache = TextureCache()
+        self.ids.images_strip.texture_cache = self.texture_cache
+        self.ids.images_strip.set_images(images)
         # 请求键盘监听
         self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
         self._keyboard.bind(on_key_down=self._on_key_down)
-        # 渲染图片
-        self._render_images()
-        self.show_images(self.index)
+        self.show_images(index)
 
     def on_canceled(self):
         pass
@@ -62,16 +68,42 @@ class ImagesViewer(FloatLayout):
     def _on_key_down(self, keyboard, keycode, text, modifiers):
         logger.debug(f"keycode: {keycode}, text: {text}, modifiers: {modifiers}")
         if keycode[1] == "left":
-            self.ids.images_carousel.load_previous()
+            self.show_images(self.index - 1)
         elif keycode[1] == "right":
-            self.ids.images_carousel.load_next(mode="next")
+            self.show_images(self.index + 1)
         else:
             return False
 
-    def _render_images(self):
-        for image in self.images:
-            logger.debug(f"Render image: {image}")
-            self.ids.images_carousel.add_widget(Image(source=image, fit_mode="contain"))
+    def on_touch_up(self, touch):
+        # 左右滑动翻页
+        if self.collide_point(*touch.opos):
+            distance = touch.x - touch.ox
+            if abs(distance) >= self.SWIPE_DISTANCE:
+                self.show_images(self.index + (-1 if distance > 0 else 1))
+                return True
+        return super(ImagesViewer, self).on_touch_up(touch)
 
     def show_images(self, index):
-        self.ids.images_carousel.index = index
+        if not self.images:
+            return
+        index = max(0, min(index, len(self.images) - 1))
+        self.index = index
+        last = len(self.images) - 1
+        self.ids.images_strip.scroll_x = index / last if last > 0 else 0
+        self._prefetch_window(index)
+
+    def _prefetch_window(self, index):
+        # 由近及远预取窗口内的图片，取消移出窗口的预取
+        window = range(
+            max(index - self.window, 0), min(index + self.window + 1, len(self.images))
+        )
+        self.texture_cache.cancel_prefetch()
+        for i in sorted(window, key=lambda i: abs(i - index)):
+            if i != index:
+                logger.debug(f"Prefetch image {i}: {describe_image(self.images[i])}")
+                self.texture_cache.prefetch(self.images[i])
+
+    def release(self):
+        # 关闭预览时取消加载并释放全部纹理
+        self.ids.images_strip.set_images([])
+        self.texture_cache.clear()
@@ -0,0 +1,82 @@
+import logging
+
+from kivy.core.window import Window
+from kivy.graphics.texture import Texture
+from kivy.properties import ObjectProperty
+from kivy.uix.image import Image
+from kivy.uix.videoplayer import VideoPlayerProgressBar
+
+logger = logging.getLogger(__name__)
+
+
+# 拖动预览：鼠标悬停在播放器进度条上时，显示最接近该位置的预览帧
+class ScrubPreview(Image):
+    strip = ObjectProperty(None, allownone=True)
+
+    def __init__(self, video_player, **kwargs):
+        kwargs.setdefault("size_hint", (None, None))
+        kwargs.setdefault("opacity", 0)
+        super(ScrubPreview, self).__init__(**kwargs)
+        self.video_player = video_player
+        self._progress_bar = None
+        self._frame_index = None
+        Window.bind(mouse_pos=self._on_mouse_pos)
+        Window.add_widget(self)
+
+    def on_strip(self, instance, strip):
+        self._frame_index = None
+        self.opacity = 0
+        if strip is None:
+            self.texture = None
+            return
+
+        width, height = strip.frame_size
+        texture = Texture.create(size=(width, height), colorfmt="bgr")
+        # 视频帧的原点在左上角，纹理原点在左下角
+        texture.flip_vertical()
+        self.texture = texture
+        self.size = (width, height)
+
+    def _get_progress_bar(self):
+        if self._progress_bar is None:
+            for widget in self.video_player.walk(restrict=True):
+                if isinstance(widget, VideoPlayerProgressBar):
+                    self._progress_bar = widget
+                    break
+        return self._progress_bar
+
+    def _on_mouse_pos(self, window, pos):
+        progress_bar = self._get_progress_bar()
+        if self.strip is None or progress_bar is None or progress_bar.width <= 0:
+            return
+
+        x, y = progress_bar.to_widget(*pos)
+        if not progress_bar.collide_point(x, y):
+            self.opacity = 0
+            return
+
+        fraction = (x - progress_bar.x) / progress_bar.width
+        self._show_frame(fraction)
+
+        # 预览帧显示在鼠标上方
+        self.pos = (
+            min(max(pos[0] - self.width / 2, 0), Window.width - self.width),
+            pos[1] + 20,
+        )
+        self.opacity = 1
+
+    def _show_frame(self, fraction):
+        frame_index = int(round(fraction * (self.strip.frame_count - 1)))
+        if frame_index == self._frame_index:
+            return
+        self._frame_index = frame_index
+
+        # 直接上传内存映射中的帧数据，无需解码
+        frame = self.strip.frame_at(fraction)
+        self.texture.blit_buffer(memoryview(frame), colorfmt="bgr", bufferfmt="ubyte")
+        self.canvas.ask_update()
+
+    def release(self):
+        Window.unbind(mouse_pos=self._on_mouse_pos)
+        if self.parent is not None:
+            self.parent.remove_widget(self)
@@ -0,0 +1,456 @@
+import logging
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from kivy.clock import Clock, mainthread
+from kivy.graphics.texture import Texture
+from utils.job_util import Job, JobExecutor
+from utils.priority_util import lower_current_thread_priority
+
+logger = logging.getLogger(__name__)
+
+# 图片解码专用执行器，避免与缩略图生成任务争抢线程
+image_executor = JobExecutor(max_workers=2, thread_name_prefix="image-loader")
+# 预取解码专用执行器：单线程、后台优先级，不占用前台图片解码的线程
+prefetch_image_executor = JobExecutor(
+    max_workers=1,
+    thread_name_prefix="image-prefetch",
+    initializer=lower_current_thread_priority,
+)
+
+
+def decode_image(image, max_size: Optional[Tuple[int, int]] = None):
+    """
+    解码图片为 BGR 帧
+
+    Args:
+        image (str | bytes): 图片文件路径或编码后的图片数据（打包存储）
+        max_size (Tuple[int, int], optional): 最大尺寸 (宽, 高)，超出时等比缩小
+
+    Returns:
+        numpy.ndarray: BGR 帧
+
+    Raises:
+        ValueError: 图片无法解码
+    """
+    # cv2、numpy 导入较慢，用到时才导入，界面控件创建时不需要
+    import cv2
+    import numpy as np
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        data = np.frombuffer(image, dtype=np.uint8)
+    else:
+        # 先读入内存再解码，兼容非 ASCII 路径
+        data = np.fromfile(image, dtype=np.uint8)
+    frame = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("无法解码图片")
+
+    if max_size is not None:
+        height, width = frame.shape[:2]
+        scale = min(max_size[0] / width, max_size[1] / height)
+        if scale < 1:
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    return frame
+
+
+def create_texture(frame) -> Texture:
+    """由 BGR 帧（numpy.ndarray）创建纹理，只能在主线程调用"""
+    import numpy as np
+
+    height, width = frame.shape[:2]
+    texture = Texture.create(size=(width, height), colorfmt="bgr")
+    # 图片的原点在左上角，纹理原点在左下角
+    texture.flip_vertical()
+    texture.blit_buffer(
+        memoryview(np.ascontiguousarray(frame)), colorfmt="bgr", bufferfmt="ubyte"
+    )
+    return texture
+
+
+# 纹理异步加载
+class TextureLoader:
+    """
+    在后台线程解码图片，解码完成后在主线程创建纹理并回调
+
+    GPU 纹理只能在主线程创建，耗时的文件读取与解码放到后台执行，
+    主线程只做一次纹理上传。
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[Tuple[int, int]] = None,
+        executor: JobExecutor = image_executor,
+    ):
+        """
+        初始化加载器
+
+        Args:
+            max_size (Tuple[int, int], optional): 解码后的最大尺寸 (宽, 高)
+            executor (JobExecutor): 解码使用的执行器
+        """
+        self.max_size = max_size
+        self.executor = executor
+
+    def load(
+        self,
+        image,
+        callback: Callable[[Texture], None],
+        on_failed: Callable[[BaseException], None] = None,
+        create: Callable[..., Texture] = create_texture,
+    ) -> Job:
+        """
+        异步加载纹理
+
+        Args:
+            image (str | bytes): 图片文件路径或编码后的图片数据
+            callback (Callable): 加载完成回调 callback(texture)，在主线程执行；
+                任务被取消或解码失败时不调用
+            on_failed (Callable, optional): 解码失败回调 on_failed(exception)
+            create (Callable): 在主线程由解码后的帧创建纹理 create(frame)
+
+        Returns:
+            Job: 加载任务，可通过 cancel 取消尚未完成的加载
+        """
+        job = Job(name="load-texture")
+        job.bind(
+            on_complete=lambda job: self._on_decoded(job, callback, on_failed, create)
+        )
+        return self.executor.submit(job, self._decode, image)
+
+    def _decode(self, job, image):
+        return decode_image(image, self.max_size)
+
+    @mainthread
+    def _on_decoded(self, job, callback, on_failed, create):
+        if job.cancelled:
+            return
+        if job.exception() is not None:
+            logger.warning(f"Load texture failed: {job.exception()}")
+            if on_failed is not None:
+                on_failed(job.exception())
+            return
+        callback(create(job.result()))
+
+
+# 纹理缓存
+class TextureCache:
+    """
+    按内存预算淘汰的纹理 LRU 缓存，多个视图与多次选择之间共享
+
+    同一图片的并发请求只解码一次；预取在单独的低优先级线程中解码，
+    前台请求同一图片时取消预取。所有方法都应在主线程调用。
+    """
+
+    # 默认内存预算（字节）
+    DEFAULT_BUDGET = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_BUDGET,
+        max_size: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            budget (int): 纹理内存预算（字节），超出时淘汰最久未使用的纹理
+            max_size (Tuple[int, int], optional): 解码后的最大尺寸 (宽, 高)
+        """
+        self.budget = budget
+        self.loader = TextureLoader(max_size)
+        self.prefetch_loader = TextureLoader(max_size, prefetch_image_executor)
+        self._textures = OrderedDict()
+        self._size = 0
+        # 加载中的图片：键 -> (任务, 回调列表)
+        self._pending = {}
+        # 预取中的图片：键 -> 任务
+        self._prefetching = {}
+
+    @staticmethod
+    def get_key(image):
+        """缓存键：文件路径或图片数据本身"""
+        return bytes(image) if isinstance(image, (bytearray, memoryview)) else image
+
+    def get(self, image) -> Optional[Texture]:
+        """获取已缓存的纹理，未缓存返回 None"""
+        key = self.get_key(image)
+        texture = self._textures.get(key)
+        if texture is not None:
+            self._textures.move_to_end(key)
+        return texture
+
+    def request(self, image, callback: Callable[[Texture], None]):
+        """
+        请求纹理：已缓存时立即回调，否则后台加载完成后回调
+
+        Args:
+            image (str | bytes): 图片文件路径或编码后的图片数据
+            callback (Callable): 回调 callback(texture)
+        """
+        texture = self.get(image)
+        if texture is not None:
+            callback(texture)
+            return
+
+        key = self.get_key(image)
+        if key in self._pending:
+            self._pending[key][1].append(callback)
+            return
+
+        prefetch_job = self._prefetching.pop(key, None)
+        if prefetch_job is not None:
+            # 前台请求优先：取消排队中的预取，改由前台加载
+            prefetch_job.cancel()
+
+        job = self.loader.load(
+            image,
+            lambda texture: self._on_loaded(key, texture),
+            on_failed=lambda exception: self._pending.pop(key, None),
+            create=lambda frame: self._create_texture(key, frame),
+        )
+        self._pending[key] = (job, [callback])
+
+    def cancel(self, image, callback: Callable[[Texture], None]):
+        """取消请求，没有其它请求者时取消加载任务"""
+        key = self.get_key(image)
+        pending = self._pending.get(key)
+        if pending is None or callback not in pending[1]:
+            return
+        pending[1].remove(callback)
+        if not pending[1]:
+            pending[0].cancel()
+            del self._pending[key]
+
+    def prefetch(self, image):
+        """
+        在后台以低优先级预先加载纹理，已缓存或加载中时跳过
+
+        Args:
+            image (str | bytes): 图片文件路径或编码后的图片数据
+        """
+        key = self.get_key(image)
+        if key in self._textures or key in self._pending or key in self._prefetching:
+            return
+        self._prefetching[key] = self.prefetch_loader.load(
+            image,
+            lambda texture: self._on_prefetched(key, texture),
+            on_failed=lambda exception: self._prefetching.pop(key, None),
+            create=lambda frame: self._create_texture(key, frame),
+        )
+
+    def cancel_prefetch(self):
+        """取消所有未完成的预取"""
+        for job in self._prefetching.values():
+            job.cancel()
+        self._prefetching.clear()
+
+    def clear(self):
+        self.cancel_prefetch()
+        for job, _ in self._pending.values():
+            job.cancel()
+        self._pending.clear()
+        self._textures.clear()
+        self._size = 0
+
+    def _create_texture(self, key, frame):
+        return create_texture(frame)
+
+    def _on_loaded(self, key, texture):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self._put(key, texture)
+        for callback in pending[1]:
+            callback(texture)
+
+    def _on_prefetched(self, key, texture):
+        if self._prefetching.pop(key, None) is not None:
+            self._put(key, texture)
+
+    def _put(self, key, texture):
+        self._textures[key] = texture
+        self._size += self._texture_size(texture)
+        # 淘汰最久未使用的纹理，至少保留刚加入的纹理
+        while self._size > self.budget and len(self._textures) > 1:
+            _, evicted = self._textures.popitem(last=False)
+            self._size -= self._texture_size(evicted)
+
+    @staticmethod
+    def _texture_size(texture):
+        width, height = texture.size
+        return width * height * 3
+
+    def __len__(self):
+        return len(self._textures)
+
+
+# 图集中的一页
+class AtlasPage:
+    def __init__(self, size: int):
+        import numpy as np
+
+        self.size = size
+        self.texture = Texture.create(size=(size, size), colorfmt="bgr")
+        # CPU 端像素缓冲，行号与纹理的 y 坐标一致（原点在左下角）
+        self.buffer = np.zeros((size, size, 3), dtype=np.uint8)
+        self.keys = set()
+        # 当前行（shelf）的位置与高度
+        self.x = 0
+        self.y = 0
+        self.shelf_height = 0
+        # 待上传的行范围
+        self.dirty = None
+
+    def allocate(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """按行装箱分配区域，空间不足返回 None"""
+        if self.x + width > self.size:
+            self.x = 0
+            self.y += self.shelf_height
+            self.shelf_height = 0
+        if width > self.size or self.y + height > self.size:
+            return None
+        pos = (self.x, self.y)
+        self.x += width
+        self.shelf_height = max(self.shelf_height, height)
+        return pos
+
+
+# 动态纹理图集
+class TextureAtlas:
+    """
+    把小图装箱到少数几张大纹理中，以纹理区域的形式返回
+
+    同一页上的图片共用一个 GPU 纹理，绘制时无需切换纹理；
+    写入先进入 CPU 端缓冲，同一帧内的多次写入合并为每页一次上传。
+    页数达到上限时淘汰最早的一页。
+    """
+
+    # 每页的边长
+    PAGE_SIZE = 1024
+    # 图片之间的间隔，避免采样时相邻图片渗色
+    PADDING = 1
+
+    def __init__(
+        self,
+        page_size: int = PAGE_SIZE,
+        max_pages: int = 4,
+        on_page_evicted: Callable[[AtlasPage], None] = None,
+    ):
+        """
+        初始化图集
+
+        Args:
+            page_size (int): 每页的边长
+            max_pages (int): 最大页数
+            on_page_evicted (Callable, optional): 页被淘汰时的回调 on_page_evicted(page)
+        """
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.on_page_evicted = on_page_evicted
+        self.pages = []
+        self._upload_trigger = Clock.create_trigger(self._upload)
+
+    def add(self, key, frame) -> Optional[Texture]:
+        """
+        添加一张图片
+
+        Args:
+            key: 图片的键，记录在所在页中
+            frame (numpy.ndarray): BGR 帧
+
+        Returns:
+            Texture: 图片所在的纹理区域，图片大于一页时返回 None
+        """
+        height, width = frame.shape[:2]
+        padded = (width + self.PADDING, height + self.PADDING)
+        if max(padded) > self.page_size:
+            return None
+
+        pos = self.pages[-1].allocate(*padded) if self.pages else None
+        if pos is None:
+            if len(self.pages) >= self.max_pages:
+                self._evict(self.pages.pop(0))
+            self.pages.append(AtlasPage(self.page_size))
+            pos = self.pages[-1].allocate(*padded)
+
+        page = self.pages[-1]
+        x, y = pos
+        # 图片的原点在左上角，按纹理坐标上下翻转后写入
+        page.buffer[y : y + height, x : x + width] = frame[::-1]
+        page.keys.add(key)
+        if page.dirty is None:
+            page.dirty = (y, y + height)
+        else:
+            page.dirty = (min(page.dirty[0], y), max(page.dirty[1], y + height))
+        self._upload_trigger()
+        return page.texture.get_region(x, y, width, height)
+
+    def clear(self):
+        for page in self.pages:
+            self._evict(page)
+        self.pages.clear()
+
+    def _evict(self, page):
+        logger.debug(f"Evict atlas page with {len(page.keys)} images")
+        if self.on_page_evicted is not None:
+            self.on_page_evicted(page)
+
+    def _upload(self, dt):
+        for page in self.pages:
+            if page.dirty is None:
+                continue
+            start, end = page.dirty
+            page.dirty = None
+            page.texture.blit_buffer(
+                memoryview(page.buffer[start:end]),
+                pos=(0, start),
+                size=(page.size, end - start),
+                colorfmt="bgr",
+                bufferfmt="ubyte",
+            )
+
+
+# 图集纹理缓存
+class AtlasTextureCache(TextureCache):
+    """
+    纹理存入动态图集的纹理缓存，按页淘汰
+
+    缩略图条中的所有缩略图只占用几张纹理，切换视频时的上传按帧合并。
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 4,
+        max_size: Optional[Tuple[int, int]] = None,
+        page_size: int = TextureAtlas.PAGE_SIZE,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            max_pages (int): 图集最大页数
+            max_size (Tuple[int, int], optional): 解码后的最大尺寸 (宽, 高)
+            page_size (int): 图集每页的边长
+        """
+        super(AtlasTextureCache, self).__init__(
+            budget=max_pages * page_size * page_size * 3, max_size=max_size
+        )
+        self.atlas = TextureAtlas(page_size, max_pages, self._on_page_evicted)
+
+    def clear(self):
+        super(AtlasTextureCache, self).clear()
+        self.atlas.clear()
+
+    def _create_texture(self, key, frame):
+        # 超过一页大小的图片使用独立纹理
+        return self.atlas.add(key, frame) or create_texture(frame)
+
+    def _put(self, key, texture):
+        # 内存由图集按页管理
+        self._textures[key] = texture
+
+    def _on_page_evicted(self, page):
+        for key in page.keys:
+            self._textures.pop(key, None)
@@ -0,0 +1,103 @@
+import logging
+
+from gui.image.texture_loader import AtlasTextureCache, TextureCache
+from kivy.lang import Builder
+from kivy.properties import NumericProperty, ObjectProperty
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.image import Image
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+logger = logging.getLogger(__name__)
+
+Builder.load_string(
+    """
+
+<ThumbnailStrip>:
+    viewclass: "ThumbnailStripItem"
+    do_scroll_x: True
+    do_scroll_y: False
+    RecycleBoxLayout:
+        orientation: "horizontal"
+        spacing: root.spacing
+        default_size: root.item_width, None
+        default_size_hint: None, 1
+        size_hint_x: None
+        width: self.minimum_width
+
+"""
+)
+
+# 缩略图条共享的纹理缓存，切换视频后再切回时无需重新解码
+thumbnail_texture_cache = TextureCache(max_size=(320, 320))
+# 图集模式的纹理缓存：缩小后装入少数几张图集纹理
+thumbnail_atlas_cache = AtlasTextureCache(max_size=(160, 160))
+
+
+# 缩略图条中的缩略图，由 RecycleView 复用
+class ThumbnailStripItem(RecycleDataViewBehavior, ButtonBehavior, Image):
+    index = NumericProperty(0)
+    image = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("fit_mode", "contain")
+        super(ThumbnailStripItem, self).__init__(**kwargs)
+        self.strip = None
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.strip = rv
+        # 复用前取消旧图片的加载请求
+        if self.image is not None and self.image is not data["image"]:
+            rv.texture_cache.cancel(self.image, self._on_texture_loaded)
+        super(ThumbnailStripItem, self).refresh_view_attrs(rv, index, data)
+
+    def on_image(self, instance, image):
+        if image is None or self.strip is None:
+            self.texture = None
+            return
+        self.texture = self.strip.texture_cache.get(image)
+        if self.texture is None:
+            self.strip.texture_cache.request(image, self._on_texture_loaded)
+
+    def _on_texture_loaded(self, texture):
+        self.texture = texture
+
+    def on_release(self):
+        if self.strip is not None:
+            self.strip.dispatch("on_thumbnail_release", self)
+
+
+# 视频缩略图条
+class ThumbnailStrip(RecycleView):
+    """
+    横向虚拟化的缩略图条
+
+    只为可见区域创建并复用少量缩略图控件，图片在后台解码，
+    纹理存入按内存预算淘汰的共享缓存。
+    """
+
+    __events__ = ("on_thumbnail_release",)
+    item_width = NumericProperty(100)
+    spacing = NumericProperty(10)
+    texture_cache = ObjectProperty(thumbnail_texture_cache)
+
+    def set_images(self, images):
+        """替换全部缩略图"""
+        self.data = [{"index": i, "image": image} for i, image in enumerate(images)]
+        self.scroll_x = 0
+
+    def add_image(self, image):
+        """追加一张缩略图"""
+        self.data.append({"index": len(self.data), "image": image})
+
+    def prefetch(self, images):
+        """在后台以低优先级把图片预先加载到纹理缓存"""
+        for image in images:
+            self.texture_cache.prefetch(image)
+
+    def cancel_prefetch(self):
+        """取消未完成的预取，让出解码线程"""
+        self.texture_cache.cancel_prefetch()
+
+    def on_thumbnail_release(self, item):
+        pass
@@ -0,0 +1,147 @@
+import logging
+
+from core.video_poster import VideoPoster
+from gui.image.texture_loader import TextureCache
+from kivy.clock import mainthread
+from kivy.lang import Builder
+from kivy.properties import NumericProperty, ObjectProperty, StringProperty
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+logger = logging.getLogger(__name__)
+
+Builder.load_string(
+    """
+
+<VideoGalleryItem>:
+    orientation: "vertical"
+    padding: 4
+    Image:
+        id: poster_image
+        fit_mode: "contain"
+    Label:
+        text: root.filename
+        size_hint_y: None
+        height: 20
+        font_size: 12
+        shorten: True
+        text_size: self.width, None
+
+<VideoGallery>:
+    viewclass: "VideoGalleryItem"
+    RecycleGridLayout:
+        cols: max(1, int(root.width // root.item_width))
+        default_size: None, root.item_height
+        default_size_hint: 1, None
+        size_hint_y: None
+        height: self.minimum_height
+
+"""
+)
+
+# 画廊共享的封面纹理缓存
+poster_texture_cache = TextureCache(max_size=VideoPoster.POSTER_SIZE)
+
+
+# 画廊中的视频，由 RecycleView 复用
+class VideoGalleryItem(RecycleDataViewBehavior, ButtonBehavior, BoxLayout):
+    file_info = ObjectProperty(None, allownone=True)
+    filename = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super(VideoGalleryItem, self).__init__(**kwargs)
+        self.gallery = None
+        self._poster_job = None
+        self._poster_path = None
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.gallery = rv
+        super(VideoGalleryItem, self).refresh_view_attrs(rv, index, data)
+
+    def on_file_info(self, instance, file_info):
+        # 控件被复用到其它视频：取消移出可见区域的视频的封面生成与加载
+        self._cancel_poster()
+        self.ids.poster_image.texture = None
+        if file_info is None or self.gallery is None:
+            return
+
+        self.filename = file_info.name
+        self.gallery.active_items.add(self)
+        # 已生成的封面在后台直接返回，主线程不做文件读取
+        self._poster_job = VideoPoster.submit_generate(
+            self.gallery.extractor,
+            file_info.path,
+            on_complete=lambda job: self._on_poster_generated(file_info, job),
+        )
+
+    @mainthread
+    def _on_poster_generated(self, file_info, job):
+        if file_info is not self.file_info or job.cancelled:
+            return
+        self._poster_job = None
+        if job.exception() is not None:
+            logger.warning(f"Generate poster of [{file_info.path}] failed")
+            return
+        self._load_poster(job.result())
+
+    def _load_poster(self, poster_path):
+        self._poster_path = poster_path
+        self.gallery.texture_cache.request(poster_path, self._on_texture_loaded)
+
+    def _on_texture_loaded(self, texture):
+        self.ids.poster_image.texture = texture
+
+    def _cancel_poster(self):
+        if self._poster_job is not None:
+            self._poster_job.cancel()
+            self._poster_job = None
+        if self._poster_path is not None:
+            self.gallery.texture_cache.cancel(
+                self._poster_path, self._on_texture_loaded
+            )
+            self._poster_path = None
+
+    def on_release(self):
+        if self.gallery is not None:
+            self.gallery.dispatch("on_video_selected", self.file_info)
+
+
+# 文件夹画廊
+class VideoGallery(RecycleView):
+    """
+    文件夹画廊：网格显示文件夹中每个视频的封面
+
+    只为可见区域创建控件，封面在控件显示时才生成，
+    滚动出可见区域的控件被复用时取消其未完成的封面生成，
+    因此大文件夹中可见的封面总是最先生成。
+    """
+
+    __events__ = ("on_video_selected",)
+    item_width = NumericProperty(200)
+    item_height = NumericProperty(150)
+    texture_cache = ObjectProperty(poster_texture_cache)
+
+    def __init__(self, extractor, files, **kwargs):
+        """
+        初始化画廊
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器，用于生成封面
+            files (List[FileInfo]): 视频文件信息
+        """
+        super(VideoGallery, self).__init__(**kwargs)
+        self.extractor = extractor
+        # 显示过视频的画廊控件，关闭时取消其封面任务
+        self.active_items = set()
+        self.data = [{"file_info": file_info} for file_info in files]
+
+    def release(self):
+        # 关闭画廊时取消全部未完成的封面生成
+        for item in self.active_items:
+            item._cancel_poster()
+        self.active_items.clear()
+
+    def on_video_selected(self, file_info):
+        pass
@@ -4,8 +4,15 @@ import sys
 from configparser import ConfigParser
 from pathlib import Path
 
-from dynaconf import Dynaconf
+from utils.startup_util import start_startup_timer
+
+# 启动计时需在导入 Kivy 等模块之前开始：VIDEO_PREVIEW_STARTUP_REPORT=1 输出到日志，
+# 设为文件路径时同时保存 JSON 报告
+startup_timer = start_startup_timer(os.getenv("VIDEO_PREVIEW_STARTUP_REPORT"))
+
+from core.context import APP_CTX, get_setting
 from kivy.config import Config
+from utils.trace_util import tracer
 
 
 def get_source_path(relative_path):
@@ -28,10 +35,13 @@ def init_kivy_config():
     # 读取config文件，并修改其默认字体
     config = ConfigParser()
     config.read(config_path, encoding="UTF-8")
-    config.set("kivy", "default_font", str(["SourceHanSansSC-Normal", font_path]))
+    default_font = str(["SourceHanSansSC-Normal", font_path])
 
-    with open(config_path, "w") as configfile:
-        config.write(configfile)
+    # 只在配置变化时写回，避免每次启动都重写配置文件
+    if config.get("kivy", "default_font", fallback=None) != default_font:
+        config.set("kivy", "default_font", default_font)
+        with open(config_path, "w") as configfile:
+            config.write(configfile)
 
     # 将config读入并运用到全局
     Config.read(config_path)
@@ -40,21 +50,10 @@ def init_kivy_config():
 init_kivy_config()
 
 
-from video_preview import VideoPreviewApp
-
-
-class AppContext:
-
-    def __init__(self):
-        self.app_name = "视频预览工具"
-        self.settings = None
-        self.env = None
-
-
-APP_CTX = AppContext()
-
-
 def init_config():
+    # Dynaconf 导入较慢，使用时才导入
+    from dynaconf import Dynaconf
+
     APP_CTX.settings = Dynaconf(
         root_path="config",
         settings_files=["*.yaml", "*.yml"],
@@ -82,6 +81,14 @@ def init_logger():
     logging.getLogger().setLevel(APP_CTX.settings.logger.level)
 
 
+def init_tracing():
+    # 分阶段耗时追踪，关闭时几乎没有开销
+    tracer.configure(
+        get_setting("trace.enabled", False),
+        get_setting("trace.output", "~/.video-preview/trace.json"),
+    )
+
+
 def print_app_config():
     logging.info("----------- Start application %s -----------", APP_CTX.app_name)
     logging.info("---- ENV: %s ", APP_CTX.env)
@@ -90,9 +97,38 @@ def print_app_config():
 def init_app():
     init_config()
     init_logger()
+    init_tracing()
     print_app_config()
 
 
-if __name__ == "__main__":
+def mark_startup(name):
+    if startup_timer is not None:
+        startup_timer.mark(name)
+
+
+def run_app():
+    mark_startup("kivy_config")
     init_app()
-    VideoPreviewApp().run()
+    mark_startup("app_config")
+
+    # 界面模块在配置加载后才导入
+    from kivy.core.window import Window
+    from video_preview import VideoPreviewApp
+
+    mark_startup("import_gui")
+    app = VideoPreviewApp()
+    if startup_timer is not None:
+
+        def on_first_flip(window):
+            # 首帧绘制完成；视频处理模块（cv2）在此之后才导入
+            window.unbind(on_flip=on_first_flip)
+            startup_timer.finish("first_frame")
+
+        # on_start 时界面已构建，首帧在之后的第一次 on_flip 时完成绘制
+        app.bind(on_start=lambda app: mark_startup("build"))
+        app.bind(on_start=lambda app: Window.bind(on_flip=on_first_flip))
+    app.run()
+
+
+if __name__ == "__main__":
+    run_app()
@@ -0,0 +1,591 @@
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def load_av():
+    """导入可选依赖 PyAV（导入耗时较长，首次使用时才导入），未安装时返回 None"""
+    try:
+        import av
+    except ImportError:
+        return None
+    return av
+
+
+class VideoDecoder(ABC):
+    """
+    视频解码后端接口
+
+    与 cv2.VideoCapture 的读取语义一致：seek(n) 之后的第一次 grab/read 得到第 n 帧；
+    grab 只解码不转换像素格式，retrieve 将最近一次 grab 的帧转换为 BGR 图像。
+    子类须实现 position、grab、retrieve 和 seek；支持只解码关键帧的后端
+    另外覆盖 supports_keyframes_only 与 iter_keyframes。
+    """
+
+    # 后端名称
+    name = ""
+
+    def __init__(self, video_path: str):
+        self.video_path = str(video_path)
+        self.fps = 0.0
+        self.frame_count = 0
+        self.width = 0
+        self.height = 0
+        self.codec = ""
+
+    @property
+    @abstractmethod
+    def position(self) -> int:
+        """下一次 grab/read 得到的帧位置，未知时为 -1"""
+
+    @staticmethod
+    def available() -> bool:
+        # 后端依赖是否已安装
+        return True
+
+    @abstractmethod
+    def grab(self) -> bool:
+        """解码下一帧，不转换像素格式"""
+
+    @abstractmethod
+    def retrieve(self, buffer: np.ndarray = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        将最近一次 grab 的帧转换为 BGR 图像
+
+        Args:
+            buffer (numpy.ndarray, optional): 复用的输出缓冲区，尺寸匹配时写入其中
+
+        Returns:
+            Tuple[bool, numpy.ndarray]: (是否成功, 图像)
+        """
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """解码并返回下一帧"""
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    @abstractmethod
+    def seek(self, frame_pos: int):
+        """定位到指定帧，之后第一次 grab/read 得到该帧"""
+
+    def iter_keyframes(self) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        顺序读取所有关键帧（跳过非关键帧的解码）
+
+        只有 supports_keyframes_only 为 True 的后端支持，调用前应先检查。
+
+        Yields:
+            Tuple[float, numpy.ndarray]: (时间点, 图像)
+
+        Raises:
+            ValueError: 如果后端不支持只解码关键帧
+        """
+        raise ValueError(f"解码后端 {self.name} 不支持只解码关键帧")
+
+    @property
+    def supports_keyframes_only(self) -> bool:
+        # 是否支持 iter_keyframes
+        return False
+
+    def release(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class OpenCVDecoder(VideoDecoder):
+    """基于 cv2.VideoCapture 的解码后端"""
+
+    name = "opencv"
+
+    def __init__(self, video_path: str):
+        super().__init__(video_path)
+        self._cap = cv2.VideoCapture(self.video_path)
+        if not self._cap.isOpened():
+            raise ValueError(f"无法打开视频文件: {video_path}")
+
+        self.fps = self._cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fourcc = int(self._cap.get(cv2.CAP_PROP_FOURCC))
+        self.codec = "".join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4))
+
+    @property
+    def position(self) -> int:
+        return int(self._cap.get(cv2.CAP_PROP_POS_FRAMES))
+
+    def grab(self) -> bool:
+        return self._cap.grab()
+
+    def retrieve(self, buffer: np.ndarray = None):
+        return self._cap.retrieve(buffer)
+
+    def read(self):
+        return self._cap.read()
+
+    def seek(self, frame_pos: int):
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
+
+    def release(self):
+        self._cap.release()
+
+
+class PyAVDecoder(VideoDecoder):
+    """
+    基于 PyAV 的解码后端
+
+    开启编解码器多线程（thread_type="AUTO"），只读关键帧时设置
+    skip_frame="NONKEY"，解码器直接丢弃非关键帧。
+    """
+
+    name = "pyav"
+
+    def __init__(self, video_path: str):
+        super().__init__(video_path)
+        av = load_av()
+        if av is None:
+            raise ValueError("未安装 PyAV")
+        try:
+            self._container = av.open(self.video_path)
+        except av.error.FFmpegError as e:
+            raise ValueError(f"无法打开视频文件: {video_path}") from e
+        if not self._container.streams.video:
+            self._container.close()
+            raise ValueError(f"视频文件中没有视频流: {video_path}")
+
+        self._stream = self._container.streams.video[0]
+        self._stream.thread_type = "AUTO"
+        self._time_base = float(self._stream.time_base)
+        self._start_pts = self._stream.start_time or 0
+
+        rate = self._stream.average_rate or self._stream.guessed_rate
+        self.fps = float(rate) if rate else 25.0
+        self.frame_count = self._stream.frames
+        if not self.frame_count and self._stream.duration:
+            self.frame_count = int(self._stream.duration * self._time_base * self.fps)
+        self.width = self._stream.width
+        self.height = self._stream.height
+        self.codec = self._stream.codec_context.name
+
+        self._frames = self._container.decode(self._stream)
+        self._frame = None
+        # seek 时为找到目标帧已解码、尚未被 grab 取走的帧
+        self._pending = None
+        self._position = 0
+
+    @staticmethod
+    def available() -> bool:
+        return load_av() is not None
+
+    def _next_frame(self):
+        try:
+            return next(self._frames)
+        except (StopIteration, load_av().error.FFmpegError):
+            return None
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def grab(self) -> bool:
+        if self._pending is not None:
+            self._frame, self._pending = self._pending, None
+        else:
+            self._frame = self._next_frame()
+        if self._frame is None:
+            return False
+        if self._position >= 0:
+            self._position += 1
+        return True
+
+    def retrieve(self, buffer: np.ndarray = None):
+        if self._frame is None:
+            return False, None
+        image = self._frame.to_ndarray(format="bgr24")
+        if buffer is not None and buffer.shape == image.shape:
+            np.copyto(buffer, image)
+            return True, buffer
+        return True, image
+
+    def _frame_pts(self, frame_pos: int) -> int:
+        return self._start_pts + int(frame_pos / self.fps / self._time_base)
+
+    def seek(self, frame_pos: int):
+        # 定位到目标帧之前的关键帧，再解码到目标帧（与 OpenCV 的精确定位一致）
+        target = self._frame_pts(frame_pos)
+        tolerance = 0.5 / self.fps / self._time_base
+        self._container.seek(target, stream=self._stream, backward=True)
+        self._frames = self._container.decode(self._stream)
+        self._frame = None
+        self._pending = None
+        self._position = frame_pos
+
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return
+            if frame.pts is None or frame.pts >= target - tolerance:
+                self._pending = frame
+                return
+
+    @property
+    def supports_keyframes_only(self) -> bool:
+        return True
+
+    def iter_keyframes(self):
+        self._container.seek(self._start_pts, stream=self._stream, backward=True)
+        context = self._stream.codec_context
+        context.skip_frame = "NONKEY"
+        try:
+            for frame in self._container.decode(self._stream):
+                # 没有时间戳的帧无法定位，跳过
+                if frame.pts is None:
+                    continue
+                time_point = (frame.pts - self._start_pts) * self._time_base
+                yield time_point, frame.to_ndarray(format="bgr24")
+        finally:
+            context.skip_frame = "DEFAULT"
+            self._frames = self._container.decode(self._stream)
+            self._frame = None
+            self._pending = None
+            self._position = -1
+
+    def release(self):
+        self._container.close()
+
+
+# 已注册的解码后端
+DECODER_BACKENDS = {
+    OpenCVDecoder.name: OpenCVDecoder,
+    PyAVDecoder.name: PyAVDecoder,
+}
+
+
+def get_available_backends():
+    return [name for name, cls in DECODER_BACKENDS.items() if cls.available()]
+
+
+class DecoderSelector:
+    """
+    解码后端自动选择
+
+    按编码格式在本机首次遇到的视频上对所有可用后端做一次小型基准测试
+    （顺序解码若干帧 + 若干次随机定位），选出最快的后端并缓存结果，
+    可选地保存到 JSON 文件供下次启动复用。
+    """
+
+    # 基准测试顺序解码的帧数
+    BENCHMARK_FRAMES = 30
+    # 基准测试随机定位的位置（占视频长度的比例）
+    BENCHMARK_SEEKS = (0.25, 0.5, 0.75)
+
+    def __init__(self, cache_file: str = None):
+        """
+        初始化选择器
+
+        Args:
+            cache_file (str, optional): 基准测试结果文件
+        """
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict[str, object]] = {}
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    self._results = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Load decoder benchmark [{cache_file}] failed: {e}")
+
+    def select(self, video_path: str, codec: str) -> str:
+        """
+        选择指定编码格式最快的后端，未测试过时以该视频做基准测试
+
+        Args:
+            video_path (str): 视频文件路径
+            codec (str): 编码格式（FourCC）
+
+        Returns:
+            str: 后端名称
+        """
+        backends = get_available_backends()
+        if len(backends) == 1:
+            return backends[0]
+
+        with self._lock:
+            result = self._results.get(codec)
+            if result is not None and result["backend"] in backends:
+                return result["backend"]
+
+            timings = self.benchmark(video_path, backends)
+            if not timings:
+                return OpenCVDecoder.name
+            best = min(timings, key=timings.get)
+            logger.info(f"Decoder benchmark of [{codec}]: {timings}, use {best}")
+
+            self._results[codec] = {"backend": best, "timings": timings}
+            self._save()
+            return best
+
+    def benchmark(self, video_path: str, backends=None) -> Dict[str, float]:
+        """
+        对各后端做基准测试
+
+        Args:
+            video_path (str): 视频文件路径
+            backends (List[str], optional): 后端名称，默认所有可用后端
+
+        Returns:
+            Dict[str, float]: 后端名称到耗时（秒）的映射，失败的后端不包含在内
+        """
+        timings = {}
+        for name in backends or get_available_backends():
+            try:
+                start = time.perf_counter()
+                with DECODER_BACKENDS[name](video_path) as decoder:
+                    for _ in range(self.BENCHMARK_FRAMES):
+                        if not decoder.read()[0]:
+                            break
+                    for fraction in self.BENCHMARK_SEEKS:
+                        decoder.seek(int(decoder.frame_count * fraction))
+                        decoder.read()
+                timings[name] = round(time.perf_counter() - start, 4)
+            except ValueError as e:
+                logger.warning(f"Benchmark decoder [{name}] failed: {e}")
+        return timings
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self._results, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Save decoder benchmark [{self.cache_file}] failed: {e}")
+
+
+class DecoderPool:
+    """
+    已打开解码器的 LRU 池
+
+    按 (后端, 路径, 修改时间, 大小) 复用已打开的解码器，避免对同一视频反复打开、
+    解析容器。解码器被借出期间只归借用者独占，归还后进入空闲列表；
+    空闲超过 idle_seconds 的解码器由后台定时器关闭（避免长期占用文件），
+    空闲数量超过 max_size 时关闭最久未使用的。
+    """
+
+    # 最多保留的空闲解码器数量
+    MAX_SIZE = 8
+    # 空闲解码器的最长保留时间（秒）
+    IDLE_SECONDS = 30.0
+
+    def __init__(self, max_size: int = MAX_SIZE, idle_seconds: float = IDLE_SECONDS):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        # 空闲解码器：[(键, 解码器, 归还时间)]，按归还时间升序
+        self._idle = []
+        # 借出的解码器到键的映射
+        self._in_use: Dict[int, tuple] = {}
+        self._timer = None
+
+    def _make_key(self, video_path: str, backend: str):
+        stat_result = os.stat(video_path)
+        return (
+            backend,
+            os.path.abspath(video_path),
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+        )
+
+    def acquire(
+        self, video_path: str, backend: str = "opencv", selector=None
+    ) -> VideoDecoder:
+        """
+        借出解码器，没有空闲的则新打开
+
+        Args:
+            video_path (str): 视频文件路径
+            backend (str): 后端名称，同 open_decoder
+            selector (DecoderSelector, optional): 自动选择使用的选择器
+
+        Returns:
+            VideoDecoder: 解码器，用完后需调用 release 归还
+
+        Raises:
+            ValueError: 如果无法打开视频文件
+        """
+        try:
+            key = self._make_key(video_path, backend)
+        except OSError as e:
+            raise ValueError(f"无法打开视频文件: {video_path}") from e
+
+        stale = []
+        decoder = None
+        with self._lock:
+            for i in range(len(self._idle) - 1, -1, -1):
+                idle_key, idle_decoder, _ = self._idle[i]
+                if idle_key == key:
+                    decoder = idle_decoder
+                    del self._idle[i]
+                    break
+                if idle_key[:2] == key[:2]:
+                    # 文件已被修改，旧的解码器不再可用
+                    stale.append(idle_decoder)
+                    del self._idle[i]
+        self._close(stale)
+
+        if decoder is None:
+            decoder = open_decoder(video_path, backend, selector)
+            logger.debug(f"Open decoder [{backend}] for [{video_path}]")
+
+        with self._lock:
+            self._in_use[id(decoder)] = key
+        return decoder
+
+    def release(self, decoder: VideoDecoder):
+        """归还解码器"""
+        with self._lock:
+            key = self._in_use.pop(id(decoder), None)
+            if key is None:
+                evicted = [decoder]
+            else:
+                self._idle.append((key, decoder, time.monotonic()))
+                evicted = [d for _, d, _ in self._idle[: -self.max_size or None]]
+                del self._idle[: len(evicted)]
+            self._schedule_eviction()
+        self._close(evicted)
+
+    def evict_idle(self):
+        """关闭空闲超时的解码器"""
+        deadline = time.monotonic() - self.idle_seconds
+        with self._lock:
+            self._timer = None
+            evicted = [d for _, d, used in self._idle if used <= deadline]
+            self._idle = [item for item in self._idle if item[2] > deadline]
+            self._schedule_eviction()
+        self._close(evicted)
+
+    def clear(self):
+        """关闭所有空闲的解码器"""
+        with self._lock:
+            evicted = [d for _, d, _ in self._idle]
+            self._idle = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._close(evicted)
+
+    def _schedule_eviction(self):
+        # 有空闲解码器且没有定时器时，在最早的一个超时后检查（需持有锁）
+        if self._timer is not None or not self._idle:
+            return
+        delay = self._idle[0][2] + self.idle_seconds - time.monotonic()
+        self._timer = threading.Timer(max(delay, 0.1), self.evict_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _close(self, decoders):
+        for decoder in decoders:
+            try:
+                decoder.release()
+            except Exception as e:
+                logger.warning(f"Release decoder [{decoder.video_path}] failed: {e}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._idle)
+
+
+# 全局解码器池
+default_pool = DecoderPool()
+
+# 全局解码后端选择器（按结果文件缓存）
+default_selector = DecoderSelector()
+_selectors: Dict[str, DecoderSelector] = {}
+_selectors_lock = threading.Lock()
+
+
+def get_decoder_selector(cache_file: str = None) -> DecoderSelector:
+    """
+    便捷函数：获取使用指定结果文件的选择器（同一文件共享一个实例）
+
+    Args:
+        cache_file (str, optional): 基准测试结果文件，为空时返回全局选择器
+
+    Returns:
+        DecoderSelector: 解码后端选择器
+    """
+    if not cache_file:
+        return default_selector
+    with _selectors_lock:
+        if cache_file not in _selectors:
+            _selectors[cache_file] = DecoderSelector(cache_file)
+        return _selectors[cache_file]
+
+
+def open_decoder(
+    video_path: str, backend: str = "opencv", selector: DecoderSelector = None
+) -> VideoDecoder:
+    """
+    打开视频解码器
+
+    Args:
+        video_path (str): 视频文件路径
+        backend (str): 后端名称，"auto" 表示按基准测试结果自动选择
+        selector (DecoderSelector, optional): 自动选择使用的选择器
+
+    Returns:
+        VideoDecoder: 解码器
+
+    Raises:
+        ValueError: 如果无法打开视频文件或后端不可用
+    """
+    if backend == "auto":
+        decoder = OpenCVDecoder(video_path)
+        selected = (selector or default_selector).select(video_path, decoder.codec)
+        if selected == OpenCVDecoder.name:
+            return decoder
+        decoder.release()
+        backend = selected
+
+    decoder_class = DECODER_BACKENDS.get(backend)
+    if decoder_class is None or not decoder_class.available():
+        raise ValueError(f"解码后端不可用: {backend}")
+    return decoder_class(video_path)
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        video_file = sys.argv[1]
+    else:
+        video_file = input("请输入视频文件路径: ")
+
+    print(f"可用后端: {get_available_backends()}")
+    for backend_name, seconds in DecoderSelector().benchmark(video_file).items():
+        print(f"  {backend_name}: {seconds:.3f}s")
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import mmap
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from core.model import FileInfo
+from utils.file_util import iter_tree_files
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateFileFinder:
+    """
+    完全相同文件查找工具类
+
+    分三级筛选，绝大多数文件只需零或少量读取即可排除：
+        1. 按文件大小分组（无需读取），大小唯一的文件直接排除
+        2. 对同大小的文件计算首尾两块的部分哈希（每个文件读取 2 x partial_size）
+        3. 仅对部分哈希仍相同的候选文件，以内存映射方式并行计算完整哈希
+    """
+
+    # 部分哈希读取的首尾块大小
+    PARTIAL_SIZE = 64 * 1024
+    # 完整哈希每次送入哈希函数的块大小
+    CHUNK_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, partial_size: int = PARTIAL_SIZE, max_workers: int = 4):
+        """
+        初始化查找器
+
+        Args:
+            partial_size (int): 部分哈希读取的首尾块大小（字节）
+            max_workers (int): 并行读取的线程数
+        """
+        self.partial_size = partial_size
+        self.max_workers = max_workers
+
+    def find_duplicates(self, files: Iterable[FileInfo]) -> List[List[FileInfo]]:
+        """
+        查找完全相同的文件
+
+        Args:
+            files (Iterable[FileInfo]): 文件信息列表
+
+        Returns:
+            List[List[FileInfo]]: 相同文件组，每组至少两个文件
+        """
+        # 1. 按大小分组，空文件不参与比较
+        size_groups = defaultdict(list)
+        for file_info in files:
+            if file_info.size > 0:
+                size_groups[file_info.size].append(file_info)
+        candidates = [group for group in size_groups.values() if len(group) > 1]
+        logger.info(f"Size candidates: {sum(len(g) for g in candidates)} files")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 2. 部分哈希
+            candidates = self._regroup(executor, candidates, self.partial_hash)
+            logger.info(f"Partial hash candidates: {sum(len(g) for g in candidates)}")
+
+            # 首尾块已覆盖整个文件时，部分哈希即完整哈希
+            confirmed = [g for g in candidates if g[0].size <= 2 * self.partial_size]
+            candidates = [g for g in candidates if g[0].size > 2 * self.partial_size]
+
+            # 3. 完整哈希
+            confirmed += self._regroup(executor, candidates, self.full_hash)
+
+        return confirmed
+
+    def _regroup(self, executor, groups, hash_func) -> List[List[FileInfo]]:
+        # 按哈希值细分每个分组，只保留仍有重复的分组
+        files = [file_info for group in groups for file_info in group]
+        digests = executor.map(self._safe_hash, [hash_func] * len(files), files)
+
+        hash_groups: Dict[tuple, List[FileInfo]] = defaultdict(list)
+        for file_info, digest in zip(files, digests):
+            if digest is not None:
+                hash_groups[(file_info.size, digest)].append(file_info)
+        return [group for group in hash_groups.values() if len(group) > 1]
+
+    def _safe_hash(self, hash_func, file_info: FileInfo):
+        try:
+            return hash_func(file_info)
+        except (OSError, ValueError) as e:
+            logger.warning(f"警告: 无法读取文件 {file_info.path}: {e}")
+            return None
+
+    def partial_hash(self, file_info: FileInfo) -> bytes:
+        """
+        计算文件首尾两块的哈希
+
+        Args:
+            file_info (FileInfo): 文件信息
+
+        Returns:
+            bytes: 哈希值
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_info.path, "rb") as f:
+            digest.update(f.read(self.partial_size))
+            if file_info.size > self.partial_size:
+                f.seek(max(self.partial_size, file_info.size - self.partial_size))
+                digest.update(f.read(self.partial_size))
+        return digest.digest()
+
+    def full_hash(self, file_info: FileInfo) -> bytes:
+        """
+        以内存映射方式计算文件完整哈希
+
+        Args:
+            file_info (FileInfo): 文件信息
+
+        Returns:
+            bytes: 哈希值
+        """
+        digest = hashlib.blake2b(digest_size=32)
+        with (
+            open(file_info.path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            view = memoryview(mapped)
+            try:
+                # 大块数据的哈希计算会释放 GIL，多个文件可并行
+                for offset in range(0, len(view), self.CHUNK_SIZE):
+                    digest.update(view[offset : offset + self.CHUNK_SIZE])
+            finally:
+                view.release()
+        return digest.digest()
+
+
+def find_duplicate_files(tree) -> List[List[FileInfo]]:
+    """
+    便捷函数：查找视频文件树中完全相同的文件
+
+    Args:
+        tree (FileInfoTree): 视频文件树（get_video_tree 的结果）
+
+    Returns:
+        List[List[FileInfo]]: 相同文件组
+    """
+    return DuplicateFileFinder().find_duplicates(iter_tree_files(tree))
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    import sys
+
+    from utils.file_util import get_video_tree
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        target_dir = sys.argv[1]
+    else:
+        target_dir = input("请输入要查找的目录路径: ")
+
+    for group in find_duplicate_files(get_video_tree(target_dir)):
+        print(f"\n相同文件 ({group[0].pretty_size}):")
+        for file_info in group:
+            print(f"  {file_info.path}")
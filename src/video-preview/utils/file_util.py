@@ -5,7 +5,9 @@ from pathlib import Path
 from typing import Callable, List, Optional
 
 from core.model import FileInfo, FileInfoTree
+from utils.fingerprint_util import FileFingerprint
 from utils.time_util import timestamp_to_str
+from utils.trace_util import traced
 
 logger = logging.getLogger(__name__)
 
@@ -561,14 +563,21 @@ VIDEO_EXTENSIONS = {
 class VideoFileTree:
     """遍历目录并生成视频文件的树形数据结构"""
 
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, fingerprint=False):
+        """
+        Args:
+            root_dir (str): 要遍历的根目录
+            fingerprint (bool): 是否在遍历时计算视频文件内容指纹
+        """
         self.root_dir = Path(root_dir).expanduser().resolve()
+        self.fingerprint = fingerprint
         self.tree = {}
 
     def is_video_file(self, path):
         """检查文件是否为视频文件"""
         return path.suffix.lower() in VIDEO_EXTENSIONS
 
+    @traced()
     def build_tree(self):
         """构建视频文件树形结构"""
         self.tree = self._traverse_directory(self.root_dir)
@@ -598,19 +607,21 @@ class VideoFileTree:
                         tree.children.append(subtree)
                 elif item_path.is_file() and self.is_video_file(item_path):
                     # 添加视频文件
+                    stat = item_path.stat()
                     tree.children.append(
                         FileInfo(
                             name=item,
                             path=str(item_path),
                             type="file",
                             extension=item_path.suffix.lower(),
-                            size=item_path.stat().st_size,
-                            pretty_size=SizeFormatter.format_size(
-                                item_path.stat().st_size
-                            ),
-                            modified_time=item_path.stat().st_mtime,
-                            pretty_modified_time=timestamp_to_str(
-                                item_path.stat().st_mtime
+                            size=stat.st_size,
+                            pretty_size=SizeFormatter.format_size(stat.st_size),
+                            modified_time=stat.st_mtime,
+                            pretty_modified_time=timestamp_to_str(stat.st_mtime),
+                            fingerprint=(
+                                FileFingerprint.get(str(item_path), stat)
+                                if self.fingerprint
+                                else None
                             ),
                         )
                     )
@@ -642,20 +653,38 @@ class VideoFileTree:
                 self.print_tree(child, new_prefix, i == len(node.children) - 1)
 
 
-def get_video_tree(root_dir):
+def get_video_tree(root_dir, fingerprint=False):
     """
     便捷函数：获取指定目录的视频文件树
 
     Args:
         root_dir (str): 要遍历的根目录路径
+        fingerprint (bool): 是否计算视频文件内容指纹
 
     Returns:
         dict: 视频文件的树形结构
     """
-    tree_builder = VideoFileTree(root_dir)
+    tree_builder = VideoFileTree(root_dir, fingerprint)
     return tree_builder.build_tree()
 
 
+def iter_tree_files(tree):
+    """
+    便捷函数：遍历文件树中的所有文件
+
+    Args:
+        tree (FileInfoTree): 文件树
+
+    Yields:
+        FileInfo: 文件信息
+    """
+    for child in tree.children:
+        if child.type == "directory":
+            yield from iter_tree_files(child)
+        else:
+            yield child
+
+
 def test_video_tree():
     # 使用示例
     import sys
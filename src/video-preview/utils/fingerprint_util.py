@@ -0,0 +1,99 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class FileFingerprint:
+    """
+    文件内容快速指纹工具类
+
+    指纹由文件大小和若干等距采样块的哈希组成，只需读取少量数据。
+    文件重命名或移动后指纹不变，可作为缩略图、元数据等缓存的键。
+    """
+
+    # 采样块数量（包含首块与尾块）
+    SAMPLE_COUNT = 4
+    # 采样块大小
+    SAMPLE_SIZE = 16 * 1024
+    # 内存缓存的最大条目数
+    CACHE_SIZE = 100000
+
+    _cache = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    @staticmethod
+    def compute(path: str, size: int = None) -> str:
+        """
+        计算文件指纹
+
+        Args:
+            path (str): 文件路径
+            size (int, optional): 文件大小，未提供时读取文件信息
+
+        Returns:
+            str: 指纹字符串，格式为 "<大小16进制>-<采样哈希>"
+        """
+        if size is None:
+            size = os.stat(path).st_size
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for offset in FileFingerprint._sample_offsets(size):
+                f.seek(offset)
+                digest.update(f.read(FileFingerprint.SAMPLE_SIZE))
+        return f"{size:x}-{digest.hexdigest()}"
+
+    @staticmethod
+    def _sample_offsets(size: int):
+        last = max(size - FileFingerprint.SAMPLE_SIZE, 0)
+        count = FileFingerprint.SAMPLE_COUNT
+        if last == 0:
+            return [0]
+        return sorted({last * i // (count - 1) for i in range(count)})
+
+    @staticmethod
+    def get(path: str, stat_result: os.stat_result = None) -> str:
+        """
+        获取文件指纹，按 (路径, 大小, 修改时间) 在内存中缓存
+
+        Args:
+            path (str): 文件路径
+            stat_result (os.stat_result, optional): 已获取的文件信息
+
+        Returns:
+            str: 指纹字符串
+        """
+        if stat_result is None:
+            stat_result = os.stat(path)
+        cache_key = (path, stat_result.st_size, stat_result.st_mtime_ns)
+
+        with FileFingerprint._cache_lock:
+            fingerprint = FileFingerprint._cache.get(cache_key)
+            if fingerprint is not None:
+                FileFingerprint._cache.move_to_end(cache_key)
+                return fingerprint
+
+        fingerprint = FileFingerprint.compute(path, stat_result.st_size)
+
+        with FileFingerprint._cache_lock:
+            FileFingerprint._cache[cache_key] = fingerprint
+            while len(FileFingerprint._cache) > FileFingerprint.CACHE_SIZE:
+                FileFingerprint._cache.popitem(last=False)
+        return fingerprint
+
+
+def get_file_fingerprint(path: str) -> str:
+    """
+    便捷函数：获取文件指纹
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        str: 指纹字符串
+    """
+    return FileFingerprint.get(os.path.abspath(path))
@@ -0,0 +1,250 @@
+import logging
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 感知哈希位数
+HASH_BITS = 64
+
+# 8位整数的置位数查找表
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def dhash(image: np.ndarray) -> int:
+    """
+    计算差异哈希 (dHash)
+
+    Args:
+        image (numpy.ndarray): BGR 或灰度图像
+
+    Returns:
+        int: 64位哈希值
+    """
+    small = cv2.resize(_to_gray(image), (9, 8), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(image: np.ndarray) -> int:
+    """
+    计算感知哈希 (pHash)：32x32 灰度图 DCT 低频 8x8 分量与中值比较
+
+    Args:
+        image (numpy.ndarray): BGR 或灰度图像
+
+    Returns:
+        int: 64位哈希值
+    """
+    small = cv2.resize(_to_gray(image), (32, 32), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(np.float32(small))[:8, :8]
+    return _bits_to_int(low > np.median(low))
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """
+    向量化计算 uint64 数组每个元素的置位数
+
+    Args:
+        values (numpy.ndarray): uint64 数组
+
+    Returns:
+        numpy.ndarray: 每个元素的置位数
+    """
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT_TABLE[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    return bin(hash_a ^ hash_b).count("1")
+
+
+class VideoHasher:
+    """
+    视频感知哈希计算器
+
+    逐帧累加缩小后的灰度图，以平均帧计算整段视频的 dHash / pHash，
+    同时保留每帧的 pHash。采样时间点按视频时长等比例分布时，
+    同一内容的重新编码或重新上传可以得到相近的哈希。
+    """
+
+    SIZE = 32
+
+    def __init__(self):
+        self._sum = np.zeros((self.SIZE, self.SIZE), dtype=np.float64)
+        self._count = 0
+        self.frame_hashes = []
+
+    def add_frame(self, frame: np.ndarray):
+        """加入一帧（BGR 或灰度）"""
+        small = cv2.resize(
+            _to_gray(frame), (self.SIZE, self.SIZE), interpolation=cv2.INTER_AREA
+        )
+        self._sum += small
+        self._count += 1
+        self.frame_hashes.append(phash(small))
+
+    @property
+    def frame_count(self) -> int:
+        return self._count
+
+    def hashes(self) -> Dict[str, object]:
+        """
+        计算视频哈希
+
+        Returns:
+            dict: {"dhash": int, "phash": int, "frame_phashes": List[int]}，
+                没有任何帧时返回空字典
+        """
+        if self._count == 0:
+            return {}
+
+        mean = np.uint8(np.clip(self._sum / self._count, 0, 255))
+        return {
+            "dhash": dhash(mean),
+            "phash": phash(mean),
+            "frame_phashes": list(self.frame_hashes),
+        }
+
+
+class HammingIndex:
+    """
+    64位哈希的汉明距离索引
+
+    查询时对全部哈希做向量化异或与置位计数；全量配对使用多索引哈希：
+    将哈希分成 max_distance+1 段，距离不超过 max_distance 的两个哈希
+    至少有一段完全相同（抽屉原理），只需比较同段相等的候选对。
+    """
+
+    def __init__(self, keys: Sequence[Hashable], hashes: Sequence[int]):
+        """
+        初始化索引
+
+        Args:
+            keys (Sequence[Hashable]): 键列表
+            hashes (Sequence[int]): 与键一一对应的64位哈希
+        """
+        if len(keys) != len(hashes):
+            raise ValueError("键与哈希数量不一致")
+        self.keys = list(keys)
+        self.hashes = np.array([int(h) for h in hashes], dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def query(self, hash_value: int, max_distance: int) -> List[Tuple[Hashable, int]]:
+        """
+        查询与给定哈希距离不超过 max_distance 的所有键
+
+        Args:
+            hash_value (int): 64位哈希
+            max_distance (int): 最大汉明距离
+
+        Returns:
+            List[Tuple[Hashable, int]]: (键, 距离) 列表，按距离排序
+        """
+        distances = popcount(self.hashes ^ np.uint64(hash_value))
+        matched = np.nonzero(distances <= max_distance)[0]
+        matched = matched[np.argsort(distances[matched], kind="stable")]
+        return [(self.keys[i], int(distances[i])) for i in matched]
+
+    def find_pairs(self, max_distance: int) -> List[Tuple[Hashable, Hashable, int]]:
+        """
+        查找所有距离不超过 max_distance 的哈希对
+
+        Args:
+            max_distance (int): 最大汉明距离
+
+        Returns:
+            List[Tuple[Hashable, Hashable, int]]: (键A, 键B, 距离) 列表
+        """
+        n = len(self.hashes)
+        if n < 2:
+            return []
+
+        segments = min(max_distance + 1, HASH_BITS)
+        bounds = np.linspace(0, HASH_BITS, segments + 1).astype(int)
+
+        found_pairs = []
+        found_distances = []
+        for low, high in zip(bounds[:-1], bounds[1:]):
+            mask = np.uint64((1 << int(high - low)) - 1)
+            segment = (self.hashes >> np.uint64(low)) & mask
+
+            # 按段值排序后，同段值的元素相邻；第 k 轮比较相距 k 的元素
+            order = np.argsort(segment, kind="stable")
+            sorted_segment = segment[order]
+            active = np.arange(n)
+            step = 1
+            while True:
+                active = active[active + step < n]
+                active = active[sorted_segment[active + step] == sorted_segment[active]]
+                if active.size == 0:
+                    break
+
+                a = order[active]
+                b = order[active + step]
+                distances = popcount(self.hashes[a] ^ self.hashes[b])
+                matched = distances <= max_distance
+                if matched.any():
+                    a, b = a[matched], b[matched]
+                    found_pairs.append(np.minimum(a, b) * n + np.maximum(a, b))
+                    found_distances.append(distances[matched])
+                step += 1
+
+        if not found_pairs:
+            return []
+
+        # 同一对可能在多个段中被找到，去重
+        pairs, first = np.unique(np.concatenate(found_pairs), return_index=True)
+        distances = np.concatenate(found_distances)[first]
+        return [
+            (self.keys[int(pair // n)], self.keys[int(pair % n)], int(distance))
+            for pair, distance in zip(pairs, distances)
+        ]
+
+
+def group_pairs(pairs: List[Tuple[Hashable, Hashable, int]]) -> List[List[Hashable]]:
+    """
+    将相似对合并为相似组（并查集）
+
+    Args:
+        pairs (List[Tuple[Hashable, Hashable, int]]): (键A, 键B, 距离) 列表
+
+    Returns:
+        List[List[Hashable]]: 相似组列表，每组至少两个键
+    """
+    parent = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key_a, key_b, _ in pairs:
+        root_a, root_b = find(key_a), find(key_b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    groups = {}
+    for key in parent:
+        groups.setdefault(find(key), []).append(key)
+    return [group for group in groups.values() if len(group) > 1]
@@ -0,0 +1,315 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """任务已被取消"""
+
+    pass
+
+
+class Job:
+    """
+    后台任务句柄
+
+    每个任务拥有独立的进度与结果，可同时运行多个任务而互不干扰。
+
+    事件（通过 bind 订阅，回调在任务所在线程中执行）:
+        on_item(job, item): 每完成一项时触发
+        on_progress(job, progress): 进度变化时触发，progress 取值 0~1
+        on_complete(job): 任务结束（成功、失败或取消）时触发
+
+    取消是协作式的：cancel 只设置标记，任务函数需在合适的位置调用
+    raise_if_cancelled 结束执行，此时任务以 JobCancelled 异常结束。
+    暂停同样是协作式的：pause 后任务在下一次调用 raise_if_cancelled 时阻塞，
+    直到 resume 或 cancel。
+    """
+
+    EVENTS = ("on_item", "on_progress", "on_complete")
+
+    def __init__(self, name: str = "", total: int = 0):
+        """
+        初始化任务句柄
+
+        Args:
+            name (str): 任务名称，用于日志
+            total (int): 任务总项数，可稍后通过 set_total 设置
+        """
+        self.name = name
+        self.future = Future()
+        self._lock = threading.Lock()
+        self._total = total
+        self._completed = 0
+        self._items = []
+        # 进度映射到的区间，分阶段的任务每个阶段占整体进度的一段
+        self._progress_range = (0.0, 1.0)
+        # on_complete 是否已分发，之后订阅的回调由 bind 立即调用
+        self._complete_dispatched = False
+        self._cancel_event = threading.Event()
+        # 未暂停时为已设置状态
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._listeners: Dict[str, List[Callable]] = {
+            event: [] for event in self.EVENTS
+        }
+
+    def bind(self, **callbacks):
+        """
+        订阅任务事件，如 job.bind(on_item=fn, on_complete=fn)
+
+        如果任务已结束，on_complete 会立即被调用；与任务结束同时订阅时也只调用一次。
+        """
+        call_complete = []
+        with self._lock:
+            for event, callback in callbacks.items():
+                if event not in self._listeners:
+                    raise ValueError(f"未知的任务事件: {event}")
+                if callback is None:
+                    continue
+                self._listeners[event].append(callback)
+                if event == "on_complete" and self._complete_dispatched:
+                    call_complete.append(callback)
+
+        for callback in call_complete:
+            self._call(callback, self)
+        return self
+
+    def unbind(self, **callbacks):
+        """取消订阅任务事件"""
+        with self._lock:
+            for event, callback in callbacks.items():
+                if callback in self._listeners.get(event, []):
+                    self._listeners[event].remove(callback)
+        return self
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def completed(self) -> int:
+        return self._completed
+
+    @property
+    def progress(self) -> float:
+        """当前进度（0~1）"""
+        with self._lock:
+            if self._total <= 0:
+                return 1.0 if self.future.done() else self._progress_range[0]
+            return self._map_progress(self._completed / self._total)
+
+    @property
+    def items(self) -> List[Any]:
+        """已完成项的快照"""
+        with self._lock:
+            return list(self._items)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume_event.is_set()
+
+    def cancel(self):
+        """请求取消任务，对已结束的任务无效果"""
+        if not self.future.done():
+            logger.debug(f"Cancel job [{self.name}]")
+            self._cancel_event.set()
+            # 唤醒暂停中的任务，使其以取消结束
+            self._resume_event.set()
+
+    def pause(self):
+        """请求暂停任务，任务在下一次检查取消标记时阻塞"""
+        if not self.future.done() and not self._cancel_event.is_set():
+            logger.debug(f"Pause job [{self.name}]")
+            self._resume_event.clear()
+
+    def resume(self):
+        """恢复暂停的任务"""
+        if self.paused:
+            logger.debug(f"Resume job [{self.name}]")
+            self._resume_event.set()
+
+    def raise_if_cancelled(self):
+        """
+        检查取消标记，任务被暂停时阻塞直到恢复或取消
+
+        Raises:
+            JobCancelled: 如果任务已被请求取消
+        """
+        self._resume_event.wait()
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"任务已取消: {self.name}")
+
+    def set_total(self, total: int):
+        with self._lock:
+            self._total = total
+
+    def set_progress_range(self, start: float, end: float = 1.0):
+        """
+        设置当前阶段在整体进度中所占的区间，之后报告的进度（按项计数或
+        report_progress）都映射到 [start, end]，分阶段的任务进度不会倒退
+
+        Args:
+            start (float): 区间起点（0~1）
+            end (float): 区间终点（0~1）
+        """
+        with self._lock:
+            self._progress_range = (start, end)
+
+    def advance(self, item: Any = None):
+        """
+        完成一项，触发 on_item 与 on_progress 事件
+
+        Args:
+            item: 本次完成的项
+        """
+        with self._lock:
+            self._completed += 1
+            self._items.append(item)
+            progress = self._map_progress(
+                self._completed / self._total if self._total > 0 else 0.0
+            )
+            item_listeners = list(self._listeners["on_item"])
+            progress_listeners = list(self._listeners["on_progress"])
+
+        for callback in item_listeners:
+            self._call(callback, self, item)
+        for callback in progress_listeners:
+            self._call(callback, self, progress)
+
+    def report_progress(self, progress: float):
+        """
+        报告不按项计数的阶段进度（如生成前的扫描），只触发 on_progress 事件
+
+        Args:
+            progress (float): 当前阶段的进度（0~1）
+        """
+        with self._lock:
+            progress = self._map_progress(progress)
+            progress_listeners = list(self._listeners["on_progress"])
+        for callback in progress_listeners:
+            self._call(callback, self, progress)
+
+    def set_result(self, result: Any):
+        self.future.set_result(result)
+        self._dispatch_complete()
+
+    def set_exception(self, exception: BaseException):
+        self.future.set_exception(exception)
+        self._dispatch_complete()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """阻塞等待任务结果"""
+        return self.future.result(timeout)
+
+    def exception(self, timeout: Optional[float] = None):
+        return self.future.exception(timeout)
+
+    def add_done_callback(self, callback: Callable[["Job"], None]):
+        """添加完成回调，等价于 bind(on_complete=callback)"""
+        return self.bind(on_complete=callback)
+
+    def _map_progress(self, progress: float) -> float:
+        start, end = self._progress_range
+        return start + (end - start) * progress
+
+    def _dispatch_complete(self):
+        # 与 bind 在同一把锁下判断，每个回调恰好调用一次
+        with self._lock:
+            self._complete_dispatched = True
+            listeners = list(self._listeners["on_complete"])
+        for callback in listeners:
+            self._call(callback, self)
+
+    def _call(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.exception(f"Job [{self.name}] callback {callback} failed: {e}")
+
+    def __repr__(self):
+        return (
+            f"Job(name={self.name!r}, completed={self._completed}, "
+            f"total={self._total}, done={self.done()})"
+        )
+
+
+class JobExecutor:
+    """后台任务执行器，任务函数以 fn(job, *args, **kwargs) 的形式运行"""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        thread_name_prefix: str = "job",
+        initializer: Optional[Callable] = None,
+    ):
+        """
+        Args:
+            max_workers (int): 最大线程数
+            thread_name_prefix (str): 线程名前缀
+            initializer (Callable, optional): 每个线程启动时调用，如降低线程优先级
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix,
+            initializer=initializer,
+        )
+
+    def submit(self, job: Job, fn: Callable, *args, **kwargs) -> Job:
+        """
+        提交任务
+
+        Args:
+            job (Job): 任务句柄，提交前应完成事件订阅
+            fn (Callable): 任务函数，返回值作为任务结果
+
+        Returns:
+            Job: 传入的任务句柄
+        """
+
+        def run():
+            try:
+                job.raise_if_cancelled()
+                result = fn(job, *args, **kwargs)
+            except JobCancelled as e:
+                logger.debug(f"Job [{job.name}] cancelled")
+                job.set_exception(e)
+            except BaseException as e:
+                logger.warning(f"Job [{job.name}] failed: {e}")
+                job.set_exception(e)
+            else:
+                job.set_result(result)
+
+        self._executor.submit(run)
+        return job
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+# 全局默认执行器
+default_executor = JobExecutor(thread_name_prefix="video-preview-job")
+
+
+def submit_job(job: Job, fn: Callable, *args, **kwargs) -> Job:
+    """
+    便捷函数：使用默认执行器提交任务
+
+    Args:
+        job (Job): 任务句柄
+        fn (Callable): 任务函数，签名为 fn(job, *args, **kwargs)
+
+    Returns:
+        Job: 传入的任务句柄
+    """
+    return default_executor.submit(job, fn, *args, **kwargs)
@@ -0,0 +1,546 @@
+import bisect
+import io
+import logging
+import struct
+from typing import BinaryIO, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class KeyframeIndex:
+    """
+    视频关键帧索引
+
+    记录关键帧的时间点（秒）和在文件中的字节偏移（未知时为 None），
+    用于规划 seek：定位到任意时间点都需要从其之前最近的关键帧开始解码。
+    """
+
+    def __init__(
+        self,
+        times: List[float],
+        offsets: Optional[List[Optional[int]]] = None,
+        source: str = "scan",
+        all_keyframes: bool = False,
+    ):
+        """
+        初始化关键帧索引
+
+        Args:
+            times (List[float]): 升序的关键帧时间点（秒）
+            offsets (List[Optional[int]], optional): 与时间点对应的字节偏移
+            source (str): 索引来源，"mp4"、"mkv" 或 "scan"
+            all_keyframes (bool): 是否每一帧都是关键帧（此时不记录时间点）
+        """
+        self.times = [float(t) for t in times]
+        self.offsets = list(offsets) if offsets is not None else [None] * len(times)
+        self.source = source
+        self.all_keyframes = all_keyframes
+
+    def __len__(self):
+        return len(self.times)
+
+    def keyframe_before(self, time_point: float) -> int:
+        """
+        查找不晚于指定时间点的最近关键帧
+
+        Args:
+            time_point (float): 时间点（秒）
+
+        Returns:
+            int: 关键帧序号，没有时返回 -1
+        """
+        return bisect.bisect_right(self.times, time_point) - 1
+
+    def frame_before(self, frame_pos: int, fps: float) -> Optional[int]:
+        """
+        查找不晚于指定帧的最近关键帧的帧位置
+
+        Args:
+            frame_pos (int): 帧位置
+            fps (float): 视频帧率
+
+        Returns:
+            int: 关键帧的帧位置，索引中没有不晚于该帧的关键帧（如扫描结果为空）
+                时返回 None，由调用方按没有关键帧信息处理
+        """
+        if self.all_keyframes or fps <= 0:
+            return frame_pos
+        # 加半帧容差，避免浮点误差导致错过恰好位于目标帧的关键帧
+        index = self.keyframe_before((frame_pos + 0.5) / fps)
+        return int(round(self.times[index] * fps)) if index >= 0 else None
+
+    def to_dict(self) -> Dict[str, object]:
+        # 转换为可序列化为 JSON 的字典，用于存入元数据索引
+        return {
+            "times": self.times,
+            "offsets": self.offsets,
+            "source": self.source,
+            "all_keyframes": self.all_keyframes,
+        }
+
+    @staticmethod
+    def from_dict(value: Dict[str, object]) -> "KeyframeIndex":
+        return KeyframeIndex(
+            value["times"],
+            value.get("offsets"),
+            value.get("source", "scan"),
+            value.get("all_keyframes", False),
+        )
+
+
+class Mp4KeyframeParser:
+    """
+    从 MP4/MOV 容器的采样表读取关键帧
+
+    取第一个视频轨道的 stss（同步采样）、stts（采样时长）、
+    stsc/stco/co64/stsz（采样到块的映射、块偏移、采样大小），
+    只读取 moov 盒子，不读取媒体数据。分片 MP4 不包含完整采样表，返回 None。
+    """
+
+    # 只解析这些容器盒子的子盒子
+    CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+    def parse(self, f: BinaryIO) -> Optional[KeyframeIndex]:
+        moov = self._read_top_level_box(f, b"moov")
+        if moov is None:
+            return None
+
+        for trak in self._find_boxes(moov, b"trak"):
+            boxes = self._collect_boxes(trak)
+            hdlr = boxes.get(b"hdlr")
+            if hdlr is None or hdlr[8:12] != b"vide":
+                continue
+            if b"stts" not in boxes or b"mdhd" not in boxes:
+                return None
+            return self._parse_sample_table(boxes)
+
+        return None
+
+    def _read_top_level_box(self, f: BinaryIO, box_type: bytes) -> Optional[bytes]:
+        # 逐个跳过顶层盒子（如 mdat），找到目标盒子后读取其内容
+        f.seek(0)
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            size, current_type = struct.unpack(">I4s", header)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack(">Q", f.read(8))[0]
+                header_size = 16
+            elif size == 0:
+                # 延伸到文件末尾
+                return f.read() if current_type == box_type else None
+            if size < header_size:
+                raise ValueError(f"MP4 盒子大小无效: {current_type}")
+
+            if current_type == box_type:
+                return f.read(size - header_size)
+            f.seek(size - header_size, 1)
+
+    def _iter_boxes(self, data: bytes):
+        position = 0
+        while position + 8 <= len(data):
+            size, box_type = struct.unpack_from(">I4s", data, position)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack_from(">Q", data, position + 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = len(data) - position
+            if size < header_size:
+                raise ValueError(f"MP4 盒子大小无效: {box_type}")
+            yield box_type, data[position + header_size : position + size]
+            position += size
+
+    def _find_boxes(self, data: bytes, box_type: bytes):
+        return [payload for t, payload in self._iter_boxes(data) if t == box_type]
+
+    def _collect_boxes(self, data: bytes) -> Dict[bytes, bytes]:
+        # 递归收集轨道内的盒子（同类型只保留第一个）
+        boxes = {}
+        for box_type, payload in self._iter_boxes(data):
+            if box_type in self.CONTAINER_BOXES:
+                for child_type, child in self._collect_boxes(payload).items():
+                    boxes.setdefault(child_type, child)
+            else:
+                boxes.setdefault(box_type, payload)
+        return boxes
+
+    def _parse_sample_table(self, boxes: Dict[bytes, bytes]) -> Optional[KeyframeIndex]:
+        mdhd = boxes[b"mdhd"]
+        if mdhd[0] == 1:
+            timescale = struct.unpack_from(">I", mdhd, 20)[0]
+        else:
+            timescale = struct.unpack_from(">I", mdhd, 12)[0]
+        if timescale <= 0:
+            raise ValueError("MP4 时间刻度无效")
+
+        # 采样解码时间
+        stts = self._read_entries(boxes[b"stts"], 2)
+        durations = np.repeat(stts[:, 1], stts[:, 0])
+        if durations.size == 0:
+            return None
+        sample_times = np.concatenate(([0], np.cumsum(durations)[:-1])) / timescale
+        sample_count = len(sample_times)
+
+        # 没有 stss 时每一帧都是关键帧
+        if b"stss" not in boxes:
+            return KeyframeIndex([], source="mp4", all_keyframes=True)
+        sync_samples = self._read_entries(boxes[b"stss"], 1)[:, 0] - 1
+        sync_samples = sync_samples[(sync_samples >= 0) & (sync_samples < sample_count)]
+
+        offsets = self._sample_offsets(boxes, sample_count)
+        return KeyframeIndex(
+            sample_times[sync_samples].tolist(),
+            offsets[sync_samples].tolist() if offsets is not None else None,
+            source="mp4",
+        )
+
+    def _sample_offsets(self, boxes: Dict[bytes, bytes], sample_count: int):
+        # 由块偏移、采样到块的映射和采样大小计算每个采样的字节偏移
+        if b"stsc" not in boxes or b"stsz" not in boxes:
+            return None
+        if b"stco" in boxes:
+            chunk_offsets = self._read_entries(boxes[b"stco"], 1)[:, 0]
+        elif b"co64" in boxes:
+            chunk_offsets = self._read_entries(boxes[b"co64"], 1, ">u8")[:, 0]
+        else:
+            return None
+
+        stsz = boxes[b"stsz"]
+        sample_size, size_count = struct.unpack_from(">II", stsz, 4)
+        if sample_size:
+            sizes = np.full(sample_count, sample_size, dtype=np.int64)
+        else:
+            sizes = np.frombuffer(stsz, ">u4", size_count, 12).astype(np.int64)
+
+        stsc = self._read_entries(boxes[b"stsc"], 3)
+        chunk_count = len(chunk_offsets)
+        first_chunks = np.append(stsc[:, 0], chunk_count + 1)
+        samples_per_chunk = np.repeat(stsc[:, 1], np.diff(first_chunks))[:chunk_count]
+
+        sample_chunks = np.repeat(np.arange(len(samples_per_chunk)), samples_per_chunk)
+        count = min(len(sample_chunks), len(sizes), sample_count)
+        if count < sample_count:
+            return None
+
+        # 块内偏移 = 采样前所有采样大小之和 - 块首采样前所有采样大小之和
+        size_sums = np.concatenate(([0], np.cumsum(sizes[:count])))
+        chunk_first_samples = np.concatenate(([0], np.cumsum(samples_per_chunk)))
+        within_chunk = size_sums[:count] - size_sums[chunk_first_samples[sample_chunks]]
+        return chunk_offsets.astype(np.int64)[sample_chunks] + within_chunk
+
+    def _read_entries(self, payload: bytes, columns: int, dtype: str = ">u4"):
+        # 读取 "版本/标志 + 条目数 + 条目" 格式的表
+        count = struct.unpack_from(">I", payload, 4)[0]
+        width = np.dtype(dtype).itemsize * columns
+        count = min(count, (len(payload) - 8) // width)
+        values = np.frombuffer(payload, dtype, count * columns, 8)
+        return values.astype(np.int64).reshape(count, columns)
+
+
+class MkvKeyframeParser:
+    """
+    从 Matroska/WebM 容器的 Cues 读取关键帧
+
+    依次读取 Segment 的一级元素，通过 SeekHead 定位位于文件末尾的 Cues，
+    不读取 Cluster 中的媒体数据。没有 Cues 时返回 None。
+    """
+
+    SEGMENT = 0x18538067
+    SEEK_HEAD = 0x114D9B74
+    SEEK = 0x4DBB
+    SEEK_ID = 0x53AB
+    SEEK_POSITION = 0x53AC
+    INFO = 0x1549A966
+    TIMECODE_SCALE = 0x2AD7B1
+    TRACKS = 0x1654AE6B
+    TRACK_ENTRY = 0xAE
+    TRACK_NUMBER = 0xD7
+    TRACK_TYPE = 0x83
+    CUES = 0x1C53BB6B
+    CUE_POINT = 0xBB
+    CUE_TIME = 0xB3
+    CUE_TRACK_POSITIONS = 0xB7
+    CUE_TRACK = 0xF7
+    CUE_CLUSTER_POSITION = 0xF1
+    CLUSTER = 0x1F43B675
+
+    def parse(self, f: BinaryIO) -> Optional[KeyframeIndex]:
+        f.seek(0)
+        # 跳过 EBML 头
+        _, size = self._read_element_header(f)
+        f.seek(size, 1)
+
+        element_id, segment_size = self._read_element_header(f)
+        if element_id != self.SEGMENT:
+            raise ValueError("找不到 Matroska Segment")
+        segment_start = f.tell()
+
+        elements = {}
+        seek_positions = {}
+        position = segment_start
+        while True:
+            f.seek(position)
+            try:
+                element_id, size = self._read_element_header(f)
+            except EOFError:
+                break
+            if element_id == self.CLUSTER or size is None:
+                # 媒体数据开始，其余元素通过 SeekHead 定位
+                break
+
+            data_start = f.tell()
+            if element_id == self.SEEK_HEAD:
+                seek_positions.update(self._parse_seek_head(f.read(size)))
+            elif element_id in (self.INFO, self.TRACKS, self.CUES):
+                elements.setdefault(element_id, f.read(size))
+            position = data_start + size
+
+        for element_id, offset in seek_positions.items():
+            if element_id in (self.INFO, self.TRACKS, self.CUES):
+                if element_id not in elements:
+                    f.seek(segment_start + offset)
+                    found_id, size = self._read_element_header(f)
+                    if found_id == element_id and size is not None:
+                        elements[element_id] = f.read(size)
+
+        if self.CUES not in elements:
+            return None
+
+        timecode_scale = 1000000
+        if self.INFO in elements:
+            for child_id, data in self._iter_elements(elements[self.INFO]):
+                if child_id == self.TIMECODE_SCALE:
+                    timecode_scale = self._read_uint(data)
+
+        video_track = self._find_video_track(elements.get(self.TRACKS, b""))
+        times = []
+        offsets = []
+        for cue_id, cue in self._iter_elements(elements[self.CUES]):
+            if cue_id != self.CUE_POINT:
+                continue
+            cue_time = None
+            for child_id, data in self._iter_elements(cue):
+                if child_id == self.CUE_TIME:
+                    cue_time = self._read_uint(data)
+                elif child_id == self.CUE_TRACK_POSITIONS and cue_time is not None:
+                    track, cluster_position = self._parse_track_positions(data)
+                    if video_track is None or track == video_track:
+                        times.append(cue_time * timecode_scale / 1e9)
+                        offsets.append(
+                            segment_start + cluster_position
+                            if cluster_position is not None
+                            else None
+                        )
+                        break
+
+        if not times:
+            return None
+        order = np.argsort(times, kind="stable")
+        return KeyframeIndex(
+            [times[i] for i in order], [offsets[i] for i in order], source="mkv"
+        )
+
+    def _parse_seek_head(self, data: bytes) -> Dict[int, int]:
+        positions = {}
+        for seek_id, seek in self._iter_elements(data):
+            if seek_id != self.SEEK:
+                continue
+            target = position = None
+            for child_id, child in self._iter_elements(seek):
+                if child_id == self.SEEK_ID:
+                    target = self._read_uint(child)
+                elif child_id == self.SEEK_POSITION:
+                    position = self._read_uint(child)
+            if target is not None and position is not None:
+                positions[target] = position
+        return positions
+
+    def _find_video_track(self, data: bytes) -> Optional[int]:
+        for entry_id, entry in self._iter_elements(data):
+            if entry_id != self.TRACK_ENTRY:
+                continue
+            number = track_type = None
+            for child_id, child in self._iter_elements(entry):
+                if child_id == self.TRACK_NUMBER:
+                    number = self._read_uint(child)
+                elif child_id == self.TRACK_TYPE:
+                    track_type = self._read_uint(child)
+            if track_type == 1:
+                return number
+        return None
+
+    def _parse_track_positions(self, data: bytes):
+        track = cluster_position = None
+        for child_id, child in self._iter_elements(data):
+            if child_id == self.CUE_TRACK:
+                track = self._read_uint(child)
+            elif child_id == self.CUE_CLUSTER_POSITION:
+                cluster_position = self._read_uint(child)
+        return track, cluster_position
+
+    def _read_element_header(self, f: BinaryIO):
+        element_id = self._read_vint(f, keep_marker=True)
+        size = self._read_vint(f, keep_marker=False)
+        return element_id, size
+
+    def _read_vint(self, f: BinaryIO, keep_marker: bool):
+        # 读取 EBML 变长整数；大小全为 1 表示未知长度，返回 None
+        first = f.read(1)
+        if not first:
+            raise EOFError
+        first = first[0]
+        length = 1
+        while length <= 8 and not first & (0x80 >> (length - 1)):
+            length += 1
+        if length > 8:
+            raise ValueError("EBML 变长整数无效")
+
+        rest = f.read(length - 1)
+        if len(rest) < length - 1:
+            raise EOFError
+        value = first if keep_marker else first & (0xFF >> length)
+        for byte in rest:
+            value = (value << 8) | byte
+        if not keep_marker and value == (1 << (7 * length)) - 1:
+            return None
+        return value
+
+    def _iter_elements(self, data: bytes):
+        stream = io.BytesIO(data)
+        while stream.tell() < len(data):
+            try:
+                element_id, size = self._read_element_header(stream)
+            except EOFError:
+                return
+            if size is None:
+                return
+            yield element_id, stream.read(size)
+
+    def _read_uint(self, data: bytes) -> int:
+        return int.from_bytes(data, "big")
+
+
+def scan_keyframes(video_path: str, job=None) -> KeyframeIndex:
+    """
+    一次性扫描视频的关键帧
+
+    以原始数据流方式打开视频（不解码），逐个读取数据包并检查关键帧标志，
+    速度远快于解码。
+
+    Args:
+        video_path (str): 视频文件路径
+        job (Job, optional): 任务句柄，用于取消
+
+    Returns:
+        KeyframeIndex: 关键帧索引（不含字节偏移）
+
+    Raises:
+        ValueError: 如果无法打开视频文件
+    """
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    if not cap.isOpened():
+        raise ValueError(f"无法打开视频文件: {video_path}")
+
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        times = []
+        index = 0
+        while cap.grab():
+            if job is not None and index % 1000 == 0:
+                job.raise_if_cancelled()
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                times.append(index / fps)
+            index += 1
+    finally:
+        cap.release()
+
+    return KeyframeIndex(times, source="scan")
+
+
+def read_container_index(video_path: str) -> Optional[KeyframeIndex]:
+    """
+    读取容器自带的关键帧索引（MP4 采样表、MKV Cues）
+
+    只读取文件头部和索引所在的位置，不读取媒体数据。
+
+    Args:
+        video_path (str): 视频文件路径
+
+    Returns:
+        KeyframeIndex: 关键帧索引，不支持的容器或没有可用索引时返回 None
+
+    Raises:
+        OSError: 如果无法读取视频文件
+    """
+    try:
+        with open(video_path, "rb") as f:
+            magic = f.read(12)
+            if magic[:4] == b"\x1a\x45\xdf\xa3":
+                parser = MkvKeyframeParser()
+            elif magic[4:8] in (b"ftyp", b"moov", b"free", b"mdat", b"wide"):
+                parser = Mp4KeyframeParser()
+            else:
+                return None
+
+            index = parser.parse(f)
+    except (ValueError, EOFError, struct.error) as e:
+        logger.warning(f"Parse container index of [{video_path}] failed: {e}")
+        return None
+
+    if index is not None:
+        logger.info(
+            f"Read {len(index)} keyframes of [{video_path}] from {index.source} index"
+        )
+    return index
+
+
+def build_keyframe_index(video_path: str, job=None) -> KeyframeIndex:
+    """
+    构建视频的关键帧索引
+
+    优先读取容器的索引表（MP4 采样表、MKV Cues），无法读取时扫描数据流。
+    扫描需要读取整个文件，不应在等待结果的前台任务中调用。
+
+    Args:
+        video_path (str): 视频文件路径
+        job (Job, optional): 任务句柄，用于取消
+
+    Returns:
+        KeyframeIndex: 关键帧索引
+    """
+    index = read_container_index(video_path)
+    if index is not None:
+        return index
+
+    index = scan_keyframes(video_path, job)
+    logger.info(f"Scanned {len(index)} keyframes of [{video_path}]")
+    return index
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    import sys
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        video_file = sys.argv[1]
+    else:
+        video_file = input("请输入视频文件路径: ")
+
+    start = time.perf_counter()
+    keyframes = build_keyframe_index(video_file)
+    print(f"来源: {keyframes.source}, 耗时: {time.perf_counter() - start:.3f}s")
+    if keyframes.all_keyframes:
+        print("每一帧都是关键帧")
+    else:
+        print(f"关键帧数量: {len(keyframes)}")
+        for t, offset in list(zip(keyframes.times, keyframes.offsets))[:10]:
+            print(f"  {t:.3f}s  偏移: {offset}")
@@ -0,0 +1,90 @@
+import ctypes
+import logging
+import os
+import platform
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Linux ioprio_set 系统调用号（按 CPU 架构）
+IOPRIO_SET_SYSCALLS = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "arm64": 30,
+    "armv7l": 315,
+}
+# ioprio：作用于单个线程，空闲 I/O 调度类
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+
+# Windows 线程后台模式：同时降低 CPU、I/O 与内存优先级
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+
+def lower_current_thread_priority(niceness: int = 19) -> bool:
+    """
+    把当前线程降为后台优先级
+
+    - Linux：nice 值设为 niceness，I/O 调度类设为空闲（ioprio）
+    - Windows：进入线程后台模式
+    - 其它平台：不做处理（降低进程优先级会拖慢界面线程）
+
+    只影响调用线程，应在专用的后台线程中调用。
+
+    Args:
+        niceness (int): Linux 下的 nice 值（0~19，越大优先级越低）
+
+    Returns:
+        bool: 是否成功降低了优先级
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            return _lower_linux_thread_priority(niceness)
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            return bool(
+                kernel32.SetThreadPriority(
+                    kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN
+                )
+            )
+    except (OSError, AttributeError) as e:
+        logger.warning(f"Lower thread priority failed: {e}")
+        return False
+
+    logger.debug(f"Thread priority is not supported on {sys.platform}")
+    return False
+
+
+def _lower_linux_thread_priority(niceness):
+    # Linux 的 nice 值按线程生效，以线程 ID 设置
+    thread_id = threading.get_native_id()
+    os.setpriority(os.PRIO_PROCESS, thread_id, niceness)
+
+    syscall = IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if syscall is None:
+        return True
+    libc = ctypes.CDLL(None, use_errno=True)
+    ioprio = IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT
+    if libc.syscall(syscall, IOPRIO_WHO_PROCESS, thread_id, ioprio) != 0:
+        logger.debug(f"Set ioprio failed: errno={ctypes.get_errno()}")
+    return True
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    def worker():
+        print(f"降低优先级: {lower_current_thread_priority()}")
+        if hasattr(os, "getpriority"):
+            print(f"nice: {os.getpriority(os.PRIO_PROCESS, threading.get_native_id())}")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    if hasattr(os, "getpriority"):
+        print(f"主线程 nice: {os.getpriority(os.PRIO_PROCESS, 0)}")
@@ -0,0 +1,258 @@
+import logging
+from typing import List, Tuple
+
+import numpy as np
+from utils.video_meta_util import VideoInfoExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class SceneDetector:
+    """
+    镜头切换检测工具类
+
+    顺序扫描一遍视频：按采样率只解码部分帧（其余帧仅 grab 不解码，
+    见 VideoInfoExtractor.iter_frames_at_interval），缩小为极小的灰度图后，向量化计算相邻采样帧的差异分数，
+    取分数最高的若干镜头边界作为缩略图时间点。
+    """
+
+    # 每秒采样帧数
+    SAMPLE_FPS = 4.0
+    # 缩小后的灰度图尺寸 (宽, 高)
+    FRAME_SIZE = (32, 18)
+    # 直方图分箱数
+    HISTOGRAM_BINS = 16
+    # 缩略图取镜头边界之后的偏移（秒），避开转场帧
+    SHOT_OFFSET = 0.5
+    # 镜头边界的最低分数：不低于 MIN_SCORE，且高出分数中位数 MAD_FACTOR 倍的
+    # 离散度（MAD 换算的标准差），运动、噪声造成的弱边界不计入，由均匀时间点补足
+    MIN_SCORE = 0.005
+    MAD_FACTOR = 6.0
+    # 扫描进度的报告步长
+    PROGRESS_STEP = 0.01
+
+    def __init__(
+        self,
+        sample_fps: float = SAMPLE_FPS,
+        frame_size: Tuple[int, int] = FRAME_SIZE,
+        method: str = "pixel",
+    ):
+        """
+        初始化检测器
+
+        Args:
+            sample_fps (float): 每秒采样帧数
+            frame_size (Tuple[int, int]): 缩小后的灰度图尺寸 (宽, 高)
+            method (str): 差异计算方式，"pixel"（像素差）或 "histogram"（直方图差）
+        """
+        if method not in ("pixel", "histogram"):
+            raise ValueError(f"不支持的差异计算方式: {method}")
+        self.sample_fps = sample_fps
+        self.frame_size = frame_size
+        self.method = method
+
+    def scan(
+        self,
+        extractor: VideoInfoExtractor,
+        video_path: str,
+        job=None,
+        duration: float = 0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        顺序扫描视频，计算每个采样帧与前一采样帧的差异分数
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器（使用其解码后端与解码器池）
+            video_path (str): 视频文件路径
+            job (Job, optional): 任务句柄，用于取消与报告扫描进度（0~1，
+                由调用方通过 job.set_progress_range 映射到整体进度中的一段）
+            duration (float): 视频时长（秒），用于计算扫描进度
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: (采样时间点, 差异分数)，
+                第一个采样帧的分数为 0
+        """
+        times = []
+        frames = []
+        reported = 0.0
+        for time_point, frame in extractor.iter_frames_at_interval(
+            video_path,
+            interval=1 / self.sample_fps,
+            size=self.frame_size,
+            grayscale=True,
+            job=job,
+        ):
+            times.append(time_point)
+            frames.append(frame.copy())
+            if job is not None and duration > 0:
+                progress = min(time_point / duration, 1.0)
+                if progress - reported >= self.PROGRESS_STEP:
+                    reported = progress
+                    job.report_progress(progress)
+
+        times = np.array(times, dtype=np.float64)
+        if not frames:
+            return times, np.zeros(0)
+        return times, self.score(np.stack(frames))
+
+    def score(self, frames: np.ndarray) -> np.ndarray:
+        """
+        向量化计算相邻帧的差异分数
+
+        Args:
+            frames (numpy.ndarray): 形状为 (N, 高, 宽) 的 uint8 灰度帧
+
+        Returns:
+            numpy.ndarray: 长度为 N 的分数，取值 0~1，第一帧为 0
+        """
+        scores = np.zeros(len(frames))
+        if len(frames) < 2:
+            return scores
+
+        if self.method == "histogram":
+            # 每帧的灰度直方图：分箱号加上帧偏移后一次 bincount
+            bins = self.HISTOGRAM_BINS
+            count = len(frames)
+            shift = 8 - int(np.log2(bins))
+            indexes = (frames.reshape(count, -1) >> shift).astype(np.int64)
+            indexes += (np.arange(count) * bins)[:, None]
+            histograms = np.bincount(indexes.ravel(), minlength=count * bins)
+            histograms = histograms.reshape(count, bins) / frames[0].size
+            scores[1:] = np.abs(np.diff(histograms, axis=0)).sum(axis=1) / 2
+        else:
+            diffs = np.abs(np.diff(frames.astype(np.int16), axis=0))
+            scores[1:] = diffs.mean(axis=(1, 2)) / 255
+        return scores
+
+    def min_score(self, scores: np.ndarray) -> float:
+        """
+        镜头边界的最低分数
+
+        Args:
+            scores (numpy.ndarray): 差异分数（第一个为 0，不参与统计）
+
+        Returns:
+            float: 中位数 + MAD_FACTOR × 1.4826 × MAD，且不低于 MIN_SCORE
+        """
+        values = scores[1:]
+        if len(values) == 0:
+            return self.MIN_SCORE
+        median = np.median(values)
+        mad = np.median(np.abs(values - median))
+        return max(float(median + self.MAD_FACTOR * 1.4826 * mad), self.MIN_SCORE)
+
+    def select_times(
+        self, times: np.ndarray, scores: np.ndarray, count: int, duration: float
+    ) -> List[float]:
+        """
+        选取分数最高的镜头边界作为缩略图时间点
+
+        只考虑分数不低于 min_score 的镜头边界，相邻选中点至少间隔
+        duration / (2 * count)，避免集中在同一段；镜头边界不足时（如没有明显
+        切换的视频）以均匀时间点补足。
+
+        Args:
+            times (numpy.ndarray): 采样时间点
+            scores (numpy.ndarray): 差异分数
+            count (int): 需要的时间点数量
+            duration (float): 视频时长（秒）
+
+        Returns:
+            List[float]: 升序的时间点（保留一位小数）
+        """
+        if count <= 0 or duration <= 0:
+            return []
+
+        min_gap = duration / (2 * count)
+        last = max(duration - self.SHOT_OFFSET, 0)
+        min_score = self.min_score(scores)
+
+        selected = []
+        for i in np.argsort(scores, kind="stable")[::-1]:
+            if len(selected) >= count or scores[i] < min_score:
+                break
+            time_point = min(times[i] + self.SHOT_OFFSET, last)
+            if all(abs(time_point - t) >= min_gap for t in selected):
+                selected.append(time_point)
+
+        # 镜头边界不足，以距已选点最远的均匀时间点补足
+        if len(selected) < count:
+            candidates = list(np.linspace(0, last, count * 2 + 1))
+            while len(selected) < count and candidates:
+                best = max(
+                    candidates,
+                    key=lambda t: min((abs(t - s) for s in selected), default=t),
+                )
+                candidates.remove(best)
+                selected.append(best)
+
+        return sorted(round(float(t), 1) for t in selected)
+
+    def detect_times(
+        self,
+        extractor: VideoInfoExtractor,
+        video_path: str,
+        count: int,
+        duration: float,
+        job=None,
+    ) -> List[float]:
+        """
+        检测镜头切换并返回缩略图时间点
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器
+            video_path (str): 视频文件路径
+            count (int): 需要的时间点数量
+            duration (float): 视频时长（秒）
+            job (Job, optional): 任务句柄，用于取消与报告扫描进度
+
+        Returns:
+            List[float]: 升序的时间点
+        """
+        times, scores = self.scan(extractor, video_path, job, duration)
+        seq = self.select_times(times, scores, count, duration)
+        logger.info(f"Scene times of [{video_path}]: {seq}")
+        return seq
+
+
+# 使用示例和测试：与均匀采样对比吞吐量
+if __name__ == "__main__":
+    import sys
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        video_file = sys.argv[1]
+    else:
+        video_file = input("请输入视频文件路径: ")
+
+    extractor = VideoInfoExtractor()
+    info = extractor.get_video_info(video_file)
+    thumbnail_count = 16
+
+    for method in ("pixel", "histogram"):
+        detector = SceneDetector(method=method)
+        start = time.perf_counter()
+        sample_times, sample_scores = detector.scan(extractor, video_file)
+        elapsed = time.perf_counter() - start
+        scene_times = detector.select_times(
+            sample_times, sample_scores, thumbnail_count, info.duration
+        )
+        print(
+            f"\n镜头检测 ({method}): {elapsed:.2f}s, "
+            f"{info.duration / elapsed:.1f}x 实时, 采样 {len(sample_times)} 帧"
+        )
+        print(f"  时间点: {scene_times}")
+
+    uniform_times = list(np.linspace(0, info.duration, thumbnail_count, endpoint=False))
+    start = time.perf_counter()
+    decoded = sum(
+        frame is not None
+        for _, frame in extractor.read_frames_at_times(video_file, uniform_times)
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"\n均匀采样: {elapsed:.2f}s, {info.duration / elapsed:.1f}x 实时, "
+        f"解码 {decoded} 帧"
+    )
@@ -0,0 +1,172 @@
+import builtins
+import json
+import logging
+import sys
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 模块导入计时
+class ImportTimer:
+    """
+    统计模块首次导入的耗时，类似 python -X importtime
+
+    通过替换 builtins.__import__ 记录每个模块的自身耗时（不含其导入的子模块）
+    和累计耗时。只统计 import 语句触发的首次导入。
+    """
+
+    def __init__(self):
+        # (模块名, 嵌套深度, 自身耗时, 累计耗时)，单位秒，按导入完成顺序
+        self.records = []
+        self._stack = []
+        self._original_import = None
+
+    def install(self):
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level != 0 or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        # 栈中记录每层已统计到的子模块耗时
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            self.records.append((name, len(self._stack), total - children, total))
+
+    def top(self, count: int = 20) -> List[Dict[str, object]]:
+        """
+        累计耗时最长的模块
+
+        Args:
+            count (int): 返回的模块数
+
+        Returns:
+            List[dict]: 模块名、嵌套深度、自身耗时与累计耗时（毫秒）
+        """
+        records = sorted(self.records, key=lambda r: r[3], reverse=True)[:count]
+        return [
+            {
+                "module": name,
+                "depth": depth,
+                "self_ms": round(self_time * 1000, 2),
+                "cumulative_ms": round(total * 1000, 2),
+            }
+            for name, depth, self_time, total in records
+        ]
+
+
+# 启动计时
+class StartupTimer:
+    """
+    记录应用启动各阶段的时间点（距计时开始的秒数）与模块导入耗时，
+    到达首帧时输出报告，用于发现启动耗时的退化。
+    """
+
+    # 应在首帧之后才导入的模块，报告中列出已提前导入的
+    DEFERRED_MODULES = ("cv2", "numpy")
+
+    def __init__(self, output_path: Optional[str] = None):
+        """
+        初始化并开始计时
+
+        Args:
+            output_path (str, optional): 报告 JSON 文件路径，为空时只输出到日志
+        """
+        self.output_path = output_path
+        self.start = time.perf_counter()
+        self.marks = []
+        self.import_timer = ImportTimer()
+        self.import_timer.install()
+
+    def mark(self, name: str):
+        """记录一个阶段完成的时间点"""
+        self.marks.append((name, time.perf_counter() - self.start))
+
+    def report(self, top: int = 20) -> Dict[str, object]:
+        return {
+            "marks": [
+                {"name": name, "elapsed_ms": round(elapsed * 1000, 2)}
+                for name, elapsed in self.marks
+            ],
+            "imports": self.import_timer.top(top),
+            "deferred_loaded": [
+                name for name in self.DEFERRED_MODULES if name in sys.modules
+            ],
+        }
+
+    def finish(self, name: str = "first_frame"):
+        """
+        记录最后一个时间点，停止导入计时并输出报告
+
+        Args:
+            name (str): 最后一个时间点的名称
+        """
+        self.mark(name)
+        self.import_timer.uninstall()
+        report = self.report()
+
+        logger.info("----------- Startup timing -----------")
+        for item in report["marks"]:
+            logger.info(f"  {item['elapsed_ms']:>10.2f} ms  {item['name']}")
+        logger.info("  self ms | cumulative ms | module")
+        for item in report["imports"]:
+            logger.info(
+                f"  {item['self_ms']:>7.2f} | {item['cumulative_ms']:>13.2f} | "
+                f"{'  ' * item['depth']}{item['module']}"
+            )
+        if report["deferred_loaded"]:
+            logger.warning(
+                f"Modules imported before {name}: {report['deferred_loaded']}"
+            )
+
+        if self.output_path:
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+def start_startup_timer(option: Optional[str]) -> Optional[StartupTimer]:
+    """
+    按选项开始启动计时
+
+    Args:
+        option (str): 未设置或为空时不计时；为 "1" 时只输出到日志；
+            其它值作为报告 JSON 文件路径
+
+    Returns:
+        StartupTimer: 启动计时器，未开启时返回 None
+    """
+    if not option:
+        return None
+    return StartupTimer(None if option == "1" else option)
+
+
+# 使用示例和测试
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    timer = StartupTimer()
+    import cv2  # noqa: F401
+    import numpy  # noqa: F401
+
+    timer.mark("import_cv2")
+    from utils.video_meta_util import VideoInfoExtractor  # noqa: F401
+
+    timer.mark("import_video_meta_util")
+    timer.finish("done")
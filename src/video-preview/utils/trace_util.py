@@ -0,0 +1,280 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 关闭追踪时使用的空 span
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# 追踪区间
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.record(
+            self.name, self.start, time.perf_counter_ns() - self.start, self.args
+        )
+        return False
+
+
+# 阶段耗时统计
+class StageStats:
+    """单个阶段的次数、总耗时、最值与按 2 的幂分桶（微秒）的耗时直方图"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        # 桶号 -> 次数，桶号 n 表示耗时在 [2^(n-1), 2^n) 微秒之间
+        self.buckets = {}
+
+    def add(self, duration_ns: int):
+        self.count += 1
+        self.total_ns += duration_ns
+        self.min_ns = (
+            duration_ns if self.min_ns is None else min(self.min_ns, duration_ns)
+        )
+        self.max_ns = max(self.max_ns, duration_ns)
+        bucket = (duration_ns // 1000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3),
+            "min_ms": round(self.min_ns / 1e6, 3),
+            "max_ms": round(self.max_ns / 1e6, 3),
+            "histogram": {
+                Tracer.bucket_label(bucket): count
+                for bucket, count in sorted(self.buckets.items())
+            },
+        }
+
+
+# 分阶段追踪
+class Tracer:
+    """
+    轻量的分阶段耗时追踪
+
+    用 span(name) 包住各阶段（打开、定位、解码、编码、写入等），记录每个阶段的
+    耗时直方图，并保留 Chrome trace-event 格式的事件，可在 chrome://tracing
+    或 Perfetto 中查看。关闭时 span 返回共享的空对象，开销只有一次属性判断。
+    """
+
+    # 最多保留的 trace 事件数，超出后只统计不记录事件
+    MAX_EVENTS = 1_000_000
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self._lock = threading.Lock()
+        self._start_ns = time.perf_counter_ns()
+        self._stats = {}
+        self._events = []
+        self._thread_names = {}
+
+    def configure(self, enabled: bool, output_path: Optional[str] = None):
+        """
+        开启或关闭追踪
+
+        Args:
+            enabled (bool): 是否开启
+            output_path (str, optional): finish 时导出 Chrome trace 文件的路径
+        """
+        self.enabled = bool(enabled)
+        self.output_path = os.path.expanduser(output_path) if output_path else None
+        if self.enabled:
+            logger.info(f"Tracing enabled, output: {self.output_path}")
+
+    def span(self, name: str, **args):
+        """追踪一个阶段，用于 with 语句；args 会记录在 trace 事件中"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args)
+
+    def record(self, name: str, start_ns: int, duration_ns: int, args: dict = None):
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = StageStats()
+            stats.add(duration_ns)
+
+            if len(self._events) < self.MAX_EVENTS:
+                self._thread_names.setdefault(thread.ident, thread.name)
+                event = {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start_ns - self._start_ns) / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": os.getpid(),
+                    "tid": thread.ident,
+                }
+                if args:
+                    event["args"] = {key: str(value) for key, value in args.items()}
+                self._events.append(event)
+
+    def reset(self):
+        with self._lock:
+            self._start_ns = time.perf_counter_ns()
+            self._stats.clear()
+            self._events.clear()
+            self._thread_names.clear()
+
+    @staticmethod
+    def bucket_label(bucket: int) -> str:
+        # 桶的耗时上限
+        upper_us = 1 << bucket
+        if upper_us < 1000:
+            return f"<{upper_us}us"
+        if upper_us < 1000_000:
+            return f"<{upper_us / 1000:g}ms"
+        return f"<{upper_us / 1000_000:g}s"
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        """各阶段的耗时统计，按总耗时降序"""
+        with self._lock:
+            items = sorted(
+                self._stats.items(), key=lambda item: item[1].total_ns, reverse=True
+            )
+            return {name: stats.to_dict() for name, stats in items}
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        logger.info("----------- Trace summary -----------")
+        logger.info(f"  {'stage':<28} {'count':>7} {'total ms':>10} {'mean ms':>9}")
+        for name, stats in summary.items():
+            logger.info(
+                f"  {name:<28} {stats['count']:>7} {stats['total_ms']:>10.2f} "
+                f"{stats['mean_ms']:>9.3f}"
+            )
+            histogram = ", ".join(
+                f"{label}: {count}" for label, count in stats["histogram"].items()
+            )
+            logger.info(f"      {histogram}")
+
+    def export_chrome_trace(self, path: str):
+        """
+        导出 Chrome trace-event JSON 文件
+
+        Args:
+            path (str): 文件路径
+        """
+        with self._lock:
+            events = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": ident,
+                    "args": {"name": name},
+                }
+                for ident, name in self._thread_names.items()
+            ]
+            events.extend(self._events)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False
+            )
+        logger.info(f"Export chrome trace: {path} ({len(events)} events)")
+
+    def finish(self):
+        """输出统计并导出 trace 文件（未开启时不做处理）"""
+        if not self.enabled:
+            return
+        self.log_summary()
+        if self.output_path:
+            self.export_chrome_trace(self.output_path)
+
+
+# 全局追踪器
+tracer = Tracer()
+
+
+def span(name: str, **args):
+    """
+    便捷函数：使用全局追踪器追踪一个阶段
+
+    Args:
+        name (str): 阶段名称
+        **args: 记录在 trace 事件中的参数
+    """
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return Span(tracer, name, args)
+
+
+def traced(name: str = None):
+    """
+    装饰器：追踪函数的每次调用
+
+    Args:
+        name (str, optional): 阶段名称，默认为函数的限定名
+    """
+
+    def decorator(fn):
+        stage = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(tracer, stage, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# 使用示例和测试：追踪一个视频的缩略图生成
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    from utils.trace_util import tracer  # 以模块方式运行时，与被追踪模块使用同一实例
+    from utils.video_meta_util import VideoInfoExtractor
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        video_file = sys.argv[1]
+    else:
+        video_file = input("请输入视频文件路径: ")
+
+    tracer.configure(True, os.path.join(tempfile.gettempdir(), "video-preview.trace"))
+    extractor = VideoInfoExtractor()
+    info = extractor.get_video_info(video_file)
+    times = [info.duration * i / 16 for i in range(16)]
+    with tempfile.TemporaryDirectory() as output_dir:
+        extractor.generate_thumbnails_at_times(video_file, times, output_dir)
+    tracer.finish()
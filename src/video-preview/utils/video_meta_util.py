@@ -1,11 +1,18 @@
 import logging
+import os
 from collections import namedtuple
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import cv2
+import numpy as np
 from utils.file_util import SizeFormatter
+from utils.decoder_util import DecoderPool, DecoderSelector, default_pool
+from utils.frame_quality_util import FrameQualityGate
+from utils.job_util import Job, submit_job
+from utils.keyframe_util import KeyframeIndex
 from utils.time_util import TimeDurationFormatter
+from utils.trace_util import span
 
 logger = logging.getLogger(__name__)
 
@@ -28,80 +35,84 @@ VideoInfo = namedtuple(
     ],
 )
 
+# 缩略图生成项 元组（path 为文件路径，data 为编码后的图片数据；均为 None 表示该时间点读取失败；
+# time 为实际取帧的时间点，offset 为质量检查重试后相对请求时间点的偏移）
+ThumbnailItem = namedtuple(
+    "ThumbnailItem", ["time", "path", "data", "offset"], defaults=(None, 0.0)
+)
+
 
 class VideoInfoExtractor:
-    """使用OpenCV提取视频文件信息和生成缩略图的工具类"""
+    """使用OpenCV提取视频文件信息，通过可替换的解码后端生成缩略图的工具类"""
 
-    def __init__(self):
-        """初始化视频信息提取器"""
-        self._generate_thumbnails_at_times_progress = 0
-        pass
+    # 顺序读取时，目标帧与当前位置相距不超过该时长（秒）则逐帧 grab 前进，否则 seek
+    MAX_GRAB_GAP_SECONDS = 2.0
+    # 帧质量不合格时依次尝试的向后偏移（秒），不超过下一个时间点和视频时长
+    RETRY_OFFSETS = (0.5, 1.5, 3.0)
 
-    def get_video_info(self, video_path):
+    def __init__(
+        self,
+        backend: str = "opencv",
+        selector: DecoderSelector = None,
+        pool: DecoderPool = None,
+    ):
         """
-        获取视频文件的基本信息
+        初始化视频信息提取器
 
         Args:
-            video_path (str): 视频文件路径
+            backend (str): 解码后端，"opencv"、"pyav" 或 "auto"（按编码格式基准测试选择）
+            selector (DecoderSelector, optional): backend 为 "auto" 时使用的选择器
+            pool (DecoderPool, optional): 解码器池，默认使用全局池
+        """
+        self.backend = backend
+        self.selector = selector
+        self.pool = pool if pool is not None else default_pool
 
-        Returns:
-            VideoInfo: 包含视频信息的命名元组
+    def acquire_decoder(self, video_path):
+        """
+        从解码器池借出以配置的后端打开的解码器，用完后调用 release_decoder 归还
 
         Raises:
-            FileNotFoundError: 如果视频文件不存在
             ValueError: 如果无法打开视频文件
         """
-        video_path = Path(video_path).resolve()
+        with span("open", path=video_path):
+            return self.pool.acquire(str(video_path), self.backend, self.selector)
 
-        if not video_path.exists():
-            raise FileNotFoundError(f"视频文件不存在: {video_path}")
+    def release_decoder(self, decoder):
+        self.pool.release(decoder)
 
-        # 打开视频文件
-        cap = cv2.VideoCapture(str(video_path))
+    def open_session(self, video_path) -> "VideoSession":
+        """
+        打开视频会话：只打开一次视频，依次获取信息、读取帧、生成缩略图
 
-        if not cap.isOpened():
-            raise ValueError(f"无法打开视频文件: {video_path}")
+        Args:
+            video_path (str): 视频文件路径
 
-        try:
-            # 获取视频信息
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = round(cap.get(cv2.CAP_PROP_FPS), 2)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        Returns:
+            VideoSession: 视频会话，用完后需关闭（支持 with 语句）
 
-            # 计算时长（秒）
-            duration = round(frame_count / fps, 2) if fps > 0 else 0
-            time_duration = TimeDurationFormatter.format_duration(
-                duration, "colon_short"
-            )
+        Raises:
+            FileNotFoundError: 如果视频文件不存在
+            ValueError: 如果无法打开视频文件
+        """
+        return VideoSession(self, video_path)
 
-            # 获取编解码器信息
-            fourcc_int = int(cap.get(cv2.CAP_PROP_FOURCC))
-            codec = self._fourcc_to_string(fourcc_int)
+    def get_video_info(self, video_path):
+        """
+        获取视频文件的基本信息
 
-            # 获取文件大小
-            file_size = video_path.stat().st_size
-            pretty_size = SizeFormatter.format_size_auto(file_size)
+        Args:
+            video_path (str): 视频文件路径
 
-            # 创建并返回命名元组
-            return VideoInfo(
-                path=str(video_path),
-                filename=video_path.name,
-                width=width,
-                height=height,
-                resolution=f"{width}x{height}",
-                fps=fps,
-                frame_count=frame_count,
-                duration=duration,
-                time_duration=time_duration,
-                codec=codec,
-                size=file_size,
-                pretty_size=pretty_size,
-            )
+        Returns:
+            VideoInfo: 包含视频信息的命名元组
 
-        finally:
-            # 确保释放视频捕获对象
-            cap.release()
+        Raises:
+            FileNotFoundError: 如果视频文件不存在
+            ValueError: 如果无法打开视频文件
+        """
+        with self.open_session(video_path) as session:
+            return session.info
 
     def _fourcc_to_string(self, fourcc_int):
         """
@@ -133,39 +144,47 @@ class VideoInfoExtractor:
                 results[path] = f"错误: {str(e)}"
         return results
 
-    def get_video_thumbnail(self, video_path, output_path=None, frame_time=5.0):
+    def get_video_thumbnail(
+        self, video_path, output_path=None, frame_time=5.0, size=None
+    ):
         """
         获取视频的单个缩略图
 
         Args:
             video_path (str): 视频文件路径
             output_path (str, optional): 缩略图保存路径
-            frame_time (float): 提取帧的时间（秒）
+            frame_time (float): 提取帧的时间（秒），为 None 时取封面帧
+            size (Tuple[int, int], optional): 最大尺寸 (宽, 高)，超出时等比缩小
 
         Returns:
             numpy.ndarray: 缩略图图像数据，如果失败返回None
         """
-        cap = cv2.VideoCapture(str(video_path))
-
-        if not cap.isOpened():
-            raise ValueError(f"无法打开视频文件: {video_path}")
-
-        try:
-            # 设置到指定时间点
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_pos = int(frame_time * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-
-            # 读取帧
-            ret, frame = cap.read()
-
-            if ret and output_path:
-                cv2.imwrite(output_path, frame)
+        with self.open_session(video_path) as session:
+            if frame_time is None:
+                frame = session.poster_frame()
+            else:
+                frame = session.read_frame(frame_time)
+
+        if frame is not None and size is not None:
+            height, width = frame.shape[:2]
+            scale = min(size[0] / width, size[1] / height)
+            if scale < 1:
+                frame = cv2.resize(
+                    frame,
+                    (max(1, int(width * scale)), max(1, int(height * scale))),
+                    interpolation=cv2.INTER_AREA,
+                )
 
-            return frame if ret else None
+        if frame is not None and output_path:
+            # cv2.imwrite 不支持非 ASCII 路径；先写临时文件再替换，不留下不完整的文件
+            format = os.path.splitext(output_path)[1].lstrip(".") or "jpg"
+            data = self._encode_image(frame, format, 95)
+            temp_path = f"{output_path}.tmp"
+            with span("write"):
+                data.tofile(temp_path)
+                os.replace(temp_path, output_path)
 
-        finally:
-            cap.release()
+        return frame
 
     def generate_thumbnails_at_times(
         self,
@@ -175,6 +194,10 @@ class VideoInfoExtractor:
         prefix: str = "thumbnail",
         format: str = "jpg",
         quality: int = 95,
+        job: Optional[Job] = None,
+        on_frame: Optional[Callable] = None,
+        quality_gate: Optional[FrameQualityGate] = None,
+        keyframes: Optional[KeyframeIndex] = None,
     ) -> Dict[float, str]:
         """
         在指定时间点生成多个缩略图
@@ -186,102 +209,669 @@ class VideoInfoExtractor:
             prefix (str): 缩略图文件名前缀
             format (str): 图像格式（jpg, png等）
             quality (int): JPEG质量（0-100），仅对JPEG格式有效
+            job (Job, optional): 任务句柄，每处理一个时间点推进一次并触发
+                on_item 事件（ThumbnailItem）；任务被取消时在下一个时间点前停止
+            on_frame (Callable, optional): 每解码一帧的回调 on_frame(时间点, 帧数据)，
+                可复用已解码的帧做其它计算（如感知哈希）
+            quality_gate (FrameQualityGate, optional): 帧质量检查，黑场、纯色或模糊的帧
+                在附近偏移处重试（见 RETRY_OFFSETS），均不合格时取最清晰的一帧
+            keyframes (KeyframeIndex, optional): 关键帧索引，用于规划 seek
+
+        Returns:
+            Dict[float, str]: 实际取帧的时间点到文件路径的映射
+
+        Raises:
+            ValueError: 如果无法打开视频文件或时间点无效
+            JobCancelled: 如果任务被取消
+        """
+        with self.open_session(video_path) as session:
+            return session.generate_thumbnails(
+                times,
+                output_dir,
+                prefix=prefix,
+                format=format,
+                quality=quality,
+                job=job,
+                on_frame=on_frame,
+                quality_gate=quality_gate,
+                keyframes=keyframes,
+            )
+
+    def encode_thumbnails_at_times(
+        self,
+        video_path: str,
+        times: List[Union[float, int]],
+        format: str = "jpg",
+        quality: int = 95,
+        job: Optional[Job] = None,
+        on_frame: Optional[Callable] = None,
+        quality_gate: Optional[FrameQualityGate] = None,
+        keyframes: Optional[KeyframeIndex] = None,
+    ) -> Dict[float, bytes]:
+        """
+        在指定时间点生成多个缩略图，只编码不写文件
+
+        Args:
+            video_path (str): 视频文件路径
+            times (List[Union[float, int]]): 时间点列表（单位：秒）
+            format (str): 图像格式（jpg, png等）
+            quality (int): JPEG质量（0-100），仅对JPEG格式有效
+            job (Job, optional): 任务句柄，每处理一个时间点推进一次并触发
+                on_item 事件（ThumbnailItem，图片数据在 data 字段）
+            on_frame (Callable, optional): 每解码一帧的回调 on_frame(时间点, 帧数据)
+            quality_gate (FrameQualityGate, optional): 帧质量检查，同 generate_thumbnails_at_times
+            keyframes (KeyframeIndex, optional): 关键帧索引，用于规划 seek
 
         Returns:
-            Dict[float, str]: 时间点到文件路径的映射
+            Dict[float, bytes]: 实际取帧的时间点到编码后图片数据的映射，读取失败为None
 
         Raises:
             ValueError: 如果无法打开视频文件或时间点无效
+            JobCancelled: 如果任务被取消
+        """
+        with self.open_session(video_path) as session:
+            return session.encode_thumbnails(
+                times,
+                format=format,
+                quality=quality,
+                job=job,
+                on_frame=on_frame,
+                quality_gate=quality_gate,
+                keyframes=keyframes,
+            )
+
+    def _validate_times(self, decoder, times):
+        """
+        验证时间点，跳过小于0或超过视频时长的时间点
+
+        Args:
+            decoder (VideoDecoder): 已打开的视频解码器
+            times (List[Union[float, int]]): 时间点列表（单位：秒）
+
+        Returns:
+            List[Union[float, int]]: 有效的时间点列表
+
+        Raises:
+            ValueError: 如果没有有效的时间点
         """
-        self._generate_thumbnails_at_times_progress = 0
-        video_path = Path(video_path).resolve()
+        fps = decoder.fps
+        frame_count = decoder.frame_count
+        duration = frame_count / fps if fps > 0 else 0
+
+        valid_times = []
+        for time_point in times:
+            if time_point < 0:
+                logging.warning(f"警告: 时间点 {time_point} 小于0，已跳过")
+            elif time_point > duration:
+                logging.warning(
+                    f"警告: 时间点 {time_point} 超过视频时长 {duration:.2f}s，已跳过"
+                )
+            else:
+                valid_times.append(time_point)
+
+        if not valid_times:
+            raise ValueError("没有有效的时间点")
 
-        if not video_path.exists():
-            raise FileNotFoundError(f"视频文件不存在: {video_path}")
+        return valid_times
 
-        # 打开视频文件
-        cap = cv2.VideoCapture(str(video_path))
+    def _encode_image(self, frame, format, quality):
+        # 编码图像
+        with span("encode"):
+            if format.lower() in ["jpg", "jpeg"]:
+                return cv2.imencode(
+                    "." + format, frame, [cv2.IMWRITE_JPEG_QUALITY, quality]
+                )[1]
+            return cv2.imencode("." + format, frame)[1]
 
-        if not cap.isOpened():
-            raise ValueError(f"无法打开视频文件: {video_path}")
+    def read_frames_at_times(
+        self,
+        video_path: str,
+        times: List[Union[float, int]],
+        job: Optional[Job] = None,
+    ) -> Iterator[Tuple[float, object]]:
+        """
+        按时间顺序读取多个时间点的帧
+
+        Args:
+            video_path (str): 视频文件路径
+            times (List[Union[float, int]]): 时间点列表（单位：秒）
+            job (Job, optional): 任务句柄，用于取消
+
+        Yields:
+            Tuple[float, numpy.ndarray]: (时间点, 帧数据)，读取失败时帧为None
+
+        Raises:
+            ValueError: 如果无法打开视频文件
+        """
+        with self.open_session(video_path) as session:
+            for time_point, frame, _ in session.read_frames(times, job):
+                yield time_point, frame
+
+    def read_keyframes_at_times(
+        self,
+        video_path: str,
+        times: List[Union[float, int]],
+        job: Optional[Job] = None,
+    ) -> Iterator[Tuple[float, object]]:
+        """
+        按时间顺序读取多个时间点之前最近的关键帧，适合预览条等不要求精确的场景
+
+        解码后端支持只解码关键帧（PyAV）时整段视频只解码关键帧，
+        否则退回 read_frames_at_times 的精确读取。相邻时间点可能得到同一帧。
+
+        Args:
+            video_path (str): 视频文件路径
+            times (List[Union[float, int]]): 时间点列表（单位：秒）
+            job (Job, optional): 任务句柄，用于取消
+
+        Yields:
+            Tuple[float, numpy.ndarray]: (时间点, 帧数据)，读取失败时帧为None
+
+        Raises:
+            ValueError: 如果无法打开视频文件
+        """
+        decoder = self.acquire_decoder(video_path)
 
         try:
-            # 获取视频信息
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            duration = frame_count / fps if fps > 0 else 0
-
-            # 验证时间点
-            valid_times = []
-            for time_point in times:
-                if time_point < 0:
-                    logging.warning(f"警告: 时间点 {time_point} 小于0，已跳过")
-                elif time_point > duration:
-                    logging.warning(
-                        f"警告: 时间点 {time_point} 超过视频时长 {duration:.2f}s，已跳过"
-                    )
-                else:
-                    valid_times.append(time_point)
-
-            if not valid_times:
-                raise ValueError("没有有效的时间点")
-
-            # 准备输出目录
-            if output_dir:
-                output_dir = Path(output_dir)
-                output_dir.mkdir(parents=True, exist_ok=True)
-
-            # 生成缩略图
-            results = {}
-            for time_point in valid_times:
-                # 计算帧位置
-                frame_pos = int(time_point * fps)
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-
-                # 读取帧
-                ret, frame = cap.read()
-
-                if ret:
-                    if output_dir:
-                        # 生成文件名
-                        time_str = f"{time_point:.1f}".replace(".", "_")
-                        filename = f"{prefix}_{time_str}s.{format}"
-                        output_path = output_dir / filename
-
-                        logger.debug(f"Generate thumbnails with [{str(output_path)}]")
-
-                        # 保存图像
-                        if format.lower() in ["jpg", "jpeg"]:
-                            cv2.imencode(
-                                "." + format, frame, [cv2.IMWRITE_JPEG_QUALITY, quality]
-                            )[1].tofile(str(output_path))
-                        else:
-                            cv2.imencode("." + format, frame)[1].tofile(
-                                str(output_path)
+            if not decoder.supports_keyframes_only:
+                for time_point, frame, _ in self._read_frames_sequential(
+                    decoder, times, job
+                ):
+                    yield time_point, frame
+                return
+
+            pending = sorted(times)
+            index = 0
+            previous = None
+            for keyframe_time, frame in decoder.iter_keyframes():
+                if job is not None:
+                    job.raise_if_cancelled()
+                while index < len(pending) and pending[index] < keyframe_time:
+                    yield pending[index], previous if previous is not None else frame
+                    index += 1
+                if index >= len(pending):
+                    break
+                previous = frame
+
+            for time_point in pending[index:]:
+                yield time_point, previous
+        finally:
+            self.release_decoder(decoder)
+
+    def iter_frames_at_interval(
+        self,
+        video_path: str,
+        interval: float = 1.0,
+        start: float = 0.0,
+        end: Optional[float] = None,
+        size: Optional[Tuple[int, int]] = None,
+        grayscale: bool = False,
+        job: Optional[Job] = None,
+    ) -> Iterator[Tuple[float, object]]:
+        """
+        按固定间隔顺序读取帧（如每秒一帧），适合批量审阅等密集取帧场景
+
+        从起始时间起只 seek 一次，之后逐帧 grab，仅对选中的帧 retrieve 解码到
+        预分配的缓冲区，缩放和灰度转换也写入复用的缓冲区，内存占用与视频长度无关。
+
+        注意：每次产出的帧数据是同一块缓冲区，下一次迭代时会被覆盖，
+        需要保留时请自行 copy()。
+
+        Args:
+            video_path (str): 视频文件路径
+            interval (float): 取帧间隔（秒）
+            start (float): 起始时间（秒）
+            end (float, optional): 结束时间（秒），默认到视频结尾
+            size (Tuple[int, int], optional): 缩放到的尺寸 (宽, 高)，默认原始尺寸
+            grayscale (bool): 是否转换为灰度图
+            job (Job, optional): 任务句柄，用于取消
+
+        Yields:
+            Tuple[float, numpy.ndarray]: (时间点, 帧数据)
+
+        Raises:
+            ValueError: 如果无法打开视频文件或间隔无效
+        """
+        if interval <= 0:
+            raise ValueError("取帧间隔必须大于0")
+
+        decoder = self.acquire_decoder(video_path)
+
+        try:
+            fps = decoder.fps or 25.0
+            index = int(start * fps)
+            if decoder.position != index:
+                decoder.seek(index)
+            end_index = int(end * fps) if end is not None else None
+
+            # 复用的缓冲区，首次解码时按帧尺寸分配
+            frame_buffer = None
+            resize_buffer = None
+            gray_buffer = None
+
+            next_index = float(index)
+            while end_index is None or index <= end_index:
+                if not decoder.grab():
+                    break
+
+                if index >= next_index:
+                    next_index += interval * fps
+                    if job is not None:
+                        job.raise_if_cancelled()
+
+                    ret, frame_buffer = decoder.retrieve(frame_buffer)
+                    if not ret:
+                        logging.warning(f"警告: 无法读取第 {index} 帧")
+                        index += 1
+                        continue
+
+                    frame = frame_buffer
+                    if size is not None:
+                        if resize_buffer is None:
+                            resize_buffer = np.empty(
+                                (size[1], size[0], frame.shape[2]), dtype=frame.dtype
                             )
+                        frame = cv2.resize(
+                            frame, size, dst=resize_buffer, interpolation=cv2.INTER_AREA
+                        )
+                    if grayscale:
+                        if gray_buffer is None:
+                            gray_buffer = np.empty(frame.shape[:2], dtype=frame.dtype)
+                        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray_buffer)
+
+                    yield index / fps, frame
+                index += 1
+        finally:
+            self.release_decoder(decoder)
+
+    def _read_frames_sequential(
+        self, decoder, times, job=None, quality_gate=None, keyframes=None
+    ):
+        """
+        顺序解码读取帧：按时间排序后，间隔较小的目标帧通过 grab 逐帧前进，
+        避免每个时间点都 seek 回关键帧重新解码；间隔较大时才 seek。
+
+        提供关键帧索引时按关键帧规划：当前位置与目标帧之间有关键帧时 seek
+        （从该关键帧开始解码），否则 grab 前进（seek 也要从更早的关键帧解码）
+
+        Args:
+            decoder (VideoDecoder): 新打开的视频解码器
+            times (List[Union[float, int]]): 时间点列表（单位：秒）
+            job (Job, optional): 任务句柄，用于取消
+            quality_gate (FrameQualityGate, optional): 帧质量检查，不合格时向后偏移重试
+            keyframes (KeyframeIndex, optional): 关键帧索引
+
+        Yields:
+            Tuple[float, numpy.ndarray, float]: (时间点, 帧数据, 实际取帧的偏移)，
+                读取失败时帧为None
+        """
+        fps = decoder.fps
+        # 解码器可能来自解码器池，从其当前位置开始规划
+        position = decoder.position
+        max_gap = max(1, int(self.MAX_GRAB_GAP_SECONDS * fps))
+        frame_count = decoder.frame_count
+        sorted_times = sorted(times)
+
+        def read_at(frame_pos):
+            # 向前且中间没有关键帧（无索引时为间隔较小）时 grab 前进，否则 seek
+            nonlocal position
+            gap = frame_pos - position
+            keyframe = (
+                keyframes.frame_before(frame_pos, fps)
+                if keyframes is not None
+                else None
+            )
+            if position < 0:
+                use_grab = False
+            elif keyframe is not None:
+                use_grab = gap >= 0 and keyframe <= position
+            else:
+                # 没有关键帧信息：只在间隔较小时 grab，否则 seek
+                use_grab = 0 <= gap <= max_gap
+            if use_grab:
+                with span("grab", frames=gap):
+                    for _ in range(gap):
+                        if not decoder.grab():
+                            break
+            else:
+                with span("seek", frame=frame_pos):
+                    decoder.seek(frame_pos)
+
+            with span("decode"):
+                ret, frame = decoder.read()
+            position = frame_pos + 1
+            return frame if ret else None
+
+        for i, time_point in enumerate(sorted_times):
+            if job is not None:
+                job.raise_if_cancelled()
+
+            frame = read_at(int(time_point * fps))
+            offset = 0.0
+            if frame is None:
+                logging.warning(f"警告: 无法在时间点 {time_point}s 读取帧")
+            elif quality_gate is not None:
+                with span("quality_gate"):
+                    score = quality_gate.score(frame)
+                best = (score.sharpness, frame, offset)
+
+                # 重试不越过下一个时间点，避免与其重复并保持顺序读取
+                limit = sorted_times[i + 1] if i + 1 < len(sorted_times) else None
+                for retry_offset in self.RETRY_OFFSETS:
+                    if quality_gate.accepts(score):
+                        break
+                    retry_time = time_point + retry_offset
+                    retry_pos = int(retry_time * fps)
+                    if (limit is not None and retry_time >= limit) or (
+                        retry_pos >= frame_count
+                    ):
+                        break
+                    retry_frame = read_at(retry_pos)
+                    if retry_frame is None:
+                        break
+
+                    frame, offset = retry_frame, retry_offset
+                    with span("quality_gate"):
+                        score = quality_gate.score(frame)
+                    logger.debug(f"Retry low quality frame at [{retry_time}s]: {score}")
+                    if score.sharpness > best[0]:
+                        best = (score.sharpness, frame, offset)
+
+                # 均不合格时取最清晰的一帧
+                if not quality_gate.accepts(score):
+                    _, frame, offset = best
+                    logger.info(f"No acceptable frame near [{time_point}s]")
+
+            yield time_point, frame, offset
+
+    def submit_thumbnails_at_times(
+        self,
+        video_path: str,
+        times: List[Union[float, int]],
+        output_dir: str = None,
+        prefix: str = "thumbnail",
+        format: str = "jpg",
+        quality: int = 95,
+        on_item: Optional[Callable] = None,
+        on_progress: Optional[Callable] = None,
+        on_complete: Optional[Callable] = None,
+    ) -> Job:
+        """
+        在后台线程中生成多个缩略图，立即返回任务句柄
+
+        参数含义同 generate_thumbnails_at_times；事件回调在提交前完成订阅，
+        不会丢失任何事件。回调在后台线程中执行，界面更新需自行调度到主线程。
 
-                        results[time_point] = str(output_path)
-                    else:
-                        # 如果不保存文件，只返回图像数据（这里简化处理，实际可能需要调整）
-                        results[time_point] = frame
+        Args:
+            on_item (Callable, optional): on_item(job, ThumbnailItem)
+            on_progress (Callable, optional): on_progress(job, progress)
+            on_complete (Callable, optional): on_complete(job)
+
+        Returns:
+            Job: 任务句柄，结果为时间点到文件路径的映射
+        """
+        job = Job(name=f"thumbnails:{video_path}")
+        job.bind(on_item=on_item, on_progress=on_progress, on_complete=on_complete)
+
+        def run(job):
+            return self.generate_thumbnails_at_times(
+                video_path,
+                times,
+                output_dir,
+                prefix=prefix,
+                format=format,
+                quality=quality,
+                job=job,
+            )
+
+        return submit_job(job, run)
+
+
+class VideoSession:
+    """
+    视频会话
+
+    只打开一次视频（从解码器池借出一个解码器），在其上提供视频信息、
+    单帧读取、按计划的多帧读取、缩略图生成和封面帧，
+    避免同一视频的探测和生成缩略图各自打开、解析、验证一遍。
+    会话不是线程安全的，同一时间只应由一个线程使用。
+    """
+
+    # 封面帧默认取视频时长的比例位置（避开片头）
+    POSTER_FRACTION = 0.1
+
+    def __init__(self, extractor: VideoInfoExtractor, video_path):
+        """
+        打开视频会话
+
+        Args:
+            extractor (VideoInfoExtractor): 视频信息提取器（提供解码后端和解码器池）
+            video_path (str): 视频文件路径
+
+        Raises:
+            FileNotFoundError: 如果视频文件不存在
+            ValueError: 如果无法打开视频文件
+        """
+        self.extractor = extractor
+        self.video_path = Path(video_path).resolve()
+
+        if not self.video_path.exists():
+            raise FileNotFoundError(f"视频文件不存在: {self.video_path}")
+
+        self.decoder = extractor.acquire_decoder(self.video_path)
+        self._info = None
+
+    @property
+    def info(self) -> VideoInfo:
+        """视频信息（首次访问时计算）"""
+        if self._info is None:
+            decoder = self.decoder
+            fps = round(decoder.fps, 2)
+
+            # 计算时长（秒）
+            duration = round(decoder.frame_count / fps, 2) if fps > 0 else 0
+            time_duration = TimeDurationFormatter.format_duration(
+                duration, "colon_short"
+            )
+
+            # 获取文件大小
+            file_size = self.video_path.stat().st_size
+            pretty_size = SizeFormatter.format_size_auto(file_size)
+
+            self._info = VideoInfo(
+                path=str(self.video_path),
+                filename=self.video_path.name,
+                width=decoder.width,
+                height=decoder.height,
+                resolution=f"{decoder.width}x{decoder.height}",
+                fps=fps,
+                frame_count=decoder.frame_count,
+                duration=duration,
+                time_duration=time_duration,
+                codec=decoder.codec,
+                size=file_size,
+                pretty_size=pretty_size,
+            )
+        return self._info
+
+    def validate_times(self, times: List[Union[float, int]]):
+        """验证时间点，见 VideoInfoExtractor._validate_times"""
+        return self.extractor._validate_times(self.decoder, times)
+
+    def read_frame(self, time_point: float):
+        """
+        读取单个时间点的帧
+
+        Args:
+            time_point (float): 时间点（秒）
+
+        Returns:
+            numpy.ndarray: 帧数据，读取失败返回None
+        """
+        frame_pos = int(time_point * self.decoder.fps)
+        if self.decoder.position != frame_pos:
+            self.decoder.seek(frame_pos)
+        ret, frame = self.decoder.read()
+        return frame if ret else None
+
+    def read_frames(
+        self,
+        times: List[Union[float, int]],
+        job: Optional[Job] = None,
+        quality_gate: Optional[FrameQualityGate] = None,
+        keyframes: Optional[KeyframeIndex] = None,
+    ) -> Iterator[Tuple[float, object, float]]:
+        """
+        按计划顺序读取多个时间点的帧，见 VideoInfoExtractor._read_frames_sequential
+
+        Yields:
+            Tuple[float, numpy.ndarray, float]: (时间点, 帧数据, 实际取帧的偏移)
+        """
+        return self.extractor._read_frames_sequential(
+            self.decoder, times, job, quality_gate, keyframes
+        )
+
+    def generate_thumbnails(
+        self,
+        times: List[Union[float, int]],
+        output_dir: str = None,
+        prefix: str = "thumbnail",
+        format: str = "jpg",
+        quality: int = 95,
+        job: Optional[Job] = None,
+        on_frame: Optional[Callable] = None,
+        quality_gate: Optional[FrameQualityGate] = None,
+        keyframes: Optional[KeyframeIndex] = None,
+    ) -> Dict[float, str]:
+        """
+        在指定时间点生成多个缩略图
+
+        参数与返回值见 VideoInfoExtractor.generate_thumbnails_at_times
+        """
+        # 验证时间点
+        valid_times = self.validate_times(times)
+
+        if job is not None:
+            job.set_total(len(valid_times))
+
+        # 准备输出目录
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        # 生成缩略图
+        results = {}
+        for time_point, frame, offset in self.read_frames(
+            valid_times, job, quality_gate, keyframes
+        ):
+            time_point += offset
+            if frame is not None:
+                if on_frame:
+                    on_frame(time_point, frame)
+
+                if output_dir:
+                    # 生成文件名
+                    time_str = f"{time_point:.1f}".replace(".", "_")
+                    filename = f"{prefix}_{time_str}s.{format}"
+                    output_path = output_dir / filename
+
+                    logger.debug(f"Generate thumbnails with [{str(output_path)}]")
+
+                    # 保存图像
+                    data = self.extractor._encode_image(frame, format, quality)
+                    with span("write"):
+                        data.tofile(str(output_path))
+
+                    results[time_point] = str(output_path)
                 else:
-                    logging.warning(f"警告: 无法在时间点 {time_point}s 读取帧")
-                    results[time_point] = None
-
-                self._generate_thumbnails_at_times_progress = (
-                    valid_times.index(time_point) + 1
-                ) / len(valid_times)
-                logger.debug(
-                    f"Generate thumbnails progress [{str(self._generate_thumbnails_at_times_progress)}]"
+                    # 如果不保存文件，只返回图像数据（这里简化处理，实际可能需要调整）
+                    results[time_point] = frame
+            else:
+                results[time_point] = None
+
+            if job is not None:
+                output = results[time_point]
+                job.advance(
+                    ThumbnailItem(
+                        time=time_point,
+                        path=output if isinstance(output, str) else None,
+                        offset=offset,
+                    )
                 )
+                logger.debug(f"Generate thumbnails progress [{job.progress}]")
 
-            return results
+        return results
 
-        finally:
-            cap.release()
+    def encode_thumbnails(
+        self,
+        times: List[Union[float, int]],
+        format: str = "jpg",
+        quality: int = 95,
+        job: Optional[Job] = None,
+        on_frame: Optional[Callable] = None,
+        quality_gate: Optional[FrameQualityGate] = None,
+        keyframes: Optional[KeyframeIndex] = None,
+    ) -> Dict[float, bytes]:
+        """
+        在指定时间点生成多个缩略图，只编码不写文件
 
-    def get_generate_thumbnails_at_times_progress(self):
-        return self._generate_thumbnails_at_times_progress
+        参数与返回值见 VideoInfoExtractor.encode_thumbnails_at_times
+        """
+        valid_times = self.validate_times(times)
+
+        if job is not None:
+            job.set_total(len(valid_times))
+
+        results = {}
+        for time_point, frame, offset in self.read_frames(
+            valid_times, job, quality_gate, keyframes
+        ):
+            time_point += offset
+            data = None
+            if frame is not None:
+                if on_frame:
+                    on_frame(time_point, frame)
+                data = self.extractor._encode_image(frame, format, quality).tobytes()
+            results[time_point] = data
+
+            if job is not None:
+                job.advance(
+                    ThumbnailItem(time=time_point, path=None, data=data, offset=offset)
+                )
+
+        return results
+
+    def poster_frame(
+        self,
+        fraction: float = POSTER_FRACTION,
+        quality_gate: Optional[FrameQualityGate] = None,
+    ):
+        """
+        读取封面帧
+
+        Args:
+            fraction (float): 取帧位置占视频时长的比例
+            quality_gate (FrameQualityGate, optional): 帧质量检查，不合格时在附近重试
+
+        Returns:
+            numpy.ndarray: 帧数据，读取失败返回None
+        """
+        time_point = round(self.info.duration * fraction, 2)
+        for _, frame, _ in self.read_frames([time_point], quality_gate=quality_gate):
+            return frame
+        return None
+
+    def close(self):
+        """关闭会话，将解码器归还解码器池"""
+        if self.decoder is not None:
+            self.extractor.release_decoder(self.decoder)
+            self.decoder = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 # 使用示例和测试
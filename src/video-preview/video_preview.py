@@ -1,31 +1,87 @@
-import _thread
 import logging
 import os
 
-from core.preview_image import PreviewImage
+from core.context import get_setting
+from gui.base.prefetcher import Prefetcher
 from gui.base.progress_viewer import ProgressViewer
-from gui.file.file_browser import FileBrowser, get_home_directory
+from gui.base.selection_pipeline import SelectionPipeline
+from gui.base.setting_viewer import SettingViewer
 from gui.file.file_list import FileTreeViewer
-from gui.image.image_viewer import ImagesViewer, Thumbnail
+from gui.image.image_viewer import ImagesViewer, describe_image
+from gui.image.scrub_preview import ScrubPreview
+from gui.image.thumbnail_strip import ThumbnailStrip, thumbnail_atlas_cache
 from kivy.app import App
+from kivy.clock import Clock, mainthread
 from kivy.core.window import Window
 from kivy.factory import Factory
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.popup import Popup
-from utils.file_util import get_video_tree
-from utils.video_meta_util import VideoInfoExtractor
+from utils.file_util import get_video_tree, iter_tree_files
+from utils.trace_util import traced, tracer
 
 Window.size = (1366, 768)
 
 
 class Root(FloatLayout):
-    videoInfoExtractor = VideoInfoExtractor()
+    videoInfoExtractor = None
     folder = None
     choose_video_info = None
     choose_video_meta_info = None
     video_treeview = None
     generate_thumbnails_array = []
-    video_thumbnails_widget_list = []
+    # 拖动预览模式：悬停在播放进度条上时显示预览帧
+    scrub_mode = True
+    scrub_preview = None
+    idle_scheduler = None
+    stall_detector = None
+    # 选择视频后预取前后相邻视频的数量，以及每个视频预热的缩略图数量
+    prefetch_neighbors = 2
+    prefetch_thumbnails = 10
+
+    def __init__(self, **kwargs):
+        super(Root, self).__init__(**kwargs)
+        # 视频选择管道：防抖 + 后台加载视频信息与缩略图
+        self.selection_pipeline = SelectionPipeline(
+            loader=self.load_video_file,
+            on_loaded=self.video_file_loaded,
+            on_failed=self.video_file_load_failed,
+        )
+        # 相邻视频预取：前台加载或生成缩略图时暂停
+        self.prefetcher = Prefetcher(
+            loader=self.prefetch_video_file,
+            is_busy=lambda: self.selection_pipeline.busy,
+        )
+        # 视频处理模块（cv2、numpy）与后台服务在首帧绘制之后才加载，不拖慢启动
+        Window.bind(on_flip=self._on_first_flip)
+
+    def on_kv_post(self, base_widget):
+        # Root 由 kv 根规则创建，ids 在 __init__ 之后才填充
+        super(Root, self).on_kv_post(base_widget)
+        # 缩略图条使用纹理图集，减少纹理切换并合并上传
+        if get_setting("thumbnail.atlas", False):
+            self.ids.video_thumbnails_strip.texture_cache = thumbnail_atlas_cache
+
+    def _on_first_flip(self, window):
+        window.unbind(on_flip=self._on_first_flip)
+        Clock.schedule_once(self.start_background_services)
+
+    def start_background_services(self, dt):
+        # 视频处理模块导入较慢，首帧之后才导入；各处理函数中的导入此后无开销
+        from core.preview_image import PreviewImage
+        from gui.base.idle_scheduler import IdleScheduler
+        from gui.base.stall_detector import StallDetector
+
+        self.videoInfoExtractor = PreviewImage.create_extractor()
+        # 界面空闲时在后台为打开目录中的视频生成缩略图
+        if get_setting("idle.enabled", False):
+            self.idle_scheduler = IdleScheduler(
+                self.videoInfoExtractor, delay=get_setting("idle.delay", 60)
+            )
+        # 界面主线程卡顿检测：记录帧耗时，慢帧时采样主线程调用栈
+        if get_setting("stall.enabled", False):
+            self.stall_detector = StallDetector(
+                threshold=get_setting("stall.threshold", 100) / 1000
+            )
 
     def dismiss_popup(self):
         self._popup.dismiss()
@@ -34,6 +90,9 @@ class Root(FloatLayout):
         self._popup.dismiss()
 
     def show_choose_folder(self):
+        # 文件浏览器只在使用时才导入
+        from gui.file.file_browser import FileBrowser, get_home_directory
+
         user_path = os.path.join(get_home_directory(), "Documents")
         browser = FileBrowser(
             select_string="选择",
@@ -48,9 +107,38 @@ class Root(FloatLayout):
         self._popup = Popup(title="选择文件夹", content=browser, size_hint=(0.9, 0.9))
         self._popup.open()
 
+    def show_folder_gallery(self):
+        # 文件夹画廊：网格显示当前文件夹中每个视频的封面
+        if self.video_treeview is None:
+            logging.warning(f"Please choose a folder first !")
+            return
+
+        from gui.image.video_gallery import VideoGallery
+
+        gallery = VideoGallery(
+            extractor=self.videoInfoExtractor,
+            files=list(iter_tree_files(self.video_viewer.tree_data)),
+        )
+        gallery.bind(on_video_selected=self.choose_gallery_video)
+
+        self._popup = Popup(title="文件夹画廊", content=gallery, size_hint=(0.9, 0.9))
+        # 关闭画廊时取消未完成的封面生成
+        self._popup.bind(on_dismiss=lambda popup: gallery.release())
+        self._popup.open()
+
+    def choose_gallery_video(self, instance, file_info):
+        self.dismiss_popup()
+        self.choose_video_file(file_info)
+
     def show_setting(self):
-        logging.info(f"pop setting")
+        # 设置界面：显示界面帧耗时统计
+        viewer = SettingViewer(stall_detector=self.stall_detector)
+        viewer.bind(on_canceled=self.dismiss_popup)
 
+        self._popup = Popup(title="设置", content=viewer, size_hint=(0.6, 0.7))
+        self._popup.open()
+
+    @traced()
     def show_preview_image(self, instance):
         # 显示视频缩略图
         viewer = ImagesViewer(
@@ -59,6 +147,8 @@ class Root(FloatLayout):
         viewer.bind(on_canceled=self.dismiss_popup)
 
         self._popup = Popup(title="预览图片", content=viewer, size_hint=(0.9, 0.9))
+        # 关闭预览时释放纹理
+        self._popup.bind(on_dismiss=lambda popup: viewer.release())
         self._popup.open()
 
     def choose_folder(self, instance):
@@ -72,6 +162,7 @@ class Root(FloatLayout):
         self.dismiss_popup()
         self.load_video_tree(self.folder)
 
+    @traced()
     def load_video_tree(self, path):
         video_tree_data = get_video_tree(path)
         self.video_viewer = FileTreeViewer(
@@ -81,24 +172,85 @@ class Root(FloatLayout):
         )
         self.video_treeview = self.video_viewer.get_treeview()
         self.ids.file_tree_layout_view.add_widget(self.video_treeview)
+        if self.idle_scheduler is not None:
+            self.idle_scheduler.set_videos(
+                [info.path for info in iter_tree_files(video_tree_data)]
+            )
 
+    @traced()
     def choose_video_file(self, file_info):
         logging.info(f"Video file: [{file_info.path}] has been chosen !")
         if file_info.type == "directory":
             return
 
+        if self.choose_video_info is not None and (
+            self.choose_video_info.path == file_info.path
+        ):
+            return
+
         self.choose_video_info = file_info
+        self.choose_video_meta_info = None
         self.ids.video_player.state = "stop"
-        self.show_video_info(file_info)
+        self.generate_thumbnails_array = []
+        self.render_thumbnails(self.generate_thumbnails_array)
+        self.show_scrub_strip(None)
+        # 防抖后在后台加载，同时取消上一个视频未完成的任务
+        self.selection_pipeline.select(file_info)
+        # 用户接下来多半会选择相邻的视频，预取其视频信息与缩略图；
+        # 先取消上一次选择未完成的缩略图预取
+        self.ids.video_thumbnails_strip.cancel_prefetch()
+        self.prefetcher.prefetch(
+            self.video_viewer.get_neighbors(file_info.path, self.prefetch_neighbors)
+        )
 
+    @traced()
+    def load_video_file(self, job, file_info):
+        # 在后台线程执行：读取视频信息与已有缩略图
+        from core.preview_image import PreviewImage
+        from core.scrub_strip import ScrubStrip
+
+        video_meta_info = PreviewImage.get_video_info(
+            self.videoInfoExtractor, file_info.path
+        )
+        job.raise_if_cancelled()
         thumbnails_array = PreviewImage.load_video_thumbnails(file_info.path)
+        job.raise_if_cancelled()
+        scrub_strip = ScrubStrip.load(file_info.path) if self.scrub_mode else None
+        return video_meta_info, thumbnails_array, scrub_strip
+
+    @traced()
+    def prefetch_video_file(self, job, file_info):
+        # 在预取线程执行：预热元数据索引（视频信息）与缩略图纹理缓存
+        from core.preview_image import PreviewImage
+
+        PreviewImage.get_video_info(self.videoInfoExtractor, file_info.path)
+        job.raise_if_cancelled()
+        thumbnails_array = PreviewImage.load_video_thumbnails(file_info.path)
+        self.prefetch_thumbnails_texture(
+            job, thumbnails_array[: self.prefetch_thumbnails]
+        )
+
+    @mainthread
+    def prefetch_thumbnails_texture(self, job, thumbnails_array):
+        # 预取已被取消（已选择其它视频）时不再提交
+        if job.cancelled:
+            return
+        self.ids.video_thumbnails_strip.prefetch(thumbnails_array)
+
+    @traced()
+    def video_file_loaded(self, file_info, result):
+        video_meta_info, thumbnails_array, scrub_strip = result
+        self.show_video_info(file_info, video_meta_info)
+
         self.generate_thumbnails_array = thumbnails_array
         self.render_thumbnails(thumbnails_array)
+        self.show_scrub_strip(scrub_strip)
 
-    def show_video_info(self, file_info):
-        self.choose_video_meta_info = self.videoInfoExtractor.get_video_info(
-            file_info.path
-        )
+    def video_file_load_failed(self, file_info, exception):
+        logging.error(f"Load video file [{file_info.path}] failed: {exception}")
+
+    def show_video_info(self, file_info, video_meta_info):
+        self.choose_video_meta_info = video_meta_info
 
         logging.info(f"video_meta_info: {self.choose_video_meta_info}")
         self.ids.show_video_name.text = self.choose_video_meta_info.filename
@@ -121,63 +273,123 @@ class Root(FloatLayout):
             logging.warning(f"Please choose a video file first !")
             return
 
+        if self.choose_video_meta_info is None:
+            logging.warning(f"Video file is still loading, please wait !")
+            return
+
         self.ids.video_player.state = "stop"
-        self.show_generate_thumbnails_process()
-        _thread.start_new_thread(self.do_generate_thumbnail, ())
 
-    def do_generate_thumbnail(self):
-        self.generate_thumbnails_array = PreviewImage.generate_thumbnails(
-            self.videoInfoExtractor, self.choose_video_meta_info
+        # 清空缩略图列表，生成过程中逐张追加
+        self.generate_thumbnails_array = []
+        self.render_thumbnails(self.generate_thumbnails_array)
+
+        job = self.do_generate_thumbnail(self.choose_video_meta_info)
+        # 切换到其它视频时取消生成
+        self.selection_pipeline.attach(job)
+
+        if self.scrub_mode:
+            # 先释放当前预览条的内存映射，Windows 下文件被映射时无法替换
+            self.show_scrub_strip(None)
+            self.selection_pipeline.attach(
+                self.do_generate_scrub_strip(self.choose_video_meta_info)
+            )
+
+    def do_generate_thumbnail(self, video_meta_info):
+        # 每个视频一个独立任务，可同时生成多个视频的预览图
+        from core.preview_image import PreviewImage
+
+        progress_viewer = self.show_generate_thumbnails_process()
+
+        def on_progress(job, progress):
+            progress_viewer.update_progress_value(progress)
+
+        def on_item(job, item):
+            thumbnail = item.path if item.path is not None else item.data
+            self.video_thumbnail_generated(video_meta_info, thumbnail)
+
+        def on_complete(job):
+            if job.cancelled:
+                logging.info(f"Generate thumbnails cancelled: {video_meta_info.path}")
+            elif job.exception() is not None:
+                logging.error(f"Generate thumbnails failed: {job.exception()}")
+            progress_viewer.complete()
+
+        return PreviewImage.submit_generate_thumbnails(
+            self.videoInfoExtractor,
+            video_meta_info,
+            on_item=on_item,
+            on_progress=on_progress,
+            on_complete=on_complete,
         )
 
+    def do_generate_scrub_strip(self, video_meta_info):
+        # 后台生成拖动预览条，完成后加载到播放器
+        from core.scrub_strip import ScrubStrip
+
+        def on_complete(job):
+            if job.exception() is None:
+                self.video_scrub_strip_generated(video_meta_info)
+
+        return ScrubStrip.submit_generate(
+            self.videoInfoExtractor, video_meta_info, on_complete=on_complete
+        )
+
+    @mainthread
+    def video_scrub_strip_generated(self, video_meta_info):
+        from core.scrub_strip import ScrubStrip
+
+        if video_meta_info is self.choose_video_meta_info:
+            self.show_scrub_strip(ScrubStrip.load(video_meta_info.path))
+
+    def show_scrub_strip(self, scrub_strip):
+        if self.scrub_preview is None:
+            if scrub_strip is None:
+                return
+            self.scrub_preview = ScrubPreview(video_player=self.ids.video_player)
+        self.scrub_preview.strip = scrub_strip
+
     def show_generate_thumbnails_process(self):
-        self.progress_viewer = ProgressViewer(
+        return ProgressViewer(
             title_text="生成预览图进度",
-            on_update_value=self.update_generate_progress,
             on_complete=self.video_thumbnails_generate_complete,
         )
 
-    def update_generate_progress(self):
-        # 生成预览图进度更新
-        progress = self.videoInfoExtractor.get_generate_thumbnails_at_times_progress()
-        logging.debug(f" update_generate_progress: {progress}")
-        self.progress_viewer.update_progress_value(progress)
+    @mainthread
+    def video_thumbnail_generated(self, video_meta_info, thumbnail):
+        # 已切换到其它视频时，丢弃旧视频的缩略图
+        if thumbnail is None or video_meta_info is not self.choose_video_meta_info:
+            return
+
+        self.generate_thumbnails_array.append(thumbnail)
+        self.add_thumbnail(thumbnail)
 
     def video_thumbnails_generate_complete(self):
-        self.render_thumbnails(self.generate_thumbnails_array)
+        logging.info(f"Generate thumbnails complete !")
 
+    @traced()
     def render_thumbnails(self, thumbnails_array):
-        self.ids.video_thumbnails_layout.bind(
-            minimum_width=self.ids.video_thumbnails_layout.setter("width")
-        )
+        # 缩略图条只复用可见区域的控件，图片在后台解码
+        self.ids.video_thumbnails_strip.set_images(thumbnails_array)
 
-        # 清理已经加载的缩略图列表
-        for thumbnail_image in self.video_thumbnails_widget_list:
-            self.ids.video_thumbnails_layout.remove_widget(thumbnail_image)
-
-        self.video_thumbnails_widget_list.clear()
-
-        # 重新加载的缩略图列表
-        index = 0
-        for thumbnail in thumbnails_array:
-            logging.debug(f"  add thumbnail: {thumbnail}")
-            thumbnail_image = Thumbnail(
-                index=index,
-                source=thumbnail,
-                size_hint=(None, 1),
-                on_release=self.show_preview_image,
-            )
-            self.video_thumbnails_widget_list.append(thumbnail_image)
-            self.ids.video_thumbnails_layout.add_widget(thumbnail_image)
-            index += 1
+    def add_thumbnail(self, thumbnail):
+        logging.debug(f"  add thumbnail: {describe_image(thumbnail)}")
+        self.ids.video_thumbnails_strip.add_image(thumbnail)
 
 
 class VideoPreviewApp(App):
-    pass
+    def on_stop(self):
+        # 输出分阶段耗时统计并导出 trace 文件（开启追踪时）
+        tracer.finish()
+        # 输出界面帧耗时统计（开启卡顿检测时）
+        stall_detector = self.root.stall_detector
+        if stall_detector is not None:
+            stall_detector.stop()
+            logging.info(f"Frame stats: {stall_detector.format_summary()}")
 
 
 Factory.register("Root", cls=Root)
 Factory.register("ImagesViewer", cls=ImagesViewer)
+Factory.register("ThumbnailStrip", cls=ThumbnailStrip)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 与应用相同，以 src/video-preview 为导入根目录
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "video-preview")
+)
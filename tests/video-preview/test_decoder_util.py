@@ -0,0 +1,162 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+from utils import decoder_util
+from utils.decoder_util import DecoderPool, DecoderSelector, OpenCVDecoder
+
+
+def write_video(path, frames=10):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    if not writer.isOpened():
+        pytest.skip("MJPG encoder unavailable")
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def videos(tmp_path):
+    return [write_video(tmp_path / f"video{i}.avi") for i in range(3)]
+
+
+@pytest.fixture
+def pool():
+    pool = DecoderPool(max_size=2, idle_seconds=60)
+    yield pool
+    pool.clear()
+
+
+# ---------- DecoderPool ----------
+
+
+def test_pool_reuses_released_decoder(pool, videos):
+    decoder = pool.acquire(videos[0])
+    assert isinstance(decoder, OpenCVDecoder)
+    assert len(pool) == 0
+    pool.release(decoder)
+    assert len(pool) == 1
+
+    assert pool.acquire(videos[0]) is decoder
+    assert len(pool) == 0
+
+
+def test_pool_lends_decoder_exclusively(pool, videos):
+    first = pool.acquire(videos[0])
+    second = pool.acquire(videos[0])
+    assert first is not second
+    pool.release(first)
+    pool.release(second)
+    assert len(pool) == 2
+
+
+def test_pool_reopens_modified_file(pool, videos):
+    decoder = pool.acquire(videos[0])
+    pool.release(decoder)
+
+    # 修改时间与大小变化后，旧的解码器被关闭，不再复用
+    write_video(videos[0], frames=12)
+    stat_result = os.stat(videos[0])
+    os.utime(videos[0], ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+    reopened = pool.acquire(videos[0])
+    assert reopened is not decoder
+    assert reopened.frame_count == 12
+    assert len(pool) == 0
+
+
+def test_pool_evicts_least_recently_used(pool, videos):
+    decoders = [pool.acquire(path) for path in videos]
+    for decoder in decoders:
+        pool.release(decoder)
+    assert len(pool) == 2
+
+    # 最早归还的被关闭，其余两个仍可复用
+    assert pool.acquire(videos[0]) is not decoders[0]
+    assert pool.acquire(videos[1]) is decoders[1]
+    assert pool.acquire(videos[2]) is decoders[2]
+
+
+def test_pool_evicts_idle_decoders(videos):
+    pool = DecoderPool(idle_seconds=0)
+    pool.release(pool.acquire(videos[0]))
+    pool.evict_idle()
+    assert len(pool) == 0
+    pool.clear()
+
+
+def test_pool_missing_file_raises_value_error(pool, tmp_path):
+    with pytest.raises(ValueError):
+        pool.acquire(str(tmp_path / "missing.avi"))
+
+
+# ---------- DecoderSelector ----------
+
+
+@pytest.fixture
+def two_backends(monkeypatch):
+    monkeypatch.setattr(
+        decoder_util, "get_available_backends", lambda: ["opencv", "pyav"]
+    )
+
+
+def fake_benchmark(monkeypatch, timings):
+    calls = []
+
+    def benchmark(self, video_path, backends=None):
+        calls.append(video_path)
+        return dict(timings)
+
+    monkeypatch.setattr(DecoderSelector, "benchmark", benchmark)
+    return calls
+
+
+def test_selector_benchmarks_once_per_codec(tmp_path, monkeypatch, two_backends):
+    calls = fake_benchmark(monkeypatch, {"opencv": 0.2, "pyav": 0.1})
+    cache_file = str(tmp_path / "benchmark.json")
+    selector = DecoderSelector(cache_file)
+
+    assert selector.select("a.mp4", "avc1") == "pyav"
+    assert selector.select("b.mp4", "avc1") == "pyav"
+    assert calls == ["a.mp4"]
+    with open(cache_file, encoding="utf-8") as f:
+        assert json.load(f)["avc1"]["backend"] == "pyav"
+
+    # 结果文件在下次启动时复用
+    assert DecoderSelector(cache_file).select("c.mp4", "avc1") == "pyav"
+    assert calls == ["a.mp4"]
+
+
+def test_selector_rebenchmarks_unavailable_backend(tmp_path, monkeypatch, two_backends):
+    cache_file = tmp_path / "benchmark.json"
+    cache_file.write_text(json.dumps({"avc1": {"backend": "gone", "timings": {}}}))
+    calls = fake_benchmark(monkeypatch, {"opencv": 0.1, "pyav": 0.2})
+
+    assert DecoderSelector(str(cache_file)).select("a.mp4", "avc1") == "opencv"
+    assert calls == ["a.mp4"]
+
+
+def test_selector_falls_back_to_opencv(monkeypatch, two_backends):
+    fake_benchmark(monkeypatch, {})
+    assert DecoderSelector().select("a.mp4", "avc1") == "opencv"
+
+
+def test_selector_with_single_backend_skips_benchmark(monkeypatch):
+    monkeypatch.setattr(decoder_util, "get_available_backends", lambda: ["opencv"])
+    calls = fake_benchmark(monkeypatch, {"pyav": 0.1})
+    assert DecoderSelector().select("a.mp4", "avc1") == "opencv"
+    assert calls == []
+
+
+def test_selector_ignores_broken_cache_file(tmp_path):
+    cache_file = tmp_path / "benchmark.json"
+    cache_file.write_text("{broken")
+    assert DecoderSelector(str(cache_file))._results == {}
+
+
+def test_benchmark_times_available_backends(videos):
+    timings = DecoderSelector().benchmark(videos[0])
+    assert set(timings) == set(decoder_util.get_available_backends())
+    assert all(seconds >= 0 for seconds in timings.values())
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from core.model import FileInfo
+from utils.duplicate_util import DuplicateFileFinder
+
+PARTIAL_SIZE = 100
+
+
+def make_file(folder, name, data):
+    path = folder / name
+    path.write_bytes(data)
+    return FileInfo(name, str(path), "file", "bin", len(data), "", 0, "")
+
+
+@pytest.fixture
+def finder(monkeypatch):
+    # 记录每一级哈希实际读取的文件
+    finder = DuplicateFileFinder(partial_size=PARTIAL_SIZE, max_workers=2)
+    finder.calls = {"partial": [], "full": []}
+    for stage, hash_func in (
+        ("partial", finder.partial_hash),
+        ("full", finder.full_hash),
+    ):
+
+        def counted(file_info, stage=stage, hash_func=hash_func):
+            finder.calls[stage].append(file_info.name)
+            return hash_func(file_info)
+
+        monkeypatch.setattr(finder, f"{stage}_hash", counted)
+    return finder
+
+
+def names(groups):
+    return sorted(sorted(file_info.name for file_info in group) for group in groups)
+
+
+def test_unique_sizes_are_never_read(finder, tmp_path):
+    files = [
+        make_file(tmp_path, "a", b"a" * 10),
+        make_file(tmp_path, "b", b"a" * 11),
+        make_file(tmp_path, "empty1", b""),
+        make_file(tmp_path, "empty2", b""),
+    ]
+    assert finder.find_duplicates(files) == []
+    assert finder.calls == {"partial": [], "full": []}
+
+
+def test_partial_hash_covers_small_files(finder, tmp_path):
+    data = os.urandom(2 * PARTIAL_SIZE)
+    files = [
+        make_file(tmp_path, "a", data),
+        make_file(tmp_path, "a_copy", data),
+        make_file(tmp_path, "b", data[:-1] + b"\0"),
+    ]
+    # 首尾块已覆盖整个文件，不再计算完整哈希
+    assert names(finder.find_duplicates(files)) == [["a", "a_copy"]]
+    assert sorted(finder.calls["partial"]) == ["a", "a_copy", "b"]
+    assert finder.calls["full"] == []
+
+
+def test_full_hash_only_for_partial_hash_collisions(finder, tmp_path):
+    data = bytearray(os.urandom(1000))
+    head_changed = bytearray(data)
+    head_changed[0] ^= 0xFF
+    middle_changed = bytearray(data)
+    middle_changed[500] ^= 0xFF
+    files = [
+        make_file(tmp_path, "a", bytes(data)),
+        make_file(tmp_path, "a_copy", bytes(data)),
+        make_file(tmp_path, "head", bytes(head_changed)),
+        make_file(tmp_path, "middle", bytes(middle_changed)),
+        make_file(tmp_path, "other_size", bytes(data[:999])),
+    ]
+
+    assert names(finder.find_duplicates(files)) == [["a", "a_copy"]]
+    assert sorted(finder.calls["partial"]) == ["a", "a_copy", "head", "middle"]
+    # 仅中间字节不同的文件部分哈希相同，需要完整哈希区分
+    assert sorted(finder.calls["full"]) == ["a", "a_copy", "middle"]
+
+
+def test_unreadable_file_is_skipped(finder, tmp_path):
+    data = os.urandom(50)
+    files = [
+        make_file(tmp_path, "a", data),
+        make_file(tmp_path, "a_copy", data),
+        make_file(tmp_path, "b", data),
+    ]
+    os.remove(files[2].path)
+    assert names(finder.find_duplicates(files)) == [["a", "a_copy"]]
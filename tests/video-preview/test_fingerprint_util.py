@@ -0,0 +1,83 @@
+import os
+import shutil
+
+from utils.fingerprint_util import FileFingerprint, get_file_fingerprint
+
+SIZE = 1024 * 1024
+
+
+def write_file(path, data):
+    path.write_bytes(bytes(data))
+    return str(path)
+
+
+def make_data(size=SIZE):
+    return bytearray(os.urandom(size))
+
+
+def test_fingerprint_is_stable_across_copy_and_rename(tmp_path):
+    path = write_file(tmp_path / "a.mp4", make_data())
+    fingerprint = FileFingerprint.compute(path)
+    assert fingerprint.startswith(f"{SIZE:x}-")
+    assert FileFingerprint.compute(path) == fingerprint
+
+    copied = shutil.copy(path, tmp_path / "copy.mp4")
+    renamed = str(tmp_path / "renamed.mp4")
+    os.replace(path, renamed)
+    assert FileFingerprint.compute(copied) == fingerprint
+    assert get_file_fingerprint(renamed) == fingerprint
+
+
+def test_fingerprint_covers_sampled_blocks(tmp_path):
+    data = make_data()
+    fingerprint = FileFingerprint.compute(write_file(tmp_path / "a", data))
+    offsets = FileFingerprint._sample_offsets(SIZE)
+    assert len(offsets) == FileFingerprint.SAMPLE_COUNT
+    assert offsets[0] == 0 and offsets[-1] == SIZE - FileFingerprint.SAMPLE_SIZE
+
+    for offset in offsets:
+        changed = bytearray(data)
+        changed[offset + FileFingerprint.SAMPLE_SIZE // 2] ^= 0xFF
+        path = write_file(tmp_path / f"changed_{offset}", changed)
+        assert FileFingerprint.compute(path) != fingerprint
+
+    # 采样块之外的修改不影响指纹
+    changed = bytearray(data)
+    changed[FileFingerprint.SAMPLE_SIZE + 1] ^= 0xFF
+    path = write_file(tmp_path / "unsampled", changed)
+    assert FileFingerprint.compute(path) == fingerprint
+
+    # 大小不同的文件指纹不同
+    path = write_file(tmp_path / "longer", data + b"\0")
+    assert FileFingerprint.compute(path) != fingerprint
+
+
+def test_small_file_is_read_once(tmp_path):
+    assert FileFingerprint._sample_offsets(0) == [0]
+    assert FileFingerprint._sample_offsets(FileFingerprint.SAMPLE_SIZE) == [0]
+
+    data = make_data(100)
+    fingerprint = FileFingerprint.compute(write_file(tmp_path / "a", data))
+    data[50] ^= 0xFF
+    assert FileFingerprint.compute(write_file(tmp_path / "b", data)) != fingerprint
+
+
+def test_get_recomputes_after_modification(tmp_path, monkeypatch):
+    path = write_file(tmp_path / "a", make_data(1000))
+    calls = []
+    compute = FileFingerprint.compute
+
+    def counted(path, size=None):
+        calls.append(path)
+        return compute(path, size)
+
+    monkeypatch.setattr(FileFingerprint, "compute", staticmethod(counted))
+    fingerprint = FileFingerprint.get(path)
+    assert FileFingerprint.get(path) == fingerprint
+    assert len(calls) == 1
+
+    write_file(tmp_path / "a", make_data(1000))
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+    assert FileFingerprint.get(path) != fingerprint
+    assert len(calls) == 2
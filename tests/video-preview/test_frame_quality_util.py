@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+import pytest
+from utils.frame_quality_util import FrameQualityGate, FrameScore
+
+HEIGHT, WIDTH = 90, 160
+
+
+def checkerboard(low=40, high=200, cell=8, width=WIDTH, height=HEIGHT):
+    rows = (np.arange(height) // cell)[:, None]
+    cols = (np.arange(width) // cell)[None, :]
+    gray = np.where((rows + cols) % 2 == 0, low, high).astype(np.uint8)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+
+def solid(value):
+    return np.full((HEIGHT, WIDTH, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def gate():
+    return FrameQualityGate()
+
+
+def test_detailed_frame_is_accepted(gate):
+    score = gate.score(checkerboard())
+    assert score.luma == pytest.approx(120, abs=1)
+    assert score.contrast == pytest.approx(80, abs=1)
+    assert gate.accepts(score)
+
+
+@pytest.mark.parametrize(
+    "frame, reason",
+    [
+        (solid(0), "black"),
+        (solid(255), "white"),
+        (solid(128), "flat"),
+        (checkerboard(low=0, high=20), "dark"),
+        (checkerboard(low=120, high=126), "low contrast"),
+        (cv2.GaussianBlur(checkerboard(cell=40), (0, 0), 12), "blurred"),
+    ],
+)
+def test_bad_frames_are_rejected(gate, frame, reason):
+    assert not gate.accepts(gate.score(frame)), reason
+
+
+def test_thresholds_are_inclusive(gate):
+    limits = FrameScore(
+        FrameQualityGate.MIN_LUMA,
+        FrameQualityGate.MIN_CONTRAST,
+        FrameQualityGate.MIN_SHARPNESS,
+    )
+    assert gate.accepts(limits)
+    assert gate.accepts(limits._replace(luma=FrameQualityGate.MAX_LUMA))
+    assert not gate.accepts(limits._replace(luma=FrameQualityGate.MIN_LUMA - 0.1))
+    assert not gate.accepts(limits._replace(luma=FrameQualityGate.MAX_LUMA + 0.1))
+    assert not gate.accepts(
+        limits._replace(contrast=FrameQualityGate.MIN_CONTRAST - 0.1)
+    )
+    assert not gate.accepts(
+        limits._replace(sharpness=FrameQualityGate.MIN_SHARPNESS - 0.1)
+    )
+
+
+def test_custom_thresholds(gate):
+    score = gate.score(checkerboard(low=0, high=20))
+    assert not gate.accepts(score)
+    assert FrameQualityGate(min_luma=0).accepts(score)
+
+
+def test_score_is_independent_of_input_size_and_channels(gate):
+    frame = checkerboard(cell=8)
+    large = cv2.resize(frame, (WIDTH * 4, HEIGHT * 4), interpolation=cv2.INTER_NEAREST)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    # 大图缩小到采样宽度后再评分
+    assert gate.score(large) == pytest.approx(gate.score(frame), rel=0.01)
+    assert gate.score(gray) == pytest.approx(gate.score(frame))
@@ -0,0 +1,81 @@
+import itertools
+
+import numpy as np
+import pytest
+from utils.image_hash_util import (
+    HASH_BITS,
+    HammingIndex,
+    group_pairs,
+    hamming_distance,
+    popcount,
+)
+
+
+def random_hashes(count, seed=0):
+    # 随机哈希加上翻转少量位的近似副本，覆盖最高位为 1 的情况
+    rng = np.random.default_rng(seed)
+    hashes = [int(h) for h in rng.integers(0, 2**63, size=count, dtype=np.uint64)]
+    hashes = [h | (1 << 63) if i % 2 else h for i, h in enumerate(hashes)]
+    for base in list(hashes[: count // 2]):
+        flipped = base
+        for bit in rng.choice(HASH_BITS, size=rng.integers(0, 12), replace=False):
+            flipped ^= 1 << int(bit)
+        hashes.append(flipped)
+    return hashes
+
+
+def brute_force_pairs(keys, hashes, max_distance):
+    return sorted(
+        (keys[a], keys[b], hamming_distance(hashes[a], hashes[b]))
+        for a, b in itertools.combinations(range(len(keys)), 2)
+        if hamming_distance(hashes[a], hashes[b]) <= max_distance
+    )
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 3, 6, 10, 32, 63, 64])
+def test_find_pairs_matches_brute_force(max_distance):
+    hashes = random_hashes(120)
+    # 完全相同的哈希
+    hashes += hashes[:5]
+    keys = [f"video{i}" for i in range(len(hashes))]
+    index = HammingIndex(keys, hashes)
+
+    pairs = sorted(index.find_pairs(max_distance))
+    assert pairs == brute_force_pairs(keys, hashes, max_distance)
+
+
+def test_query_matches_brute_force():
+    hashes = random_hashes(60, seed=1)
+    keys = list(range(len(hashes)))
+    index = HammingIndex(keys, hashes)
+    for hash_value in hashes[:10]:
+        expected = sorted(
+            (hamming_distance(hash_value, h), key)
+            for key, h in zip(keys, hashes)
+            if hamming_distance(hash_value, h) <= 8
+        )
+        result = index.query(hash_value, 8)
+        assert sorted((distance, key) for key, distance in result) == expected
+        assert [distance for _, distance in result] == sorted(
+            distance for _, distance in result
+        )
+
+
+def test_popcount_matches_python():
+    hashes = random_hashes(40, seed=2)
+    expected = [bin(h).count("1") for h in hashes]
+    assert popcount(np.array(hashes, dtype=np.uint64)).tolist() == expected
+
+
+def test_small_index():
+    assert HammingIndex([], []).find_pairs(5) == []
+    assert HammingIndex(["a"], [1]).find_pairs(5) == []
+    with pytest.raises(ValueError):
+        HammingIndex(["a", "b"], [1])
+
+
+def test_group_pairs():
+    pairs = [("a", "b", 1), ("b", "c", 2), ("d", "e", 0)]
+    groups = sorted(sorted(group) for group in group_pairs(pairs))
+    assert groups == [["a", "b", "c"], ["d", "e"]]
+    assert group_pairs([]) == []
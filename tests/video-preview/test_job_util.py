@@ -0,0 +1,78 @@
+import threading
+
+from utils.job_util import Job, JobExecutor
+
+
+def collect_progress(job):
+    values = []
+    job.bind(on_progress=lambda job, progress: values.append(progress))
+    return values
+
+
+def test_advance_reports_item_progress():
+    job = Job(total=4)
+    values = collect_progress(job)
+    for i in range(4):
+        job.advance(i)
+    assert values == [0.25, 0.5, 0.75, 1.0]
+    assert job.items == [0, 1, 2, 3]
+
+
+def test_progress_range_keeps_staged_progress_monotonic():
+    job = Job()
+    values = collect_progress(job)
+
+    # 扫描阶段占前一半
+    job.set_progress_range(0.0, 0.5)
+    for progress in (0.2, 0.6, 1.0):
+        job.report_progress(progress)
+    # 生成阶段接着扫描之后计算
+    job.set_progress_range(0.5)
+    job.set_total(2)
+    assert job.progress == 0.5
+    job.advance()
+    job.advance()
+
+    assert values == [0.1, 0.3, 0.5, 0.75, 1.0]
+    assert values == sorted(values)
+    assert job.progress == 1.0
+
+
+def test_on_complete_bound_after_completion_is_called_immediately():
+    job = Job()
+    job.set_result(1)
+    calls = []
+    job.bind(on_complete=calls.append)
+    assert calls == [job]
+
+
+def test_on_complete_bound_while_finishing_is_called_once():
+    # 结果已设置、完成事件尚未分发时订阅：只由分发调用一次
+    job = Job()
+    job.future.set_result(1)
+    calls = []
+    job.bind(on_complete=calls.append)
+    assert calls == []
+    job._dispatch_complete()
+    assert calls == [job]
+
+
+def test_on_complete_called_once_under_concurrent_bind():
+    # 单线程执行器：之后提交的空任务完成时，前一个任务的完成事件已分发完
+    executor = JobExecutor(max_workers=1)
+    try:
+        for _ in range(200):
+            job = Job()
+            calls = []
+            started = threading.Event()
+
+            def run(job):
+                started.set()
+
+            executor.submit(job, run)
+            started.wait()
+            job.bind(on_complete=calls.append)
+            executor.submit(Job(), lambda job: None).result(timeout=5)
+            assert calls == [job]
+    finally:
+        executor.shutdown()
@@ -0,0 +1,321 @@
+import io
+import struct
+
+import cv2
+import numpy as np
+import pytest
+from utils.decoder_util import PyAVDecoder, VideoDecoder
+from utils.keyframe_util import (
+    KeyframeIndex,
+    MkvKeyframeParser,
+    Mp4KeyframeParser,
+    read_container_index,
+)
+from utils.video_meta_util import VideoInfoExtractor
+
+# ---------- MP4 ----------
+
+
+def box(box_type: bytes, *children: bytes) -> bytes:
+    payload = b"".join(children)
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def full_box(box_type: bytes, *fields: bytes) -> bytes:
+    # 版本 0、标志 0
+    return box(box_type, b"\0\0\0\0", *fields)
+
+
+def table(box_type: bytes, rows, fmt: str = ">I") -> bytes:
+    entries = b"".join(struct.pack(fmt, *row) for row in rows)
+    return full_box(box_type, struct.pack(">I", len(rows)), entries)
+
+
+def mp4_track(handler: bytes, timescale: int = 25000, stts=None, stss=None):
+    stbl = [table(b"stts", stts if stts is not None else [(10, 1000)], ">II")]
+    if stss is not None:
+        stbl.append(table(b"stss", [(n,) for n in stss]))
+    # 两个块，每块 5 个采样，每个采样 100 字节
+    stbl.append(table(b"stsc", [(1, 5, 1)], ">III"))
+    stbl.append(full_box(b"stsz", struct.pack(">II", 100, 10)))
+    stbl.append(table(b"stco", [(1000,), (5000,)]))
+
+    mdhd = full_box(b"mdhd", struct.pack(">IIII", 0, 0, timescale, 0), b"\0" * 4)
+    hdlr = full_box(b"hdlr", b"\0" * 4, handler, b"\0" * 12)
+    return box(b"trak", box(b"mdia", mdhd, hdlr, box(b"minf", box(b"stbl", *stbl))))
+
+
+def mp4_file(*tracks: bytes, moov_first: bool = True) -> bytes:
+    ftyp = box(b"ftyp", b"isom", b"\0\0\0\0")
+    moov = box(b"moov", *tracks)
+    mdat = box(b"mdat", b"\0" * 64)
+    return ftyp + (moov + mdat if moov_first else mdat + moov)
+
+
+def parse_mp4(data: bytes):
+    return Mp4KeyframeParser().parse(io.BytesIO(data))
+
+
+def test_mp4_sync_samples_with_offsets():
+    index = parse_mp4(mp4_file(mp4_track(b"vide", stss=[1, 6])))
+    assert index.source == "mp4"
+    assert index.times == pytest.approx([0.0, 0.2])
+    assert index.offsets == [1000, 5000]
+
+
+def test_mp4_moov_after_mdat():
+    index = parse_mp4(mp4_file(mp4_track(b"vide", stss=[1, 6]), moov_first=False))
+    assert index.times == pytest.approx([0.0, 0.2])
+
+
+def test_mp4_skips_audio_track():
+    data = mp4_file(mp4_track(b"soun", stss=[1]), mp4_track(b"vide", stss=[3]))
+    assert parse_mp4(data).times == pytest.approx([0.08])
+
+
+def test_mp4_without_stss_is_all_keyframes():
+    index = parse_mp4(mp4_file(mp4_track(b"vide")))
+    assert index.all_keyframes
+    assert index.frame_before(7, 25.0) == 7
+
+
+def test_mp4_empty_sample_table_returns_none():
+    # 分片 MP4：moov 中的采样表为空
+    assert parse_mp4(mp4_file(mp4_track(b"vide", stts=[], stss=[]))) is None
+
+
+def test_mp4_without_moov_returns_none():
+    assert parse_mp4(box(b"ftyp", b"isom") + box(b"mdat", b"\0" * 16)) is None
+
+
+def test_mp4_invalid_box_size_raises():
+    data = box(b"ftyp", b"isom") + struct.pack(">I4s", 4, b"moov")
+    with pytest.raises(ValueError):
+        parse_mp4(data)
+
+
+# ---------- MKV ----------
+
+P = MkvKeyframeParser
+
+
+def element(element_id: int, *children: bytes) -> bytes:
+    payload = b"".join(children)
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    # 8 字节的大小字段
+    return id_bytes + b"\x01" + len(payload).to_bytes(7, "big") + payload
+
+
+def uint(element_id: int, value: int) -> bytes:
+    return element(
+        element_id, value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+    )
+
+
+def cue_point(time: int, *positions) -> bytes:
+    return element(
+        P.CUE_POINT,
+        uint(P.CUE_TIME, time),
+        *(
+            element(
+                P.CUE_TRACK_POSITIONS,
+                uint(P.CUE_TRACK, track),
+                uint(P.CUE_CLUSTER_POSITION, position),
+            )
+            for track, position in positions
+        ),
+    )
+
+
+INFO = element(P.INFO, uint(P.TIMECODE_SCALE, 1000000))
+TRACKS = element(
+    P.TRACKS,
+    element(P.TRACK_ENTRY, uint(P.TRACK_NUMBER, 1), uint(P.TRACK_TYPE, 2)),
+    element(P.TRACK_ENTRY, uint(P.TRACK_NUMBER, 2), uint(P.TRACK_TYPE, 1)),
+)
+CUES = element(
+    P.CUES,
+    cue_point(2000, (1, 300), (2, 400)),
+    cue_point(0, (2, 100)),
+)
+EBML_HEADER = element(0x1A45DFA3, uint(0x4282, 1))
+# Segment 数据的起始位置：EBML 头 + Segment ID（4 字节）+ 大小（8 字节）
+SEGMENT_START = len(EBML_HEADER) + 12
+
+
+def mkv_file(*children: bytes) -> bytes:
+    return EBML_HEADER + element(P.SEGMENT, *children)
+
+
+def parse_mkv(data: bytes):
+    return MkvKeyframeParser().parse(io.BytesIO(data))
+
+
+def test_mkv_cues_before_clusters():
+    index = parse_mkv(mkv_file(INFO, TRACKS, CUES, element(P.CLUSTER, b"\0" * 16)))
+    assert index.source == "mkv"
+    # 按时间排序，只取视频轨道的位置
+    assert index.times == pytest.approx([0.0, 2.0])
+    assert index.offsets == [SEGMENT_START + 100, SEGMENT_START + 400]
+
+
+def test_mkv_cues_after_clusters_via_seek_head():
+    def seek_head(cues_position):
+        return element(
+            P.SEEK_HEAD,
+            element(
+                P.SEEK,
+                uint(P.SEEK_ID, P.CUES),
+                uint(P.SEEK_POSITION, cues_position),
+            ),
+        )
+
+    cluster = element(P.CLUSTER, b"\0" * 16)
+    # SeekHead 的长度与位置数值无关（大小字段定长）
+    head_size = len(seek_head(0))
+    position = head_size + len(INFO) + len(TRACKS) + len(cluster)
+    index = parse_mkv(mkv_file(seek_head(position), INFO, TRACKS, cluster, CUES))
+    assert index.times == pytest.approx([0.0, 2.0])
+
+
+def test_mkv_timecode_scale():
+    info = element(P.INFO, uint(P.TIMECODE_SCALE, 500000))
+    index = parse_mkv(mkv_file(info, TRACKS, CUES))
+    assert index.times == pytest.approx([0.0, 1.0])
+
+
+def test_mkv_without_cues_returns_none():
+    assert parse_mkv(mkv_file(INFO, TRACKS, element(P.CLUSTER, b"\0"))) is None
+
+
+def test_mkv_without_segment_raises():
+    with pytest.raises(ValueError):
+        parse_mkv(EBML_HEADER + element(P.INFO))
+
+
+# ---------- 容器识别 ----------
+
+
+def write(tmp_path, name: str, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_read_container_index(tmp_path):
+    mp4 = write(tmp_path, "a.mp4", mp4_file(mp4_track(b"vide", stss=[1, 6])))
+    mkv = write(tmp_path, "a.mkv", mkv_file(INFO, TRACKS, CUES))
+    assert read_container_index(mp4).source == "mp4"
+    assert read_container_index(mkv).source == "mkv"
+
+
+def test_read_container_index_without_index(tmp_path):
+    # 不支持的容器与损坏的索引都返回 None，不回退到扫描整个文件
+    avi = write(tmp_path, "a.avi", b"RIFF\0\0\0\0AVI LIST" + b"\0" * 32)
+    broken = write(
+        tmp_path, "b.mp4", box(b"ftyp", b"isom") + struct.pack(">I4s", 4, b"moov")
+    )
+    assert read_container_index(avi) is None
+    assert read_container_index(broken) is None
+
+
+def test_keyframe_index_round_trip():
+    index = KeyframeIndex([0.0, 2.0], [10, None], source="mkv")
+    restored = KeyframeIndex.from_dict(index.to_dict())
+    assert restored.times == [0.0, 2.0]
+    assert restored.offsets == [10, None]
+    assert restored.keyframe_before(1.9) == 0
+    assert restored.frame_before(75, 25.0) == 50
+
+
+def test_frame_before_without_keyframe_info():
+    # 扫描结果为空，或目标帧在第一个关键帧之前
+    assert KeyframeIndex([]).frame_before(500, 25.0) is None
+    assert KeyframeIndex([2.0]).frame_before(25, 25.0) is None
+    assert KeyframeIndex([2.0]).frame_before(60, 25.0) == 50
+
+
+# ---------- 按关键帧规划读取 ----------
+
+
+class CountingDecoder(VideoDecoder):
+    # 记录 grab 与 seek 次数的解码器
+    name = "counting"
+
+    def __init__(self, frame_count=100000, fps=25.0):
+        super().__init__("counting")
+        self.fps = fps
+        self.frame_count = frame_count
+        self._position = 0
+        self.grabs = 0
+        self.seeks = []
+
+    @property
+    def position(self):
+        return self._position
+
+    def grab(self):
+        if self._position >= self.frame_count:
+            return False
+        self._position += 1
+        self.grabs += 1
+        return True
+
+    def retrieve(self, buffer=None):
+        # 帧内容为帧位置
+        return True, np.full((1, 1), self._position - 1)
+
+    def seek(self, frame_pos):
+        self.seeks.append(frame_pos)
+        self._position = frame_pos
+
+
+def test_read_frames_with_empty_index_seeks_to_far_targets():
+    decoder = CountingDecoder()
+    times = [1000.0, 2000.0, 2000.2]
+    frames = list(
+        VideoInfoExtractor()._read_frames_sequential(
+            decoder, times, keyframes=KeyframeIndex([])
+        )
+    )
+    assert [int(frame[0, 0]) for _, frame, _ in frames] == [25000, 50000, 50005]
+    # 远处的目标 seek，相邻的目标 grab 前进，不从第 0 帧逐帧解码
+    assert decoder.seeks == [25000, 50000]
+    assert decoder.grabs == 3 + 4
+
+
+def test_pyav_iter_keyframes_skips_frames_without_pts(tmp_path):
+    pytest.importorskip("av")
+    path = tmp_path / "video.mp4"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 25, (64, 48))
+    if not writer.isOpened():
+        pytest.skip("mp4v encoder unavailable")
+    for i in range(10):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+    class Frame:
+        def __init__(self, pts):
+            self.pts = pts
+
+        def to_ndarray(self, format):
+            return np.zeros((48, 64, 3), dtype=np.uint8)
+
+    decoder = PyAVDecoder(str(path))
+    container = decoder._container
+    try:
+        start = decoder._start_pts
+        step = int(round(1 / 25 / decoder._time_base))
+        frames = [Frame(start), Frame(None), Frame(start + 50 * step)]
+        decoder._container = type(
+            "Container",
+            (),
+            {
+                "seek": lambda self, *args, **kwargs: None,
+                "decode": lambda self, stream: iter(frames),
+            },
+        )()
+        times = [float(t) for t, _ in decoder.iter_keyframes()]
+        assert times == pytest.approx([0.0, 2.0])
+    finally:
+        container.close()
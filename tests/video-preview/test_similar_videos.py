@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+import pytest
+from core.preview_image import PreviewImage
+from core.similar_videos import SimilarVideoFinder
+from utils.video_meta_util import VideoInfoExtractor
+
+FPS = 10
+SIZE = (160, 96)
+
+
+def write_video(path, seconds=13, black=(3.0, 3.6)):
+    # 每秒一个随机色块画面；black 区间内为黑场，质量检查会向后偏移重试
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), FPS, SIZE)
+    if not writer.isOpened():
+        pytest.skip("mp4v encoder unavailable")
+    rng = np.random.default_rng(0)
+    shots = [
+        cv2.resize(
+            rng.integers(0, 256, size=(6, 10, 3), dtype=np.uint8),
+            SIZE,
+            interpolation=cv2.INTER_NEAREST,
+        )
+        for _ in range(seconds)
+    ]
+    for index in range(seconds * FPS):
+        time_point = index / FPS
+        if black[0] <= time_point < black[1]:
+            writer.write(np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8))
+        else:
+            writer.write(shots[index // FPS])
+    writer.release()
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    folder = tmp_path / "cache"
+    monkeypatch.setattr(PreviewImage, "get_cache_folder", lambda: str(folder))
+    return folder
+
+
+def test_generate_thumbnails_and_hash_video_give_same_hashes(tmp_path, cache_folder):
+    video_path = tmp_path / "video.mp4"
+    write_video(video_path)
+    extractor = VideoInfoExtractor()
+    video_info = extractor.get_video_info(str(video_path))
+    key = PreviewImage.get_video_key(str(video_path))
+    index = PreviewImage.get_metadata_index()
+
+    thumbnails = PreviewImage.generate_thumbnails(extractor, video_info)
+    # 3 秒处为黑场，质量检查后偏移到 4.5 秒
+    assert any(path.endswith("_4_5s.jpg") for path in thumbnails)
+    generated = {name: index.get(key, name) for name in ("phash", "dhash")}
+    assert generated["phash"] is not None
+
+    hashed = SimilarVideoFinder(extractor, index).hash_video(str(video_path))
+    assert {name: hashed[name] for name in generated} == generated
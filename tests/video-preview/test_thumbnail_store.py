@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from core.thumbnail_store import ThumbnailPackStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ThumbnailPackStore(tmp_path / "pack")
+    yield store
+    store.close()
+
+
+def test_put_get_round_trip(store):
+    store.put("a", [(3.0, b"ccc"), (1.0, b"a"), (2.0, b"bb")])
+    store.put("b", [(0.0, b"xyz")])
+
+    assert store.get("a") == [b"a", b"bb", b"ccc"]
+    assert store.get_times("a") == [1.0, 2.0, 3.0]
+    assert store.get("b") == [b"xyz"]
+    assert "a" in store and len(store) == 2
+    assert store.get("missing") == []
+
+
+def test_index_is_reloaded(store, tmp_path):
+    store.put("a", [(1.0, b"one")])
+    store.put("a", [(1.0, b"uno"), (2.0, b"dos")])
+    store.remove("b")
+
+    reopened = ThumbnailPackStore(tmp_path / "pack")
+    assert reopened.get("a") == [b"uno", b"dos"]
+    reopened.close()
+
+
+def test_put_without_images_writes_nothing(store):
+    store.put("empty", [])
+    assert "empty" not in store
+    assert store.get("empty") == []
+    assert not store.data_path.exists()
+    assert not store.index_path.exists()
+
+
+def test_get_ignores_empty_records_and_missing_data(store, tmp_path):
+    # 旧版本写入的空记录与数据文件缺失时都不报错，由调用方回退到缩略图目录
+    with open(store.index_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"key": "a", "offset": 0, "sizes": [], "times": []}) + "\n")
+    reopened = ThumbnailPackStore(tmp_path / "pack")
+    assert "a" not in reopened
+    assert reopened.get("a") == []
+
+    store.put("b", [(1.0, b"data")])
+    store.data_path.unlink()
+    store.close()
+    assert store.get("b") == []
+
+
+def test_compact_drops_garbage(store):
+    store.put("a", [(1.0, b"old")])
+    store.put("a", [(1.0, b"new!")])
+    store.put("b", [(1.0, b"b1"), (2.0, b"b2")])
+    store.put("c", [(1.0, b"gone")])
+    store.remove("c")
+    assert store.garbage_size() == len(b"old") + len(b"gone")
+
+    store.compact()
+    assert store.garbage_size() == 0
+    assert store.data_path.stat().st_size == len(b"new!b1b2")
+    assert store.get("a") == [b"new!"]
+    assert store.get("b") == [b"b1", b"b2"]
+    assert "c" not in store
+
+
+def test_migrate_folder(store, tmp_path):
+    folder = tmp_path / "video.mp4-thumbnails"
+    folder.mkdir()
+    for name, data in (
+        ("video.mp4-thumbnail_12_5s.jpg", b"second"),
+        ("video.mp4-thumbnail_3_0s.jpg", b"first"),
+    ):
+        (folder / name).write_bytes(data)
+
+    assert store.migrate_folder("v", str(folder), remove=True) == 2
+    assert store.get_times("v") == [3.0, 12.5]
+    assert store.get("v") == [b"first", b"second"]
+    assert not folder.exists()
+
+
+def test_migrate_empty_folder(store, tmp_path):
+    folder = tmp_path / "empty-thumbnails"
+    folder.mkdir()
+    assert store.migrate_folder("v", str(folder)) == 0
+    assert "v" not in store
@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("kivy")
+
+from gui.image.texture_loader import AtlasTextureCache
+from gui.image.thumbnail_strip import ThumbnailStrip, thumbnail_texture_cache
+
+
+def test_strip_uses_shared_texture_cache_by_default():
+    strip = ThumbnailStrip()
+    assert strip.texture_cache is thumbnail_texture_cache
+
+
+def test_strip_with_atlas_texture_cache():
+    cache = AtlasTextureCache(max_pages=2, max_size=(160, 160), page_size=512)
+    strip = ThumbnailStrip(texture_cache=cache)
+    assert strip.texture_cache is cache
+
+    strip.set_images(["a.jpg", "b.jpg"])
+    strip.add_image("c.jpg")
+    assert [item["image"] for item in strip.data] == ["a.jpg", "b.jpg", "c.jpg"]
+    assert [item["index"] for item in strip.data] == [0, 1, 2]
+
+    # 未加载的图片不在缓存中，预取取消后不残留任务
+    assert cache.get("a.jpg") is None
+    strip.cancel_prefetch()
+    assert not cache._prefetching
+
+
+def test_strip_texture_cache_can_be_replaced_after_creation():
+    # Root 在 on_kv_post 中替换 kv 规则创建的缩略图条的缓存
+    cache = AtlasTextureCache(max_pages=1, page_size=256)
+    strip = ThumbnailStrip()
+    strip.texture_cache = cache
+    strip.set_images(["a.jpg"])
+    assert strip.texture_cache is cache
+    assert cache.atlas.pages == []